@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Нагрузочный бенчмарк всех роутов API на сгенерированных БД 10 тыс. / 100 тыс. / 1 млн клиентов.
+
+Приложение работает в процессе (httpx.ASGITransport, без сети и uvicorn). Каждый размер —
+отдельный подпроцесс со своим каталогом и app.db, наполненной генератором src.seed
+(тот же seed — те же данные; с --db-dir сгенерированные БД переиспользуются между запусками).
+
+Сценарии: список (без фильтров, каждый фильтр, поиск, каждая сортировка ClientSortBy,
+глубокий offset, курсор), клиент по id, потомки / предки, /parents, регионы, 304 по ETag,
+форматы ответа по Accept (колоночный JSON, MessagePack), создание / PATCH / удаление и
+ошибки (404, 409, 422). Первый ответ каждого GET-сценария проверяется: ожидаемый статус
+и непустой результат (total > 0, есть items / rows) — сломанный сценарий, который меряет
+пустой ответ, отмечается и завершает прогон с кодом 1. Сценарии списка идут мимо кеша
+ответов GET /api/clients (_list_cache): иначе все запросы после первого — попадания,
+и --compare не видит регрессий самих запросов к БД. Попадание в кеш замеряет отдельный
+сценарий list:cached. На сценарий — p50/p95/p99 задержки в мс, запросов в секунду
+и средний размер тела ответа; результат пишется в JSON (--out).
+
+Сравнение с сохранённым результатом: --compare baseline.json отмечает сценарии, где p95
+вырос или rps упал больше чем на --threshold (доля), и завершается с кодом 1.
+
+Запуск: python scripts/bench_api.py [--sizes 10000 100000 1000000] [--requests 200]
+        [--concurrency 1] [--db-dir DIR] [--out bench_api.json] [--compare baseline.json]
+Нужен пакет httpx.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+from typing import NamedTuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+WARMUP_REQUESTS = 5
+# Разница p95 меньше этой (мс) — шум, а не регрессия, даже если в долях она больше порога
+MIN_P95_DELTA_MS = 0.5
+
+
+class Scenario(NamedTuple):
+    """
+    Сценарий: make(i) → (url, JSON-тело или None) для i-го запроса; expected — ожидаемый статус;
+    cached — с кешем ответов списка (остальные сценарии идут мимо него).
+    """
+
+    name: str
+    method: str
+    make: Callable[[int], tuple[str, dict | None]]
+    expected: int = 200
+    headers: dict | None = None
+    cached: bool = False
+
+
+def _get(url: str) -> Callable[[int], tuple[str, None]]:
+    return lambda _i: (url, None)
+
+
+def _percentile(sorted_values: list[float], share: float) -> float:
+    """Процентиль по ближайшему рангу: share=0.95 — p95."""
+    index = max(0, min(len(sorted_values) - 1, round(share * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def prepare_database(size: int) -> None:
+    """Схема, регионы и ровно size клиентов в ./app.db; готовая БД нужного размера не пересоздаётся."""
+    from sqlalchemy import func, select
+
+    from src.database import SessionLocal, engine, init_db
+    from src.models.client_model import ClientModel
+    from src.seed import DEFAULT_SEED, generate_clients, seed_regions
+
+    init_db()
+    with SessionLocal() as db:
+        seed_regions(db)
+        db.commit()
+        existing = db.scalar(select(func.count()).select_from(ClientModel))
+    if existing != size:
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            generate_clients(conn, size, seed=DEFAULT_SEED, workers=os.cpu_count() or 1, reset=True)
+        print(f"  сгенерировано {size} клиентов за {time.perf_counter() - started:.1f} с", file=sys.stderr)
+
+
+def build_scenarios(fixtures: dict, size: int) -> tuple[list[Scenario], list[str]]:
+    """
+    Сценарии всех роутов и список id, созданных сценарием create (его заполняет run_size):
+    записи — в конце, PATCH и удаление идут по созданным клиентам.
+    """
+    from pydantic.alias_generators import to_camel
+
+    from src import formats
+    from src.types.client_sort_by import ClientSortBy
+
+    ids = fixtures["ids"]
+    root, leaf, region = fixtures["root"], fixtures["leaf"], fixtures["region"]
+    created: list[str] = []
+    run = uuid.uuid4().hex[:8]
+
+    def create(i: int) -> tuple[str, dict]:
+        return "/api/clients", {"name": f"Бенчмарк {run} {i}", "partyType": "legal", "parentId": root}
+
+    def patch(i: int) -> tuple[str, dict]:
+        return f"/api/clients/{created[i % len(created)]}", {"fullName": f"Бенчмарк {run} {i}"}
+
+    def delete(i: int) -> tuple[str, None]:
+        return f"/api/clients/{created[i]}", None
+
+    scenarios = [
+        Scenario("list", "GET", _get("/api/clients")),
+        Scenario("list:cached", "GET", _get("/api/clients"), cached=True),
+        Scenario("list:noTotal", "GET", _get("/api/clients?includeTotal=false")),
+        Scenario("list:fields", "GET", _get("/api/clients?fields=clientId,name&limit=100")),
+        Scenario("list:limit100", "GET", _get("/api/clients?limit=100")),
+        Scenario("list:limit100:columns", "GET", _get("/api/clients?limit=100"),
+                 headers={"Accept": formats.COLUMNS_MEDIA_TYPE}),
+        Scenario("list:limit100:msgpack", "GET", _get("/api/clients?limit=100"),
+                 headers={"Accept": formats.MSGPACK_MEDIA_TYPE}),
+        Scenario("list:query", "GET", _get("/api/clients?query=иванов")),
+        Scenario("list:queryShort", "GET", _get(f"/api/clients?query={fixtures['name'][:2].lower()}")),
+        Scenario("list:queryInn", "GET", _get(f"/api/clients?query={fixtures['inn'][:6]}")),
+        Scenario("list:parentId", "GET", _get(f"/api/clients?parentId={root}")),
+        Scenario("list:ancestorId", "GET", _get(f"/api/clients?ancestorId={root}")),
+        Scenario("list:regionId", "GET", _get(f"/api/clients?regionId={region}")),
+        Scenario("list:partyType", "GET", _get("/api/clients?partyType=individual")),
+        *(
+            Scenario(f"list:sort:{to_camel(sort_by.value)}", "GET",
+                     _get(f"/api/clients?sortBy={to_camel(sort_by.value)}&sortOrder=asc"))
+            for sort_by in ClientSortBy
+        ),
+        Scenario("list:offset1000", "GET", _get("/api/clients?offset=1000")),
+        Scenario("list:offsetDeep", "GET", _get(f"/api/clients?offset={size // 2}")),
+        Scenario("list:cursor", "GET", _get(f"/api/clients?cursor={fixtures['cursor']}")),
+        Scenario("get", "GET", lambda i: (f"/api/clients/{ids[i % len(ids)]}", None)),
+        Scenario("get:fields", "GET", lambda i: (f"/api/clients/{ids[i % len(ids)]}?fields=clientId,name", None)),
+        Scenario("descendants", "GET", _get(f"/api/clients/{root}/descendants")),
+        Scenario("ancestors", "GET", _get(f"/api/clients/{leaf}/ancestors")),
+        Scenario("parents:compact", "GET", _get("/api/clients/parents?compact=true")),
+        Scenario("parents:typeahead", "GET", _get("/api/clients/parents?query=ООО&limit=20")),
+        Scenario("parents:columns", "GET", _get("/api/clients/parents?limit=1000"),
+                 headers={"Accept": formats.COLUMNS_MEDIA_TYPE}),
+        Scenario("parents:304", "GET", _get("/api/clients/parents?compact=true"), 304,
+                 {"If-None-Match": fixtures["parents_etag"]}),
+        Scenario("regions", "GET", _get("/api/regions")),
+        Scenario("regions:304", "GET", _get("/api/regions"), 304, {"If-None-Match": fixtures["regions_etag"]}),
+        Scenario("error:get404", "GET", _get(f"/api/clients/{uuid.UUID(int=0)}"), 404),
+        Scenario("error:list422", "GET", _get("/api/clients?limit=1000"), 422),
+        Scenario("error:create409", "POST",
+                 lambda _i: ("/api/clients", {"name": fixtures["name"], "partyType": "legal"}), 409),
+        Scenario("error:cycle409", "PATCH", lambda _i: (f"/api/clients/{root}", {"parentId": leaf}), 409),
+        Scenario("create", "POST", create, 201),
+        Scenario("patch", "PATCH", patch),
+        Scenario("delete", "DELETE", delete, 204),
+    ]
+    if formats.msgpack is None:
+        scenarios = [s for s in scenarios if not s.name.endswith(":msgpack")]
+    return scenarios, created
+
+
+async def load_fixtures(client) -> dict:
+    """id для сценариев: головной клиент с детьми, его лист-внук, регион, выборка клиентов, курсор, ETag."""
+    from sqlalchemy import text
+
+    from src.database import engine
+
+    with engine.connect() as conn:
+        root = conn.execute(text(
+            "SELECT client_id FROM clients WHERE parent_id IS NULL AND children_count > 0 ORDER BY name LIMIT 1"
+        )).scalar()
+        leaf = conn.execute(text(
+            "SELECT c.client_id FROM clients AS c JOIN clients AS p ON p.client_id = c.parent_id "
+            "WHERE p.parent_id = :root AND c.children_count = 0 LIMIT 1"
+        ), {"root": root}).scalar()
+        region = conn.execute(text("SELECT region_id FROM clients WHERE region_id IS NOT NULL LIMIT 1")).scalar()
+        ids = conn.execute(text("SELECT client_id FROM clients WHERE rowid % 997 = 1 LIMIT 100")).scalars().all()
+        name, inn = conn.execute(text("SELECT name, inn FROM clients WHERE inn IS NOT NULL LIMIT 1")).one()
+    first = (await client.get("/api/clients")).json()
+    parents = await client.get("/api/clients/parents", params={"compact": "true"})
+    regions = await client.get("/api/regions")
+    return {
+        "root": str(uuid.UUID(root)),
+        "leaf": str(uuid.UUID(leaf)),
+        "region": str(uuid.UUID(region)),
+        "ids": [str(uuid.UUID(client_id)) for client_id in ids],
+        "name": name,
+        "inn": inn,
+        "cursor": first["nextCursor"],
+        "parents_etag": parents.headers["etag"],
+        "regions_etag": regions.headers["etag"],
+    }
+
+
+def check_response(scenario: Scenario, response) -> str | None:
+    """Что не так с ответом сценария: не тот статус или пустой результат; None — всё в порядке."""
+    from src import formats
+
+    if response.status_code != scenario.expected:
+        return f"статус {response.status_code}, ожидался {scenario.expected}"
+    if response.status_code != 200:
+        return None
+    if response.headers["content-type"].startswith(formats.MSGPACK_MEDIA_TYPE):
+        body = formats.msgpack.unpackb(response.content)
+    else:
+        body = response.json()
+    if body == [] or (isinstance(body, dict) and (body.get("total") == 0 or body.get("items", body.get("rows")) == [])):
+        return f"пустой ответ ({len(response.content)} Б)"
+    return None
+
+
+async def run_scenario(client, scenario: Scenario, requests_total: int, concurrency: int) -> dict:
+    """Прогнать сценарий: задержка каждого запроса и общее время."""
+    counter = iter(range(requests_total))
+    latencies: list[float] = []
+    errors = 0
+    body_bytes = 0
+
+    async def worker() -> None:
+        nonlocal errors, body_bytes
+        for i in counter:
+            url, body = scenario.make(i)
+            started = time.perf_counter()
+            response = await client.request(scenario.method, url, json=body, headers=scenario.headers)
+            latencies.append(time.perf_counter() - started)
+            body_bytes += len(response.content)
+            if response.status_code != scenario.expected:
+                errors += 1
+            elif scenario.method == "POST" and scenario.expected == 201:
+                scenario_created.append(response.json()["clientId"])
+
+    scenario_created: list[str] = []
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "p50": round(_percentile(latencies, 0.50) * 1000, 3),
+        "p95": round(_percentile(latencies, 0.95) * 1000, 3),
+        "p99": round(_percentile(latencies, 0.99) * 1000, 3),
+        "rps": round(requests_total / elapsed, 1),
+        "errors": errors,
+        "bytes": round(body_bytes / requests_total),
+        "created": scenario_created,
+    }
+
+
+async def run_size(size: int, requests_total: int, concurrency: int) -> dict:
+    """Все сценарии на одной БД (процесс уже в её каталоге)."""
+    import httpx
+
+    from src.cache import ResponseCache
+    from src.main import app
+    from src.routers import clients
+
+    # Кеш без места: get всегда промах, set ничего не кладёт — подмена надёжнее очистки перед
+    # запросом, которая при --concurrency > 1 не мешает соседнему запросу положить то же тело
+    list_cache, no_list_cache = clients._list_cache, ResponseCache(maxsize=0, max_bytes=0, ttl=0)
+    results = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            fixtures = await load_fixtures(client)
+            scenarios, created = build_scenarios(fixtures, size)
+            for scenario in scenarios:
+                clients._list_cache = list_cache if scenario.cached else no_list_cache
+                problem = None
+                if scenario.method == "GET":
+                    for i in range(WARMUP_REQUESTS):
+                        url, _body = scenario.make(i)
+                        response = await client.get(url, headers=scenario.headers)
+                        problem = problem or check_response(scenario, response)
+                result = await run_scenario(client, scenario, requests_total, concurrency)
+                created += result.pop("created")
+                if problem:
+                    result["invalid"] = problem
+                results[scenario.name] = result
+                note = f"  ошибок: {result['errors']}" if result["errors"] else ""
+                note += f"  НЕВЕРНЫЙ СЦЕНАРИЙ: {problem}" if problem else ""
+                print(f"  {scenario.name:<28} p50 {result['p50']:>8.2f}  p95 {result['p95']:>8.2f}  "
+                      f"p99 {result['p99']:>8.2f} мс  {result['rps']:>8.1f} rps  {result['bytes']:>8} Б{note}",
+                      file=sys.stderr)
+    return results
+
+
+def child(size: int, requests_total: int, concurrency: int) -> None:
+    """Подпроцесс: подготовить БД в текущем каталоге, замерить, напечатать JSON."""
+    sys.path.insert(0, str(ROOT))
+    prepare_database(size)
+    print(json.dumps(asyncio.run(run_size(size, requests_total, concurrency))))
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Регрессии: p95 вырос или rps упал больше чем на threshold; сценарии без пары пропускаются."""
+    regressions = []
+    for size, scenarios in current["results"].items():
+        for name, now in scenarios.items():
+            before = baseline.get("results", {}).get(size, {}).get(name)
+            if before is None:
+                continue
+            p95_grew = now["p95"] > before["p95"] * (1 + threshold) and now["p95"] - before["p95"] > MIN_P95_DELTA_MS
+            rps_fell = now["rps"] < before["rps"] * (1 - threshold)
+            if p95_grew or rps_fell or now["errors"] > before["errors"]:
+                regressions.append(
+                    f"{size:>8} {name:<28} p95 {before['p95']:.2f} → {now['p95']:.2f} мс, "
+                    f"rps {before['rps']:.1f} → {now['rps']:.1f}, ошибок {before['errors']} → {now['errors']}"
+                )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="размеры БД (клиентов)")
+    parser.add_argument("--requests", type=int, default=200, help="запросов на сценарий")
+    parser.add_argument("--concurrency", type=int, default=1, help="одновременных запросов")
+    parser.add_argument("--db-dir", type=Path, help="каталог сгенерированных БД (по умолчанию временный)")
+    parser.add_argument("--out", type=Path, default=Path("bench_api.json"), help="куда записать результат")
+    parser.add_argument("--compare", type=Path, help="сохранённый результат для сравнения")
+    parser.add_argument("--threshold", type=float, default=0.2, help="допустимое ухудшение p95 / rps (доля)")
+    parser.add_argument("--size", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.size:
+        child(args.size, args.requests, args.concurrency)
+        return
+
+    print("=== Бенчмарк роутов API ===\n")
+    db_dir = (args.db_dir or Path(tempfile.mkdtemp(prefix="bench_api_"))).resolve()
+    report = {
+        "createdAt": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "results": {},
+    }
+    for size in args.sizes:
+        print(f"{size} клиентов:")
+        workdir = db_dir / f"clients_{size}"
+        workdir.mkdir(parents=True, exist_ok=True)
+        out = subprocess.run(
+            [sys.executable, str(Path(__file__).resolve()), "--size", str(size),
+             "--requests", str(args.requests), "--concurrency", str(args.concurrency)],
+            cwd=workdir,
+            env={**os.environ, "PYTHONWARNINGS": "ignore"},
+            stdout=subprocess.PIPE,
+            text=True,
+            check=True,
+        )
+        report["results"][str(size)] = json.loads(out.stdout.strip().splitlines()[-1])
+    args.out.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\nРезультат: {args.out}")
+
+    invalid = [
+        f"{size:>8} {name:<28} {result['invalid']}"
+        for size, scenarios in report["results"].items()
+        for name, result in scenarios.items()
+        if "invalid" in result
+    ]
+    if invalid:
+        print(f"\n=== Сценарии с неверным ответом: {len(invalid)} — их замеры ничего не говорят ===")
+        for line in invalid:
+            print(line)
+        raise SystemExit(1)
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        for key in ("requests", "concurrency", "cpus"):
+            if baseline.get(key) != report[key]:
+                print(f"Внимание: {key} в {args.compare} — {baseline.get(key)}, сейчас — {report[key]}")
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n=== Регрессии относительно {args.compare} (порог {args.threshold:.0%}): {len(regressions)} ===")
+            for line in regressions:
+                print(line)
+            raise SystemExit(1)
+        print(f"\n=== Регрессий относительно {args.compare} нет (порог {args.threshold:.0%}) ===")
+
+
+if __name__ == "__main__":
+    main()
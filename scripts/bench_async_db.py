@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Сравнение пропускной способности синхронного (пул потоков Starlette) и асинхронного
+(DB_ASYNC, AsyncSession + aiosqlite) доступа к БД при 50–500 одновременных запросах.
+
+Приложение работает в процессе (httpx.ASGITransport, без сети и uvicorn) на временной
+копии БД. Каждый режим запускается в отдельном подпроцессе: DB_ASYNC читается при импорте.
+Нагрузка — смесь GET /api/clients (первая страница и страница по курсору) и GET /api/clients/{id}.
+Список идёт мимо кеша ответов (_list_cache), иначе замерялась бы отдача готового тела, а не БД.
+
+Запуск: python scripts/bench_async_db.py [--requests 2000] [--concurrency 50 100 200 500]
+Нужны пакеты httpx, aiosqlite, greenlet.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+async def run_mode(requests_total: int, levels: list[int]) -> list[dict]:
+    """Замер одного режима (DB_ASYNC уже выставлен до импорта приложения)."""
+    import httpx
+
+    from src.cache import ResponseCache
+    from src.main import app
+    from src.routers import clients
+
+    clients._list_cache = ResponseCache(maxsize=0, max_bytes=0, ttl=0)
+    results = []
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            first = (await client.get("/api/clients", params={"limit": 20})).json()
+            ids = [item["clientId"] for item in first["items"]]
+            urls = [
+                "/api/clients?limit=20",
+                f"/api/clients?limit=20&cursor={first['nextCursor']}",
+                *(f"/api/clients/{client_id}" for client_id in ids[:4]),
+            ]
+            for concurrency in levels:
+                counter = iter(range(requests_total))
+                errors = 0
+
+                async def worker() -> None:
+                    nonlocal errors
+                    for i in counter:
+                        response = await client.get(urls[i % len(urls)])
+                        if response.status_code != 200:
+                            errors += 1
+
+                started = time.perf_counter()
+                await asyncio.gather(*(worker() for _ in range(concurrency)))
+                elapsed = time.perf_counter() - started
+                results.append({
+                    "concurrency": concurrency,
+                    "rps": round(requests_total / elapsed, 1),
+                    "errors": errors,
+                })
+    return results
+
+
+def child(mode: str, requests_total: int, levels: list[int]) -> None:
+    """Подпроцесс: выставить режим, замерить, напечатать JSON."""
+    sys.path.insert(0, str(ROOT))
+    import src.config
+
+    src.config.DB_ASYNC = mode == "async"
+    print(json.dumps(asyncio.run(run_mode(requests_total, levels))))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000, help="запросов на каждый уровень конкурентности")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 100, 200, 500])
+    parser.add_argument("--mode", choices=["sync", "async"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        child(args.mode, args.requests, args.concurrency)
+        return
+
+    print("=== Синхронный и асинхронный доступ к БД: запросов в секунду ===\n")
+    # Одна БД на оба режима: первый подпроцесс создаёт и наполняет её, второй берёт готовую
+    workdir = tempfile.mkdtemp(prefix="bench_async_db_")
+    results = {}
+    for mode in ("sync", "async"):
+        out = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--requests", str(args.requests),
+             "--concurrency", *map(str, args.concurrency)],
+            cwd=workdir,
+            env={**os.environ, "PYTHONWARNINGS": "ignore"},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        results[mode] = json.loads(out.stdout.strip().splitlines()[-1])
+
+    print(f"{'конкурентность':>15} {'sync, rps':>12} {'async, rps':>12} {'async/sync':>11}")
+    for sync_row, async_row in zip(results["sync"], results["async"]):
+        ratio = async_row["rps"] / sync_row["rps"]
+        errors = sync_row["errors"] + async_row["errors"]
+        note = f"  ошибок: {errors}" if errors else ""
+        print(f"{sync_row['concurrency']:>15} {sync_row['rps']:>12} {async_row['rps']:>12} {ratio:>10.2f}x{note}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Микробенчмарк сериализации страницы списка клиентов (100 строк).
+
+Сравниваются:
+- orm  — прежний путь: ORM-объекты ClientModel, Client.model_validate на строку,
+         затем проверка по response_model и JSON, как делает FastAPI;
+- fast — текущий list_clients: кортежи колонок, словарь на строку, JSON сериализатором
+         client_list_adapter сразу в Response;
+- fields — то же с fields=clientId,name (таблица в две колонки);
+- cached — повтор того же запроса: готовое тело из кеша ответов списка.
+
+Варианты читают одну и ту же страницу из временной БД; total берётся из кеша,
+а кеш ответов (кроме cached) сбрасывается, чтобы замерялись чтение страницы
+и сериализация. Заодно проверяется, что байты ответа совпадают.
+
+Отдельно — форматы ответа (Accept) на одних и тех же 100 кортежах строк, без чтения из БД:
+JSON объектами, колоночный JSON и MessagePack (если установлен msgpack) — размер тела,
+размер после gzip и время сборки и кодирования.
+
+Запуск: python scripts/bench_list_serialization.py [--rounds 300]
+"""
+import argparse
+import gzip
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+# DATABASE_URL относительный (./app.db) — временный каталог даёт чистую БД
+os.chdir(tempfile.mkdtemp(prefix="bench_list_"))
+
+from pydantic import TypeAdapter  # noqa: E402
+
+from src import formats  # noqa: E402
+from src.database import ReadSessionLocal, init_db  # noqa: E402
+from src.models.client_model import ClientModel  # noqa: E402
+from src.routers import clients  # noqa: E402
+from src.schemas.client import CLIENT_FIELDS, Client, ClientListQuery, ClientsResponse  # noqa: E402
+from src.seed import seed_db  # noqa: E402
+
+PAGE = ClientListQuery(limit=100)
+NARROW_PAGE = ClientListQuery(limit=100, fields="clientId,name")
+_response_adapter = TypeAdapter(ClientsResponse)
+
+
+def orm_page(db) -> bytes:
+    """Прежний путь: ORM-объекты и валидация на каждом шаге."""
+    q = db.query(ClientModel).order_by(ClientModel.created_at.desc(), ClientModel.client_id.desc())
+    rows = q.limit(PAGE.limit + 1).all()
+    response = ClientsResponse(
+        items=[Client.model_validate(c) for c in rows[: PAGE.limit]],
+        total=clients._count_cache.get((clients._clients_version.value, clients._filter_key(PAGE))),
+        next_cursor=None,
+        has_more=len(rows) > PAGE.limit,
+    )
+    return _response_adapter.dump_json(_response_adapter.validate_python(response), by_alias=True)
+
+
+def fast_page(db) -> bytes:
+    clients._list_cache.clear()
+    return clients.list_clients(PAGE, db).body
+
+
+def narrow_page(db) -> bytes:
+    clients._list_cache.clear()
+    return clients.list_clients(NARROW_PAGE, db).body
+
+
+def cached_page(db) -> bytes:
+    return clients.list_clients(PAGE, db).body
+
+
+def measure(page, rounds: int) -> float:
+    """Среднее время страницы, мс; сессия на каждый раунд, как сессия на запрос."""
+    started = time.perf_counter()
+    for _ in range(rounds):
+        with ReadSessionLocal() as db:
+            page(db)
+    return (time.perf_counter() - started) / rounds * 1000
+
+
+def measure_formats(rounds: int) -> None:
+    """Размер и время сборки + кодирования страницы в каждом формате — из одних и тех же кортежей."""
+    with ReadSessionLocal() as db:
+        rows = (
+            db.query(*clients._client_columns(CLIENT_FIELDS))
+            .order_by(ClientModel.created_at.desc(), ClientModel.client_id.desc())
+            .limit(PAGE.limit)
+            .all()
+        )
+    media_types = [("json", formats.JSON_MEDIA_TYPE), ("columns", formats.COLUMNS_MEDIA_TYPE)]
+    if formats.msgpack is not None:
+        media_types.append(("msgpack", formats.MSGPACK_MEDIA_TYPE))
+    print(f"\n   Форматы ответа ({len(rows)} строк, сборка и кодирование без чтения из БД):")
+    baseline = None
+    for name, media_type in media_types:
+        started = time.perf_counter()
+        for _ in range(rounds):
+            body = clients._list_response(
+                ClientsResponse, CLIENT_FIELDS, rows, media_type, total=len(rows), next_cursor=None, has_more=True
+            ).body
+        ms = (time.perf_counter() - started) / rounds * 1000
+        baseline = baseline or (len(body), ms)
+        print(f"   {name:>8}: {len(body):>7} байт ({len(body) / baseline[0]:.0%}), gzip {len(gzip.compress(body)):>6} байт, "
+              f"{ms:6.3f} мс, {baseline[1] / ms:.2f}x к json")
+    if formats.msgpack is None:
+        print("    msgpack: не установлен (pip install msgpack)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=300)
+    args = parser.parse_args()
+
+    print("=== Сериализация страницы из 100 клиентов ===\n")
+    init_db()
+    seed_db()
+    with ReadSessionLocal() as db:
+        fast_body = fast_page(db)  # прогрев и total в кеш
+        orm_body = orm_page(db)
+    # nextCursor прежний путь не строит — сравниваем страницы без него
+    same = fast_body.split(b',"nextCursor"')[0] == orm_body.split(b',"nextCursor"')[0]
+    print(f"   байты items/total совпадают: {'да' if same else 'НЕТ'}")
+
+    pages = (("orm", orm_page), ("fast", fast_page), ("fields", narrow_page), ("cached", cached_page))
+    results = {name: measure(page, args.rounds) for name, page in pages}
+    for name, ms in results.items():
+        print(f"   {name:>6}: {ms:6.2f} мс на страницу, {results['orm'] / ms:.2f}x к orm")
+    measure_formats(args.rounds)
+    if not same:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
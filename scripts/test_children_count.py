@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Проверка счётчика дочерних клиентов childrenCount.
+
+1. Запись через роуты: создание, пакет, смена родителя (PATCH и bulk-update), удаление
+   и массовое удаление — после каждого шага children_count каждого клиента равен числу
+   его детей (сверка с GROUP BY по всей таблице).
+2. Старая БД без колонки children_count: init_db добавляет колонку, заполняет её
+   и создаёт триггеры.
+3. Сортировка sortBy=childrenCount: первая страница начинается с клиента с наибольшим
+   числом детей, курсор проходит весь список без повторов.
+
+Сервер не нужен: обработчики вызываются напрямую на временной БД.
+Запуск: python scripts/test_children_count.py
+"""
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+# DATABASE_URL относительный (./app.db) — временный каталог даёт чистую БД
+os.chdir(tempfile.mkdtemp(prefix="children_count_"))
+
+from sqlalchemy import text  # noqa: E402
+
+from src.database import SessionLocal, engine, init_db  # noqa: E402
+from src.routers import clients  # noqa: E402
+from src.schemas.client import (  # noqa: E402
+    ClientBatchCreate,
+    ClientBulkDelete,
+    ClientBulkUpdate,
+    ClientCreate,
+    ClientListQuery,
+    ClientUpdate,
+)
+from src.seed import seed_db  # noqa: E402
+from src.types.client_sort_by import ClientSortBy  # noqa: E402
+from src.types.party_type import PartyType  # noqa: E402
+from src.types.sort_order import SortOrder  # noqa: E402
+
+_MISMATCHES = text(
+    "SELECT count(*) FROM clients AS c "
+    "WHERE c.children_count != (SELECT count(*) FROM clients AS child WHERE child.parent_id = c.client_id)"
+)
+
+
+def mismatches() -> int:
+    with engine.connect() as conn:
+        return conn.execute(_MISMATCHES).scalar()
+
+
+def children_count(client_id) -> int:
+    with engine.connect() as conn:
+        return conn.execute(
+            text("SELECT children_count FROM clients WHERE client_id = :id"), {"id": client_id.hex}
+        ).scalar()
+
+
+def check_writes() -> int:
+    print("1. Счётчик после записи через роуты")
+    db = SessionLocal()
+    try:
+        group = clients.create_client(ClientCreate(name="Группа", party_type=PartyType.LEGAL), db)
+        other = clients.create_client(ClientCreate(name="Другая группа", party_type=PartyType.LEGAL), db)
+        child = clients.create_client(
+            ClientCreate(name="Дочерний 1", party_type=PartyType.LEGAL, parent_id=group.client_id), db
+        )
+        batch = clients.create_clients_batch(
+            ClientBatchCreate(items=[
+                ClientCreate(name=f"Дочерний {n}", party_type=PartyType.INDIVIDUAL, parent_id=group.client_id)
+                for n in range(2, 6)
+            ]),
+            db,
+        )
+        batch_ids = [item.client.client_id for item in batch.items]
+        steps = [
+            ("создание и пакет", 5, 0),
+            ("PATCH parentId", 4, 1),
+            ("bulk-update parentId", 2, 3),
+            ("DELETE дочернего", 2, 2),
+            ("bulk-delete", 2, 0),
+        ]
+        actions = [
+            lambda: None,
+            lambda: clients.update_client(child.client_id, ClientUpdate(parent_id=other.client_id), db),
+            lambda: clients.bulk_update_clients(
+                ClientBulkUpdate(client_ids=batch_ids[:2], changes=ClientUpdate(parent_id=other.client_id)), db
+            ),
+            lambda: clients.delete_client(child.client_id, db),
+            lambda: clients.bulk_delete_clients(ClientBulkDelete(filter={"parent_id": other.client_id}), db),
+        ]
+        for (title, group_expected, other_expected), action in zip(steps, actions):
+            action()
+            counts = children_count(group.client_id), children_count(other.client_id)
+            wrong = mismatches()
+            if counts != (group_expected, other_expected) or wrong:
+                print(f"   ОШИБКА после «{title}»: счётчики {counts}, ожидалось "
+                      f"{(group_expected, other_expected)}, расхождений с GROUP BY: {wrong}")
+                return 1
+        # Удаление родителя: дети становятся головными, счётчик уходит вместе с ним
+        clients.delete_client(group.client_id, db)
+        if mismatches():
+            print("   ОШИБКА: расхождения после удаления родителя")
+            return 1
+    finally:
+        db.close()
+    print(f"   OK: {len(steps) + 1} шагов, счётчики совпадают с GROUP BY")
+    return 0
+
+
+def check_old_db() -> int:
+    print("2. Старая БД без children_count")
+    with engine.begin() as conn:
+        for trigger in ("ai", "ad", "au"):
+            conn.execute(text(f"DROP TRIGGER clients_children_count_{trigger}"))
+        conn.execute(text("DROP INDEX ix_clients_children_count"))
+        conn.execute(text("ALTER TABLE clients DROP COLUMN children_count"))
+    init_db()
+    wrong = mismatches()
+    with engine.connect() as conn:
+        parents = conn.execute(text("SELECT count(*) FROM clients WHERE children_count > 0")).scalar()
+    if wrong or not parents:
+        print(f"   ОШИБКА: расхождений {wrong}, клиентов с детьми {parents}")
+        return 1
+    print(f"   OK: колонка добавлена и заполнена, клиентов с детьми: {parents}")
+    return 0
+
+
+def check_sort() -> int:
+    print("3. Сортировка по childrenCount")
+    db = SessionLocal()
+    try:
+        base = {"sort_by": ClientSortBy.CHILDREN_COUNT, "sort_order": SortOrder.DESC, "limit": 100}
+        page = json.loads(clients.list_clients(ClientListQuery(**base), db).body)
+        seen = [item["clientId"] for item in page["items"]]
+        counts = [item["childrenCount"] for item in page["items"]]
+        top = db.execute(text("SELECT max(children_count) FROM clients")).scalar()
+        while page["nextCursor"]:
+            page = json.loads(clients.list_clients(ClientListQuery(**base, cursor=page["nextCursor"]), db).body)
+            seen += [item["clientId"] for item in page["items"]]
+            counts += [item["childrenCount"] for item in page["items"]]
+        total = db.execute(text("SELECT count(*) FROM clients")).scalar()
+    finally:
+        db.close()
+    if counts[0] != top or counts != sorted(counts, reverse=True) or len(seen) != len(set(seen)) or len(seen) != total:
+        print(f"   ОШИБКА: первая строка {counts[0]} (максимум {top}), пройдено {len(seen)} из {total}")
+        return 1
+    print(f"   OK: первая строка — {top} детей, курсором пройдено {len(seen)} клиентов по убыванию")
+    return 0
+
+
+def main() -> None:
+    print("=== Счётчик дочерних клиентов childrenCount ===\n")
+    init_db()
+    seed_db()
+    failed = check_writes()
+    failed += check_old_db()
+    failed += check_sort()
+    if failed:
+        print(f"\n=== Провалено проверок: {failed} ===")
+        raise SystemExit(1)
+    print("\n=== Все проверки пройдены ===")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Проверка ETag клиента: условный GET и оптимистичная блокировка PATCH / DELETE.
+
+1. GET /api/clients/{client_id}: ETag и Cache-Control; If-None-Match с ним — 304 без тела;
+   появился дочерний клиент (childrenCount) — ETag другой, ответ 200.
+2. PATCH с If-Match: текущий ETag — 200 и ETag новой версии; старый — 412
+   CLIENT_PRECONDITION_FAILED, клиент не изменён; две правки подряд (в одну секунду) —
+   разные ETag; слабый ETag (W/) — 412 (сравнение строгое); новый ребёнок не мешает правке
+   по ETag, полученному до него.
+3. Без лишнего чтения: PATCH с If-Match — один SQL-запрос (UPDATE … RETURNING), без SELECT.
+4. DELETE с If-Match: старый ETag — 412, клиент на месте; «*» и текущий — 204;
+   несуществующий клиент — 404.
+
+Сервер не нужен: приложение в процессе (httpx.ASGITransport) на временной БД.
+Запуск: python scripts/test_client_etag.py
+Нужен пакет httpx.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import uuid
+from pathlib import Path
+
+from sqlalchemy import event
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+# DATABASE_URL относительный (./app.db) — временный каталог даёт чистую БД
+os.chdir(tempfile.mkdtemp(prefix="client_etag_"))
+
+import httpx  # noqa: E402
+
+from src.database import engine  # noqa: E402
+from src.main import app  # noqa: E402
+
+
+async def create(client, name: str, parent_id: str | None = None) -> dict:
+    response = await client.post("/api/clients", json={"name": name, "partyType": "legal", "parentId": parent_id})
+    return response.json()
+
+
+async def check_get(client) -> int:
+    print("1. Условный GET")
+    created = await create(client, f"ETag GET {uuid.uuid4().hex[:6]}")
+    url = f"/api/clients/{created['clientId']}"
+    first = await client.get(url)
+    etag = first.headers.get("etag")
+    cached = await client.get(url, headers={"If-None-Match": etag})
+    await create(client, f"ETag ребёнок {uuid.uuid4().hex[:6]}", created["clientId"])
+    after_child = await client.get(url, headers={"If-None-Match": etag})
+    if (
+        not etag
+        or first.headers.get("cache-control") != "no-cache"
+        or cached.status_code != 304
+        or cached.content
+        or after_child.status_code != 200
+        or after_child.json()["childrenCount"] != 1
+        or after_child.headers["etag"] == etag
+    ):
+        print(f"   ОШИБКА: ETag {etag}, повтор {cached.status_code}, после ребёнка {after_child.status_code}")
+        return 1
+    print(f"   OK: ETag {etag}, повтор — 304 без тела, после нового ребёнка — 200 с другим ETag")
+    return 0
+
+
+async def check_patch(client) -> int:
+    print("2. PATCH с If-Match")
+    created = await create(client, f"ETag PATCH {uuid.uuid4().hex[:6]}")
+    url = f"/api/clients/{created['clientId']}"
+    old_etag = (await client.get(url)).headers["etag"]
+    first = await client.patch(url, json={"fullName": "Первая правка"}, headers={"If-Match": old_etag})
+    second = await client.patch(
+        url, json={"fullName": "Вторая правка"}, headers={"If-Match": first.headers.get("etag", "")}
+    )
+    stale = await client.patch(url, json={"fullName": "Потерянная правка"}, headers={"If-Match": old_etag})
+    current = await client.get(url)
+    if (
+        first.status_code != 200
+        or second.status_code != 200
+        or first.headers["etag"] == old_etag
+        or second.headers["etag"] == first.headers["etag"]
+        or second.headers["etag"] != current.headers["etag"]
+        or stale.status_code != 412
+        or stale.json()["errorName"] != "CLIENT_PRECONDITION_FAILED"
+        or current.json()["fullName"] != "Вторая правка"
+    ):
+        print(f"   ОШИБКА: правки {first.status_code}/{second.status_code}, старый ETag {stale.status_code}, "
+              f"fullName {current.json()['fullName']!r}")
+        return 1
+    weak = await client.patch(url, json={"fullName": "Слабый ETag"}, headers={"If-Match": f"W/{current.headers['etag']}"})
+    if weak.status_code != 412:
+        print(f"   ОШИБКА: If-Match со слабым ETag — {weak.status_code}, ожидался 412")
+        return 1
+    await create(client, f"ETag ребёнок {uuid.uuid4().hex[:6]}", created["clientId"])
+    with_child = await client.patch(
+        url, json={"fullName": "После ребёнка"}, headers={"If-Match": current.headers["etag"]}
+    )
+    if with_child.status_code != 200:
+        print(f"   ОШИБКА: правка после появления ребёнка — {with_child.status_code}")
+        return 1
+    print("   OK: две правки подряд — разные ETag, старый и слабый ETag — 412, новый ребёнок правке не мешает")
+    return 0
+
+
+async def check_single_statement(client) -> int:
+    print("3. PATCH — один запрос к БД")
+    created = await create(client, f"ETag SQL {uuid.uuid4().hex[:6]}")
+    url = f"/api/clients/{created['clientId']}"
+    etag = (await client.get(url)).headers["etag"]
+    statements: list[str] = []
+
+    def capture(_conn, _cursor, statement, *_args) -> None:
+        statements.append(statement.split(None, 1)[0].upper())
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        response = await client.patch(url, json={"fullName": "Одним запросом"}, headers={"If-Match": etag})
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    if response.status_code != 200 or statements != ["UPDATE"]:
+        print(f"   ОШИБКА: статус {response.status_code}, запросы {statements}")
+        return 1
+    print("   OK: UPDATE … RETURNING с условием If-Match, SELECT нет")
+    return 0
+
+
+async def check_delete(client) -> int:
+    print("4. DELETE с If-Match")
+    created = await create(client, f"ETag DELETE {uuid.uuid4().hex[:6]}")
+    url = f"/api/clients/{created['clientId']}"
+    old_etag = (await client.get(url)).headers["etag"]
+    await client.patch(url, json={"fullName": "Изменён"})
+    stale = await client.delete(url, headers={"If-Match": old_etag})
+    still_there = (await client.get(url)).status_code
+    current = await client.delete(url, headers={"If-Match": (await client.get(url)).headers["etag"]})
+    other = await create(client, f"ETag DELETE * {uuid.uuid4().hex[:6]}")
+    any_version = await client.delete(f"/api/clients/{other['clientId']}", headers={"If-Match": "*"})
+    missing = await client.delete(url, headers={"If-Match": old_etag})
+    statuses = (stale.status_code, still_there, current.status_code, any_version.status_code, missing.status_code)
+    if statuses != (412, 200, 204, 204, 404):
+        print(f"   ОШИБКА: статусы {statuses}")
+        return 1
+    print("   OK: старый ETag — 412 и клиент на месте, текущий и «*» — 204, удалённый — 404")
+    return 0
+
+
+async def run() -> int:
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            failed = await check_get(client)
+            failed += await check_patch(client)
+            failed += await check_single_statement(client)
+            failed += await check_delete(client)
+    return failed
+
+
+def main() -> None:
+    print("=== ETag клиента: условный GET, If-Match ===\n")
+    failed = asyncio.run(run())
+    if failed:
+        print(f"\n=== Провалено проверок: {failed} ===")
+        raise SystemExit(1)
+    print("\n=== Все проверки пройдены ===")
+
+
+if __name__ == "__main__":
+    main()
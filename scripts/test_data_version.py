@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Проверка версии данных clients в БД (src/data_version.py) — ETag /api/clients/parents.
+
+1. Без записей: повтор с If-None-Match — 304.
+2. Запись через API: ETag другой, старый ETag — 200 со списком.
+3. Запись мимо процесса (отдельное соединение sqlite3 — как другой воркер uvicorn или ручной SQL):
+   ETag тоже меняется, хотя кеши этого процесса о записи не знают.
+4. Загрузка генератором src.seed (триггеры снимаются на время загрузки): версия поднята,
+   триггеры версии после загрузки на месте.
+5. token у каждой новой БД свой: одинаковые номера версий разных app.db не дают один ETag.
+
+Сервер не нужен: приложение в процессе (httpx.ASGITransport) на временной БД.
+Запуск: python scripts/test_data_version.py
+Нужен пакет httpx.
+"""
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+# DATABASE_URL относительный (./app.db) — временный каталог даёт чистую БД
+os.chdir(tempfile.mkdtemp(prefix="data_version_"))
+
+import httpx  # noqa: E402
+from sqlalchemy import create_engine, text  # noqa: E402
+
+from src.data_version import VERSION_TABLE, ensure_data_version  # noqa: E402
+from src.database import engine  # noqa: E402
+from src.main import app  # noqa: E402
+from src.seed import generate_clients  # noqa: E402
+
+PARENTS = "/api/clients/parents?compact=true"
+
+
+async def etag(client) -> str:
+    return (await client.get(PARENTS)).headers["etag"]
+
+
+async def revalidate(client, tag: str) -> int:
+    return (await client.get(PARENTS, headers={"If-None-Match": tag})).status_code
+
+
+async def check_unchanged(client) -> int:
+    print("1. Без записей")
+    tag = await etag(client)
+    status = await revalidate(client, tag)
+    if status != 304:
+        print(f"   ОШИБКА: повтор с If-None-Match — {status}")
+        return 1
+    print(f"   OK: ETag {tag}, повтор — 304")
+    return 0
+
+
+async def check_api_write(client) -> int:
+    print("2. Запись через API")
+    before = await etag(client)
+    created = await client.post("/api/clients", json={"name": "Версия через API", "partyType": "legal"})
+    after = await etag(client)
+    status = await revalidate(client, before)
+    if created.status_code != 201 or after == before or status != 200:
+        print(f"   ОШИБКА: создание {created.status_code}, ETag {before} → {after}, старый ETag — {status}")
+        return 1
+    print(f"   OK: ETag {before} → {after}, старый — 200")
+    return 0
+
+
+async def check_outside_write(client) -> int:
+    print("3. Запись мимо процесса")
+    before = await etag(client)
+    with sqlite3.connect("app.db") as conn:
+        conn.execute("UPDATE clients SET full_name = 'Правка мимо API' "
+                     "WHERE client_id = (SELECT min(client_id) FROM clients WHERE parent_id IS NULL)")
+    after = await etag(client)
+    status = await revalidate(client, before)
+    if after == before or status != 200:
+        print(f"   ОШИБКА: ETag {before} → {after}, старый ETag — {status}")
+        return 1
+    print(f"   OK: ETag {before} → {after}, старый — 200")
+    return 0
+
+
+async def check_seed(client) -> int:
+    print("4. Загрузка генератором")
+    before = await etag(client)
+    with engine.begin() as conn:
+        generate_clients(conn, 200, seed=7, reset=True)
+        triggers = conn.execute(text(
+            "SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE :prefix"
+        ), {"prefix": f"{VERSION_TABLE}_%"}).scalar()
+    after = await etag(client)
+    if after == before or triggers != 3:
+        print(f"   ОШИБКА: ETag {before} → {after}, триггеров версии {triggers} из 3")
+        return 1
+    print(f"   OK: ETag {before} → {after}, триггеры версии на месте")
+    return 0
+
+
+def check_token() -> int:
+    print("5. token новой БД")
+    tokens = set()
+    for _ in range(3):
+        fresh = create_engine("sqlite://")
+        with fresh.begin() as conn:
+            conn.execute(text("CREATE TABLE clients (client_id TEXT PRIMARY KEY)"))
+            ensure_data_version(conn)
+            ensure_data_version(conn)  # повторный вызов строку не трогает
+            rows = conn.execute(text(f"SELECT token, version FROM {VERSION_TABLE}")).all()
+        if len(rows) != 1 or rows[0][1] != 0:
+            print(f"   ОШИБКА: строк версии {rows}")
+            return 1
+        tokens.add(rows[0][0])
+    if len(tokens) != 3:
+        print(f"   ОШИБКА: token трёх новых БД: {tokens}")
+        return 1
+    print("   OK: у трёх новых БД разные token, версия с нуля")
+    return 0
+
+
+async def run() -> int:
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            failed = await check_unchanged(client)
+            failed += await check_api_write(client)
+            failed += await check_outside_write(client)
+            failed += await check_seed(client)
+    return failed + check_token()
+
+
+def main() -> None:
+    print("=== Версия данных clients в БД (ETag /parents) ===\n")
+    failed = asyncio.run(run())
+    if failed:
+        print(f"\n=== Провалено проверок: {failed} ===")
+        raise SystemExit(1)
+    print("\n=== Все проверки пройдены ===")
+
+
+if __name__ == "__main__":
+    main()
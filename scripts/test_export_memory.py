@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Проверка, что выгрузка GET /api/clients/export не держит выборку в памяти.
+
+Во временной БД выгружаются 5 тыс. и 50 тыс. клиентов (NDJSON и CSV), пиковая
+память выгрузки меряется tracemalloc. При потоковой отдаче пик определяется размером
+пачки (CLIENT_EXPORT_CHUNK_SIZE), а не таблицы: проверка падает, если на 50 тыс.
+строк пик больше чем вдвое превышает пик на 5 тыс.
+
+Сервер не нужен: используется временная БД во временном каталоге.
+Запуск: python scripts/test_export_memory.py
+"""
+import os
+import sys
+import tempfile
+import tracemalloc
+import uuid
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+# DATABASE_URL относительный (./app.db) — временный каталог даёт чистую БД
+os.chdir(tempfile.mkdtemp(prefix="export_memory_"))
+
+from sqlalchemy import insert, select  # noqa: E402
+
+from src.database import engine, init_db  # noqa: E402
+from src.export import export_chunks  # noqa: E402
+from src.models.client_model import ClientModel  # noqa: E402
+from src.types.export_format import ExportFormat  # noqa: E402
+from src.types.party_type import PartyType  # noqa: E402
+
+SIZES = (5_000, 50_000)
+
+
+def fill_to(count: int) -> None:
+    """Добавить клиентов, чтобы в таблице стало count строк."""
+    with engine.begin() as conn:
+        existing = conn.execute(select(ClientModel.__table__.c.client_id).limit(count)).all()
+        rows = [
+            {
+                "client_id": uuid.uuid4(),
+                "name": f"Клиент {i}",
+                "full_name": f"ООО Клиент {i}",
+                "party_type": PartyType.LEGAL,
+                "inn": str(7700000000 + i),
+            }
+            for i in range(len(existing), count)
+        ]
+        if rows:
+            conn.execute(insert(ClientModel.__table__), rows)
+
+
+def export_peak(export_format: ExportFormat) -> tuple[int, int]:
+    """Пиковая память выгрузки всей таблицы и объём выгруженного, байт."""
+    statement = select(*ClientModel.__table__.c).order_by(ClientModel.__table__.c.created_at.desc())
+    size = 0
+    tracemalloc.start()
+    try:
+        for chunk in export_chunks(statement, export_format):
+            size += len(chunk)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak, size
+
+
+def main() -> None:
+    print("=== Память потоковой выгрузки клиентов ===\n")
+    init_db()
+    failed = 0
+    peaks: dict[ExportFormat, list[int]] = {f: [] for f in ExportFormat}
+    for count in SIZES:
+        fill_to(count)
+        for export_format in ExportFormat:
+            peak, size = export_peak(export_format)
+            peaks[export_format].append(peak)
+            print(f"   {count:>7} строк, {export_format.value:>6}: выгружено {size / 2**20:6.1f} МиБ, пик памяти {peak / 2**20:5.2f} МиБ")
+
+    for export_format, (small, large) in peaks.items():
+        if large > 2 * small:
+            print(f"   ОШИБКА: {export_format.value} — пик растёт с размером таблицы ({small} → {large} байт)")
+            failed += 1
+
+    if failed:
+        print(f"\n=== Провалено проверок: {failed} ===")
+        raise SystemExit(1)
+    print("\n=== Все проверки пройдены ===")
+
+
+if __name__ == "__main__":
+    main()
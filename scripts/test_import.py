@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Проверка загрузки клиентов POST /api/clients/import.
+
+1. Ошибки по строкам: битый JSON, неизвестный partyType, дубликат имени внутри файла,
+   CSV с переводом строки в кавычках и неверным числом полей.
+2. Скорость: 100 тыс. строк NDJSON, тело отдаётся потоком кусками по 64 КиБ.
+   Цель — не меньше 100 тыс. строк в минуту.
+
+Приложение работает в процессе (httpx.ASGITransport, без сети и uvicorn) на временной БД.
+Запуск: python scripts/test_import.py
+Нужен пакет httpx.
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+# DATABASE_URL относительный (./app.db) — временный каталог даёт чистую БД
+os.chdir(tempfile.mkdtemp(prefix="import_"))
+
+import httpx  # noqa: E402
+
+from src.main import app  # noqa: E402
+
+ROWS = 100_000
+TARGET_ROWS_PER_MINUTE = 100_000
+
+
+async def body_stream(payload: bytes, piece: int = 64 * 1024):
+    for start in range(0, len(payload), piece):
+        yield payload[start:start + piece]
+
+
+def line_errors(report: dict) -> dict[int, str]:
+    return {e["line"]: e["error"]["errorName"] + ": " + e["error"]["message"] for e in report["errors"]}
+
+
+async def run() -> int:
+    failed = 0
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://import", timeout=None) as client:
+            print("1. NDJSON: ошибки по строкам")
+            ndjson = "\n".join([
+                json.dumps({"name": "Импорт 1", "partyType": "legal", "inn": "550000000001"}),
+                "{битый json",
+                json.dumps({"name": "Импорт 2", "partyType": "alien"}),
+                json.dumps({"name": "Импорт 1", "partyType": "individual"}),
+                json.dumps({"name": "Импорт 3", "partyType": "individual"}),
+            ])
+            report = (await client.post("/api/clients/import", content=ndjson.encode())).json()
+            errors = line_errors(report)
+            if report["created"] != 2 or sorted(errors) != [2, 3, 4] or "CLIENT_ALREADY_EXISTS" not in errors[4]:
+                print("   ОШИБКА: ожидалось created=2 и ошибки в строках 2, 3, 4, получено", report)
+                failed += 1
+            else:
+                print("   OK: created=2, ошибки:", errors)
+
+            print("2. CSV: перевод строки в кавычках, неверное число полей")
+            csv_body = 'name,partyType,fullName\n"Много-\nстрочный",legal,"ООО ""Кавычки"""\nОдно поле\n'
+            report = (await client.post("/api/clients/import", params={"format": "csv"}, content=csv_body.encode())).json()
+            errors = line_errors(report)
+            if report["created"] != 1 or list(errors) != [4]:
+                print("   ОШИБКА: ожидалось created=1 и ошибка в строке 4, получено", report)
+                failed += 1
+            else:
+                print("   OK: created=1, ошибки:", errors)
+
+            print(f"3. Скорость: {ROWS} строк NDJSON")
+            payload = "\n".join(
+                json.dumps({"name": f"Клиент {i}", "partyType": "legal", "inn": str(7700000000 + i)})
+                for i in range(ROWS)
+            ).encode()
+            started = time.perf_counter()
+            report = (await client.post("/api/clients/import", content=body_stream(payload))).json()
+            elapsed = time.perf_counter() - started
+            per_minute = ROWS / elapsed * 60
+            if report["created"] != ROWS or per_minute < TARGET_ROWS_PER_MINUTE:
+                print(f"   ОШИБКА: создано {report['created']}, {per_minute:.0f} строк/мин (цель {TARGET_ROWS_PER_MINUTE})")
+                failed += 1
+            else:
+                print(f"   OK: {report['created']} строк за {elapsed:.1f} с, {per_minute:.0f} строк/мин, пачек {report['chunks']}")
+    return failed
+
+
+def main() -> None:
+    print("=== Загрузка клиентов из NDJSON / CSV ===\n")
+    failed = asyncio.run(run())
+    if failed:
+        print(f"\n=== Провалено проверок: {failed} ===")
+        raise SystemExit(1)
+    print("\n=== Все проверки пройдены ===")
+
+
+if __name__ == "__main__":
+    main()
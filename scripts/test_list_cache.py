@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Проверка кеша ответов GET /api/clients (_list_cache) и кеша total (_count_cache).
+
+1. Повтор запроса: второй ответ — из кеша (попадание), байты те же; параметры нормализуются
+   (query="" — как без query), другие параметры — другая запись.
+2. Сброс записью: после create / PATCH / DELETE следующий список — промах и показывает изменение.
+3. Чтение, начатое до записи: тело и total ложатся под старой версией и после записи не находятся.
+4. Запись мимо API (другой воркер, seed, SQL): total из кеша — до истечения срока жизни, потом новый.
+5. Пределы ResponseCache и LruCache: вытеснение по суммарному размеру и срок жизни записи.
+6. Статистика: /debug/list-cache и ряды client_list_cache_* в /metrics.
+
+Сервер не нужен: обработчики вызываются напрямую на временной БД.
+Запуск: python scripts/test_list_cache.py
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+# DATABASE_URL относительный (./app.db) — временный каталог даёт чистую БД
+os.chdir(tempfile.mkdtemp(prefix="list_cache_"))
+
+from sqlalchemy import text  # noqa: E402
+
+from src.cache import LruCache, ResponseCache  # noqa: E402
+from src.database import ReadSessionLocal, SessionLocal, engine, init_db  # noqa: E402
+from src.routers import clients, debug, metrics  # noqa: E402
+from src.schemas.client import ClientCreate, ClientListQuery, ClientUpdate  # noqa: E402
+from src.seed import seed_db  # noqa: E402
+from src.types.client_sort_by import ClientSortBy  # noqa: E402
+from src.types.party_type import PartyType  # noqa: E402
+from src.types.sort_order import SortOrder  # noqa: E402
+
+# Свежие клиенты — первыми: create виден на первой странице
+NEWEST = {"sort_by": ClientSortBy.CREATED_AT, "sort_order": SortOrder.DESC, "limit": 5}
+
+
+def list_page(**params) -> bytes:
+    with ReadSessionLocal() as db:
+        return clients.list_clients(ClientListQuery(**params), db).body
+
+
+def hits() -> int:
+    return clients.list_cache_stats()["hits"]
+
+
+def check_repeat() -> int:
+    print("1. Повтор запроса")
+    first = list_page(limit=20)
+    before = hits()
+    second = list_page(limit=20)
+    empty_query = list_page(limit=20, query="")
+    after_repeat = hits()
+    list_page(limit=21)
+    if first != second or empty_query != first or after_repeat != before + 2 or hits() != after_repeat:
+        print(f"   ОШИБКА: байты совпали {first == second}, попаданий {before} → {after_repeat} → {hits()}")
+        return 1
+    print("   OK: повтор и query=\"\" — попадания, limit=21 — отдельная запись")
+    return 0
+
+
+def check_writes() -> int:
+    print("2. Сброс записью")
+    db = SessionLocal()
+    try:
+        list_page(**NEWEST)
+        created = clients.create_client(ClientCreate(name="Кеш списка", party_type=PartyType.LEGAL), db)
+        steps = [("create", "Кеш списка")]
+        page = json.loads(list_page(**NEWEST))
+        names = [[item["name"] for item in page["items"]]]
+        clients.update_client(created.client_id, ClientUpdate(name="Кеш списка 2"), db)
+        steps.append(("PATCH", "Кеш списка 2"))
+        names.append([item["name"] for item in json.loads(list_page(**NEWEST))["items"]])
+        clients.delete_client(created.client_id, db)
+        steps.append(("DELETE", None))
+        names.append([item["name"] for item in json.loads(list_page(**NEWEST))["items"]])
+    finally:
+        db.close()
+    for (title, expected), page_names in zip(steps, names):
+        visible = page_names[0] == expected if expected else not any(n.startswith("Кеш списка") for n in page_names)
+        if not visible:
+            print(f"   ОШИБКА после {title}: первая страница {page_names}")
+            return 1
+    print("   OK: после create, PATCH и DELETE первая страница показывает изменение")
+    return 0
+
+
+def check_stale_read() -> int:
+    print("3. Чтение, начатое до записи")
+    params = ClientListQuery(limit=7, party_type=PartyType.LEGAL)
+    version = clients._clients_version.value
+    stale_key = (version, clients._list_key(params))
+    clients._clients_changed()  # запись, пока «страница читалась»
+    clients._list_cache.set(stale_key, b"stale")
+    clients._count_cache.set((version, clients._filter_key(params)), -1)
+    body = list_page(limit=7, party_type=PartyType.LEGAL)
+    if body == b"stale" or json.loads(body)["total"] == -1:
+        print("   ОШИБКА: тело или total, прочитанные до записи, отданы после неё")
+        return 1
+    print("   OK: тело и total под старой версией не находятся")
+    return 0
+
+
+def check_outside_write() -> int:
+    print("4. Запись мимо API")
+    ttl = clients._count_cache.ttl
+    clients._count_cache.ttl = 0.2
+    clients._count_cache.clear()  # записи прежних проверок — с прежним сроком жизни
+    try:
+        # Разные limit — разные записи кеша ответов, но один набор фильтров — одна запись total
+        before = json.loads(list_page(limit=3, party_type=PartyType.LEGAL))["total"]
+        with engine.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO clients (client_id, name, party_type) VALUES (:id, 'Мимо API', 'LEGAL')"
+            ), {"id": "0" * 31 + "1"})
+        cached = json.loads(list_page(limit=4, party_type=PartyType.LEGAL))["total"]
+        time.sleep(0.25)
+        fresh = json.loads(list_page(limit=5, party_type=PartyType.LEGAL))["total"]
+    finally:
+        clients._count_cache.ttl = ttl
+    if cached != before or fresh != before + 1:
+        print(f"   ОШИБКА: total {before} → {cached} (в сроке жизни) → {fresh} (после)")
+        return 1
+    print(f"   OK: total {before} из кеша до истечения срока жизни, затем {fresh}")
+    return 0
+
+
+def check_limits() -> int:
+    print("5. Пределы ResponseCache и LruCache")
+    cache: ResponseCache[str] = ResponseCache(maxsize=10, max_bytes=100, ttl=0.2)
+    for key in "abc":
+        cache.set(key, b"x" * 40)
+    evicted = cache.get("a") is None and cache.get("c") is not None
+    size = cache.stats()["bytes"]
+    time.sleep(0.25)
+    expired = cache.get("c") is None and cache.stats()["entries"] == 1
+    totals: LruCache[str, int] = LruCache(maxsize=2, ttl=0.2)
+    for key in "abc":
+        totals.set(key, 1)
+    lru_evicted = totals.get("a") is None and totals.get("c") == 1
+    time.sleep(0.25)
+    lru_expired = totals.get("c") is None and len(totals) == 1
+    if not evicted or size != 80 or not expired or not lru_evicted or not lru_expired:
+        print(f"   ОШИБКА: вытеснение по размеру {evicted} ({size} байт), срок жизни {expired}; "
+              f"LruCache: вытеснение {lru_evicted}, срок жизни {lru_expired}")
+        return 1
+    print("   OK: 3 тела по 40 байт при пределе 100 — старое вытеснено; по сроку жизни — промах (и у LruCache)")
+    return 0
+
+
+def check_stats() -> int:
+    print("6. Статистика")
+    stats = debug.list_cache_stats()
+    text = asyncio.run(metrics.metrics()).body.decode()
+    rows = [line for line in text.splitlines() if line.startswith("client_list_cache_")]
+    if stats.hits < 1 or not 0 < stats.hit_rate < 1 or stats.bytes <= 0 or len(rows) != 4:
+        print(f"   ОШИБКА: {stats}, рядов в /metrics {len(rows)}")
+        return 1
+    print(f"   OK: записей {stats.entries}, {stats.bytes} байт, попаданий {stats.hit_rate:.0%}; в /metrics — {len(rows)} ряда")
+    return 0
+
+
+def main() -> None:
+    print("=== Кеш ответов списка клиентов ===\n")
+    init_db()
+    seed_db()
+    failed = check_repeat()
+    failed += check_writes()
+    failed += check_stale_read()
+    failed += check_outside_write()
+    failed += check_limits()
+    failed += check_stats()
+    if failed:
+        print(f"\n=== Провалено проверок: {failed} ===")
+        raise SystemExit(1)
+    print("\n=== Все проверки пройдены ===")
+
+
+if __name__ == "__main__":
+    main()
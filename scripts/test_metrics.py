@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Проверка GET /metrics (src/metrics.py).
+
+1. Запросы: счётчики по шаблону пути роута и статусу (один ряд на /api/clients/{client_id},
+   а не на каждый id), гистограмма времени, ошибки по error_name (VALIDATION_ERROR и
+   бизнес-ошибки), выдачи соединений пула, пул потоков; каждая строка — в формате Prometheus.
+2. Несколько процессов (METRICS_DIR): снимок другого, уже завершившегося процесса
+   прибавляется к счётчикам, а его gauge — нет.
+3. Снимок в METRICS_DIR по ходу запросов пишется не в потоке event loop, а запрос его не ждёт.
+4. Без METRICS_ENDPOINT (по умолчанию) /metrics не подключён — 404.
+5. Ожидание соединения: при занятом пуле (pool_size 1, без overflow) второй запрос соединения
+   ждёт, пока первое не вернут, — время попадает в db_pool_checkout_wait_seconds.
+
+Сервер не нужен: приложение в процессе (httpx.ASGITransport) на временной БД.
+Запуск: python scripts/test_metrics.py
+Нужен пакет httpx.
+"""
+import asyncio
+import os
+import re
+import subprocess
+import sys
+import threading
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+# DATABASE_URL относительный (./app.db) — временный каталог даёт чистую БД
+os.chdir(tempfile.mkdtemp(prefix="metrics_"))
+
+import src.config  # noqa: E402
+
+# Каталог читается при импорте src.metrics
+METRICS_DIR = tempfile.mkdtemp(prefix="metrics_dir_")
+src.config.METRICS_DIR = METRICS_DIR
+# Эндпоинт подключается при импорте src.main
+src.config.METRICS_ENDPOINT = True
+
+import httpx  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+
+from src import metrics  # noqa: E402
+from src.main import app  # noqa: E402
+
+_LINE_RE = re.compile(r'^[a-z_]+(\{([a-z_]+="([^"\\]|\\.)*",?)+\})? -?[0-9.e+-]+$|^[a-z_]+\{.*le="\+Inf".*\} [0-9]+$')
+
+# Другой воркер: 3 ошибки и 5 «запросов в обработке», снимок — и процесс завершается
+_OTHER_WORKER = f"""
+import sys
+sys.path.insert(0, {str(ROOT)!r})
+import src.config
+src.config.METRICS_DIR = {METRICS_DIR!r}
+from src import metrics
+for _ in range(3):
+    metrics.count_error("OTHER_WORKER_ERROR")
+metrics.registry.add_gauge("http_requests_in_progress", (), 5)
+metrics.flush(collect=False)
+"""
+
+
+def sample(text: str, name: str, **labels: str) -> float | None:
+    """Значение ряда name с ровно такими метками (порядок меток — как при записи)."""
+    label_text = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    series = f"{name}{{{label_text}}}" if labels else name
+    for line in text.splitlines():
+        if line.startswith(series + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+async def check_requests(client) -> int:
+    print("1. Счётчики запросов, ошибки, пул")
+    ids = [item["clientId"] for item in (await client.get("/api/clients", params={"limit": 3})).json()["items"]]
+    for client_id in ids:
+        await client.get(f"/api/clients/{client_id}")
+    await client.get(f"/api/clients/{uuid.UUID(int=0)}")
+    await client.get("/api/clients", params={"limit": 1000})
+    await client.get("/no-such-path")
+    text = (await client.get("/metrics")).text
+
+    bad_lines = [line for line in text.splitlines() if not line.startswith("#") and not _LINE_RE.match(line)]
+    expected = {
+        "GET /api/clients/{client_id} 200": (
+            sample(text, "http_requests_total", method="GET", route="/api/clients/{client_id}", status="200"), len(ids)),
+        "GET /api/clients/{client_id} 404": (
+            sample(text, "http_requests_total", method="GET", route="/api/clients/{client_id}", status="404"), 1),
+        "GET /api/clients 422": (
+            sample(text, "http_requests_total", method="GET", route="/api/clients", status="422"), 1),
+        "неизвестный путь": (
+            sample(text, "http_requests_total", method="GET", route="<unmatched>", status="404"), 1),
+        "гистограмма /api/clients/{client_id}": (
+            sample(text, "http_request_duration_seconds_count", method="GET", route="/api/clients/{client_id}"),
+            len(ids) + 1),
+        "CLIENT_NOT_FOUND": (sample(text, "app_errors_total", error_name="CLIENT_NOT_FOUND"), 1),
+        "VALIDATION_ERROR": (sample(text, "app_errors_total", error_name="VALIDATION_ERROR"), 1),
+    }
+    wrong = {title: values for title, values in expected.items() if values[0] != values[1]}
+    checkouts = sample(text, "db_pool_checkouts_total", engine="read") or 0
+    waits = sample(text, "db_pool_checkout_wait_seconds_count", engine="read") or 0
+    threads = sample(text, "threadpool_threads_limit")
+    if bad_lines or wrong or checkouts < len(ids) or waits < checkouts or not threads:
+        print(f"   ОШИБКА: неверные строки {bad_lines[:3]}, расхождения {wrong}, "
+              f"выдач соединений {checkouts}, замеров ожидания {waits}, пул потоков {threads}")
+        return 1
+    print(f"   OK: {len(expected)} рядов совпали, выдач соединений read {checkouts:.0f}, пул потоков {threads:.0f}")
+    return 0
+
+
+async def check_workers(client) -> int:
+    print("2. Сложение процессов через METRICS_DIR")
+    subprocess.run([sys.executable, "-c", _OTHER_WORKER], check=True)
+    text = (await client.get("/metrics")).text
+    errors = sample(text, "app_errors_total", error_name="OTHER_WORKER_ERROR")
+    # Сам запрос /metrics — единственный в обработке у живого процесса
+    in_progress = sample(text, "http_requests_in_progress")
+    files = len(list(Path(METRICS_DIR).glob("metrics_*.json")))
+    if errors != 3 or in_progress != 1 or files != 2:
+        print(f"   ОШИБКА: ошибок другого процесса {errors}, в обработке {in_progress}, снимков {files}")
+        return 1
+    print("   OK: счётчики завершившегося процесса прибавлены, его gauge отброшены")
+    return 0
+
+
+async def check_flush_thread(client) -> int:
+    print("3. Запись снимка вне event loop")
+    loop_thread = threading.get_ident()
+    writers = []
+    original = metrics._write_snapshot
+
+    def recording(snapshot: dict) -> None:
+        writers.append(threading.get_ident())
+        original(snapshot)
+
+    metrics._write_snapshot = recording
+    metrics._last_flush = 0.0  # срок записи подошёл
+    try:
+        await client.get("/api/regions")
+        await asyncio.sleep(0.2)  # запись идёт в потоке исполнителя loop
+    finally:
+        metrics._write_snapshot = original
+    if len(writers) != 1 or writers[0] == loop_thread:
+        print(f"   ОШИБКА: записей {len(writers)}, в потоке event loop: {loop_thread in writers}")
+        return 1
+    print("   OK: снимок записан в другом потоке")
+    return 0
+
+
+# Приложение с настройками по умолчанию: код ответа GET /metrics
+_DEFAULT_APP = f"""
+import os, sys, tempfile
+sys.path.insert(0, {str(ROOT)!r})
+os.chdir(tempfile.mkdtemp(prefix="metrics_default_"))
+from fastapi.testclient import TestClient
+from src.main import app
+print(TestClient(app).get("/metrics").status_code)
+"""
+
+
+def check_disabled() -> int:
+    print("4. /metrics по умолчанию выключен")
+    out = subprocess.run([sys.executable, "-c", _DEFAULT_APP], check=True, capture_output=True, text=True)
+    status = out.stdout.strip()
+    if status != "404":
+        print(f"   ОШИБКА: GET /metrics без METRICS_ENDPOINT — {status}")
+        return 1
+    print("   OK: 404")
+    return 0
+
+
+def check_checkout_wait() -> int:
+    print("5. Ожидание соединения из занятого пула")
+    engine = create_engine(
+        "sqlite:///checkout_wait.db", connect_args={"check_same_thread": False}, pool_size=1, max_overflow=0
+    )
+    metrics.instrument_pool(engine, "wait_test")
+    taken = threading.Event()
+
+    def hold() -> None:
+        with engine.connect():
+            taken.set()
+            time.sleep(0.3)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    taken.wait()
+    with engine.connect():
+        pass
+    holder.join()
+    text = metrics.render([metrics.registry.snapshot()], metrics.registry.buckets)
+    count = sample(text, "db_pool_checkout_wait_seconds_count", engine="wait_test")
+    waited = sample(text, "db_pool_checkout_wait_seconds_sum", engine="wait_test") or 0
+    if count != 2 or waited < 0.2:
+        print(f"   ОШИБКА: замеров ожидания {count}, суммарно {waited:.3f} с")
+        return 1
+    print(f"   OK: 2 выдачи, ожидание второй — {waited:.2f} с")
+    return 0
+
+
+async def run() -> int:
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            failed = await check_requests(client)
+            failed += await check_workers(client)
+            failed += await check_flush_thread(client)
+    return failed
+
+
+def main() -> None:
+    print("=== Метрики GET /metrics ===\n")
+    failed = asyncio.run(run())
+    failed += check_disabled()
+    failed += check_checkout_wait()
+    if failed:
+        print(f"\n=== Провалено проверок: {failed} ===")
+        raise SystemExit(1)
+    print("\n=== Все проверки пройдены ===")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Проверка индексов таблицы clients: EXPLAIN QUERY PLAN для всех запросов,
+которые выполняют роуты списка клиентов, /parents, /descendants, /ancestors,
+проверка цикла родителей и пакетные проверки POST /batch. Уникальность имени и ИНН при записи проверяют уникальные индексы —
+отдельных SELECT для неё нет.
+
+Комбинации: фильтры query / parent_id / ancestor_id / region_id / party_type (все подмножества)
+× каждое поле ClientSortBy × оба направления × режимы offset и cursor.
+query берётся от трёх символов — он идёт через FTS-индекс (src/search.py);
+более короткие запросы проходят таблицу целиком — это ожидаемо.
+Проверка падает, если в плане есть полный проход «SCAN clients» без индекса или полный
+проход (по таблице или целиком по индексу) вместе с сортировкой во временном B-дереве
+(«USE TEMP B-TREE FOR … ORDER BY»): сортировка всей таблицы на каждую страницу.
+
+Сервер не нужен: используется временная БД во временном каталоге.
+Запуск: python scripts/test_query_plans.py
+"""
+import itertools
+import json
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+# DATABASE_URL относительный (./app.db) — временный каталог даёт чистую БД
+os.chdir(tempfile.mkdtemp(prefix="query_plans_"))
+
+from sqlalchemy import event, text  # noqa: E402
+
+from src.database import SessionLocal, engine, init_db  # noqa: E402
+from src.models.client_model import ClientModel  # noqa: E402
+from src.routers import clients  # noqa: E402
+from src.schemas.client import ClientListQuery, ClientParentsQuery, ClientSelection, ClientTreeQuery  # noqa: E402
+from src.seed import seed_db  # noqa: E402
+from src.types.client_sort_by import ClientSortBy  # noqa: E402
+from src.types.party_type import PartyType  # noqa: E402
+from src.types.sort_order import SortOrder  # noqa: E402
+
+captured: list[tuple[str, tuple]] = []
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _capture(_conn, _cursor, statement, parameters, _context, _executemany) -> None:
+    """Запоминаем SQL и параметры ровно в том виде, в каком они уходят в драйвер."""
+    if statement.lstrip().upper().startswith("SELECT"):
+        captured.append((statement, parameters))
+
+
+def plan_problems(statement: str, parameters: tuple) -> list[str]:
+    """
+    Строки плана с полным проходом по clients или её псевдониму clients_N: SCAN без индекса —
+    всегда; SCAN по индексу — если в том же плане ORDER BY сортируется во временном B-дереве.
+    """
+    with engine.connect() as conn:
+        plan = [row[3].strip() for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+    scans = [line for line in plan if re.match(r"SCAN clients(_\d+)?( |$)", line)]
+    problems = [line for line in scans if re.fullmatch(r"SCAN clients(_\d+)?", line)]
+    sorts = [line for line in plan if re.match(r"USE TEMP B-TREE FOR .*ORDER BY", line)]
+    if sorts:
+        problems += [f"{line} + {sorts[0]}" for line in scans if line not in problems]
+    return problems
+
+
+def prepare_data() -> tuple:
+    """Наполнение БД (seed строит иерархию) и головной клиент с детьми — для фильтров по родителю и группе."""
+    init_db()
+    seed_db()
+    db = SessionLocal()
+    try:
+        first = (
+            db.query(ClientModel)
+            .filter(ClientModel.parent_id.is_(None), ClientModel.children_count > 0)
+            .order_by(ClientModel.name)
+            .first()
+        )
+        child = db.query(ClientModel).filter(ClientModel.parent_id == first.client_id).first()
+        region_id = db.execute(text("SELECT region_id FROM clients WHERE region_id IS NOT NULL LIMIT 1")).scalar()
+        return first.client_id, child.client_id, first.name, first.inn, child.region_id or region_id
+    finally:
+        db.close()
+
+
+def main() -> None:
+    print("=== Проверка планов запросов clients ===\n")
+    parent_id, child_id, parent_name, parent_inn, region_id = prepare_data()
+    filters = {
+        "query": "иванов",
+        "parent_id": parent_id,
+        "ancestor_id": parent_id,
+        "region_id": region_id,
+        "party_type": PartyType.LEGAL,
+    }
+
+    checks: list[tuple[str, callable]] = []
+    for size in range(len(filters) + 1):
+        for names in itertools.combinations(filters, size):
+            for sort_by, sort_order in itertools.product(ClientSortBy, SortOrder):
+                base = {name: filters[name] for name in names}
+                base.update(sort_by=sort_by, sort_order=sort_order, limit=5)
+                label = f"list {'+'.join(names) or 'no filters'} / {sort_by.value} {sort_order.value}"
+                checks.append((label, lambda db, base=base: _list_both_modes(db, base)))
+
+    checks.append(("parents", lambda db: clients.list_parent_clients(ClientParentsQuery(), db=db)))
+    checks.append((
+        "parents typeahead",
+        lambda db: clients.list_parent_clients(
+            ClientParentsQuery(query="ива", limit=20, compact=True), db=db
+        ),
+    ))
+    checks.append((
+        "descendants",
+        lambda db: clients.list_client_descendants(parent_id, ClientTreeQuery(), db=db),
+    ))
+    checks.append((
+        "ancestors",
+        lambda db: clients.list_client_ancestors(child_id, ClientTreeQuery(), db=db),
+    ))
+    checks.append((
+        "cycle check",
+        lambda db: [
+            clients._ensure_no_cycle(parent_id, ClientModel.client_id == child_id, db),
+            clients._ensure_no_cycle(
+                parent_id,
+                clients._selection_condition(ClientSelection(filter={"ancestor_id": parent_id, "region_id": region_id})),
+                db,
+            ),
+        ],
+    ))
+    checks.append((
+        "batch lookups",
+        lambda db: [
+            clients._existing_values(db, ClientModel.inn, {parent_inn or "000000000000", "000000000001"}),
+            clients._existing_values(db, ClientModel.name, {parent_name, "Нет такого имени"}),
+            clients._existing_values(db, ClientModel.client_id, {parent_id}),
+        ],
+    ))
+
+    failed = 0
+    for label, run in checks:
+        captured.clear()
+        # Без кеша total каждая комбинация проходит и путь с COUNT(*) OVER (),
+        # без кеша ответов — вообще доходит до SQL
+        clients._count_cache.clear()
+        clients._list_cache.clear()
+        db = SessionLocal()
+        try:
+            run(db)
+        finally:
+            db.close()
+        bad = [(sql, plan) for sql, params in captured for plan in plan_problems(sql, params)]
+        if bad:
+            failed += 1
+            print(f"   ОШИБКА: {label}")
+            for sql, plan in bad:
+                print(f"      {plan}: {' '.join(sql.split())[:200]}")
+
+    if failed:
+        print(f"\n=== Запросов с полным проходом или сортировкой всей clients: {failed} из {len(checks)} ===")
+        raise SystemExit(1)
+    print(f"=== Все проверки пройдены ({len(checks)} сценариев) ===")
+
+
+def _list_both_modes(db, base: dict) -> None:
+    """Первая страница в режиме offset и вторая — по курсору первой."""
+    next_cursor = json.loads(clients.list_clients(ClientListQuery(**base), db).body)["nextCursor"]
+    if next_cursor:
+        clients.list_clients(ClientListQuery(**base, cursor=next_cursor), db)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Проверка форматов ответа по Accept (src/formats.py): JSON объектами, колоночный JSON, MessagePack.
+
+1. Выбор формата: q-значения, application/x-msgpack, */* и неизвестные типы — JSON.
+2. GET /api/clients: колоночный ответ — те же значения, что items в JSON (и с fields=),
+   те же total / nextCursor / hasMore; Content-Type и Vary: Accept; кеш списка не путает форматы.
+3. MessagePack: распакованный ответ совпадает с колоночным JSON.
+4. /parents: compact колонками — clientId и name; у каждого формата свой ETag и свой 304.
+5. Выгрузка: колоночный JSON и поток MessagePack — те же строки, что NDJSON; format= важнее Accept.
+
+Сервер не нужен: приложение в процессе (httpx.ASGITransport) на временной БД.
+Запуск: python scripts/test_response_formats.py
+Нужен пакет httpx; проверки MessagePack — при установленном msgpack.
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+# DATABASE_URL относительный (./app.db) — временный каталог даёт чистую БД
+os.chdir(tempfile.mkdtemp(prefix="response_formats_"))
+
+import httpx  # noqa: E402
+
+from src import formats  # noqa: E402
+from src.formats import COLUMNS_MEDIA_TYPE, JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, negotiate  # noqa: E402
+from src.main import app  # noqa: E402
+
+COLUMNS = {"Accept": COLUMNS_MEDIA_TYPE}
+MSGPACK = {"Accept": MSGPACK_MEDIA_TYPE}
+
+
+def as_objects(body: dict) -> list[dict]:
+    return [dict(zip(body["columns"], row)) for row in body["rows"]]
+
+
+def check_negotiate() -> int:
+    print("1. Выбор формата по Accept")
+    msgpack_or_json = MSGPACK_MEDIA_TYPE if formats.msgpack is not None else JSON_MEDIA_TYPE
+    cases = {
+        None: JSON_MEDIA_TYPE,
+        "*/*": JSON_MEDIA_TYPE,
+        "text/html,application/xhtml+xml,*/*;q=0.8": JSON_MEDIA_TYPE,
+        COLUMNS_MEDIA_TYPE: COLUMNS_MEDIA_TYPE,
+        f"{COLUMNS_MEDIA_TYPE};q=0": JSON_MEDIA_TYPE,
+        f"application/json, {COLUMNS_MEDIA_TYPE}": JSON_MEDIA_TYPE,
+        f"application/json;q=0.5, {COLUMNS_MEDIA_TYPE}": COLUMNS_MEDIA_TYPE,
+        "application/x-msgpack": msgpack_or_json,
+    }
+    wrong = {accept: negotiate(accept) for accept, expected in cases.items() if negotiate(accept) != expected}
+    if wrong:
+        print(f"   ОШИБКА: {wrong}")
+        return 1
+    print(f"   OK: {len(cases)} заголовков — ожидаемый формат")
+    return 0
+
+
+async def check_list(client) -> int:
+    print("2. GET /api/clients колонками")
+    failed = []
+    for params in ({"limit": 50}, {"limit": 50, "fields": "clientId,name,createdAt,partyType"}):
+        plain = await client.get("/api/clients", params=params)
+        columnar = await client.get("/api/clients", params=params, headers=COLUMNS)
+        again = await client.get("/api/clients", params=params)
+        body = columnar.json()
+        expected = {key: value for key, value in plain.json().items() if key != "items"}
+        if (
+            columnar.headers["content-type"] != COLUMNS_MEDIA_TYPE
+            or "Accept" not in columnar.headers.get("vary", "")
+            or as_objects(body) != plain.json()["items"]
+            or {key: value for key, value in body.items() if key not in ("columns", "rows")} != expected
+            or again.content != plain.content
+        ):
+            failed.append(params)
+    if failed:
+        print(f"   ОШИБКА: колоночный ответ расходится с JSON для {failed}")
+        return 1
+    print(f"   OK: те же значения и поля страницы, {len(plain.content)} → {len(columnar.content)} байт (fields=)")
+    return 0
+
+
+async def check_msgpack(client) -> int:
+    print("3. MessagePack")
+    if formats.msgpack is None:
+        print("   пропущено: msgpack не установлен")
+        return 0
+    columnar = await client.get("/api/clients", params={"limit": 100}, headers=COLUMNS)
+    packed = await client.get("/api/clients", params={"limit": 100}, headers=MSGPACK)
+    if packed.headers["content-type"] != MSGPACK_MEDIA_TYPE or formats.msgpack.unpackb(packed.content) != columnar.json():
+        print(f"   ОШИБКА: {packed.headers['content-type']}, распакованный ответ не совпал с колоночным JSON")
+        return 1
+    print(f"   OK: совпадает с колоночным JSON, {len(columnar.content)} → {len(packed.content)} байт")
+    return 0
+
+
+async def check_parents(client) -> int:
+    print("4. /parents")
+    plain = await client.get("/api/clients/parents", params={"compact": "true"})
+    columnar = await client.get("/api/clients/parents", params={"compact": "true"}, headers=COLUMNS)
+    cached = await client.get(
+        "/api/clients/parents",
+        params={"compact": "true"},
+        headers={**COLUMNS, "If-None-Match": columnar.headers["etag"]},
+    )
+    cross = await client.get(
+        "/api/clients/parents", params={"compact": "true"}, headers={"If-None-Match": columnar.headers["etag"]}
+    )
+    body = columnar.json()
+    if (
+        body["columns"] != ["clientId", "name"]
+        or as_objects(body) != plain.json()["items"]
+        or columnar.headers["etag"] == plain.headers["etag"]
+        or cached.status_code != 304
+        or cross.status_code != 200
+    ):
+        print(f"   ОШИБКА: columns {body['columns']}, 304 своего формата {cached.status_code}, чужого {cross.status_code}")
+        return 1
+    print("   OK: compact — clientId и name, ETag колоночного ответа не подходит к JSON")
+    return 0
+
+
+async def check_export(client) -> int:
+    print("5. Выгрузка")
+    ndjson = [json.loads(line) for line in (await client.get("/api/clients/export")).text.splitlines()]
+    columnar = await client.get("/api/clients/export", headers=COLUMNS)
+    csv = await client.get("/api/clients/export", params={"format": "csv"}, headers=COLUMNS)
+    problems = []
+    if as_objects(columnar.json()) != ndjson or "clients.json" not in columnar.headers["content-disposition"]:
+        problems.append("колоночный JSON")
+    if not csv.headers["content-type"].startswith("text/csv"):
+        problems.append("format=csv")
+    if formats.msgpack is not None:
+        unpacker = formats.msgpack.Unpacker()
+        unpacker.feed((await client.get("/api/clients/export", headers=MSGPACK)).content)
+        columns, *rows = list(unpacker)
+        if [dict(zip(columns, row)) for row in rows] != ndjson:
+            problems.append("MessagePack")
+    if problems:
+        print(f"   ОШИБКА: {', '.join(problems)}")
+        return 1
+    print(f"   OK: {len(ndjson)} строк в каждом формате, format=csv важнее Accept")
+    return 0
+
+
+async def run() -> int:
+    failed = check_negotiate()
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            failed += await check_list(client)
+            failed += await check_msgpack(client)
+            failed += await check_parents(client)
+            failed += await check_export(client)
+    return failed
+
+
+def main() -> None:
+    print("=== Форматы ответа по Accept ===\n")
+    failed = asyncio.run(run())
+    if failed:
+        print(f"\n=== Провалено проверок: {failed} ===")
+        raise SystemExit(1)
+    print("\n=== Все проверки пройдены ===")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Проверка поиска query= в GET /api/clients (src/search.py) без учёта регистра.
+
+1. Короткие запросы (1–2 символа, мимо FTS): «ив», «Ив» и «ИВ» — один и тот же total, больше нуля;
+   то же для одной буквы.
+2. total совпадает с подсчётом в Python (подстрока в name / full_name / inn после lower()) —
+   и для коротких запросов, и для FTS (от трёх символов), в любом регистре.
+3. % и _ в коротком запросе — обычные символы, а не шаблон LIKE.
+4. /parents?query= — начало названия без учёта регистра: «ооо «строй», «ООО «СТРОЙ» и смешанный
+   регистр находят те же головные клиенты, что подсчёт в Python; % и _ — обычные символы.
+
+Сервер не нужен: обработчик вызывается напрямую на временной БД с клиентами из seed.
+Запуск: python scripts/test_search.py
+"""
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+# DATABASE_URL относительный (./app.db) — временный каталог даёт чистую БД
+os.chdir(tempfile.mkdtemp(prefix="search_"))
+
+from src.database import ReadSessionLocal, init_db  # noqa: E402
+from src.models.client_model import ClientModel  # noqa: E402
+from src.routers import clients  # noqa: E402
+from src.schemas.client import ClientListQuery, ClientParentsQuery  # noqa: E402
+from src.seed import seed_db  # noqa: E402
+
+
+def total(query: str) -> int:
+    clients._list_cache.clear()
+    with ReadSessionLocal() as db:
+        return json.loads(clients.list_clients(ClientListQuery(query=query), db).body)["total"]
+
+
+def expected(query: str) -> int:
+    needle = query.lower()
+    with ReadSessionLocal() as db:
+        rows = db.query(ClientModel.name, ClientModel.full_name, ClientModel.inn).all()
+    return sum(any(needle in (value or "").lower() for value in row) for row in rows)
+
+
+def check_short_case() -> int:
+    print("1. Короткие запросы в разном регистре")
+    totals = {query: total(query) for query in ("ив", "Ив", "ИВ", "и", "И")}
+    if totals["ив"] == 0 or not totals["ив"] == totals["Ив"] == totals["ИВ"] or totals["и"] != totals["И"]:
+        print(f"   ОШИБКА: {totals}")
+        return 1
+    print(f"   OK: «ив» / «Ив» / «ИВ» — {totals['ив']}, «и» / «И» — {totals['и']}")
+    return 0
+
+
+def check_against_python() -> int:
+    print("2. total совпадает с подсчётом в Python")
+    queries = ("ив", "ОО", "12", "иванов", "ИВАНОВ", "торг", "(юр")
+    wrong = {query: (total(query), expected(query)) for query in queries if total(query) != expected(query)}
+    if wrong:
+        print(f"   ОШИБКА (API, Python): {wrong}")
+        return 1
+    print(f"   OK: {len(queries)} запросов, короткие и через FTS")
+    return 0
+
+
+def check_wildcards() -> int:
+    print("3. % и _ — обычные символы")
+    totals = {query: total(query) for query in ("%", "_", "%%")}
+    if any(totals.values()):
+        print(f"   ОШИБКА: {totals} — символы сработали как шаблон LIKE")
+        return 1
+    print("   OK: ничего не найдено")
+    return 0
+
+
+def parent_names(query: str) -> list[str]:
+    with ReadSessionLocal() as db:
+        body = json.loads(clients.list_parent_clients(ClientParentsQuery(query=query, compact=True), db=db).body)
+    return [item["name"] for item in body["items"]]
+
+
+def check_parents_prefix() -> int:
+    print("4. /parents: начало названия в любом регистре")
+    with ReadSessionLocal() as db:
+        roots = db.query(ClientModel.name).filter(ClientModel.parent_id.is_(None)).order_by(ClientModel.name).all()
+    sample = roots[0].name[:10]
+    queries = (sample.lower(), sample.upper(), sample.swapcase(), sample[:1].lower(), "%", "_")
+    wrong = {}
+    for query in queries:
+        expected_names = [name for (name,) in roots if name.lower().startswith(query.lower())]
+        got = parent_names(query)
+        if got != expected_names or (query not in ("%", "_") and not got):
+            wrong[query] = (len(got), len(expected_names))
+    if wrong:
+        print(f"   ОШИБКА (API, Python): {wrong}")
+        return 1
+    print(f"   OK: «{sample.lower()}», «{sample.upper()}», «{sample.swapcase()}» — {len(parent_names(sample))} клиентов")
+    return 0
+
+
+def main() -> None:
+    print("=== Поиск без учёта регистра ===\n")
+    init_db()
+    seed_db()
+    failed = check_short_case() + check_against_python() + check_wildcards() + check_parents_prefix()
+    if failed:
+        print(f"\n=== Провалено проверок: {failed} ===")
+        raise SystemExit(1)
+    print("\n=== Все проверки пройдены ===")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Проверка генератора клиентов src/seed.py (python -m src.seed).
+
+1. Детерминизм: один seed при 1 и 3 процессах даёт одинаковые строки (id, имя, ИНН,
+   родитель, регион по названию, даты); другой seed — другие.
+2. Данные: имена и ИНН уникальны (их держат уникальные индексы), parent_id ссылается
+   на существующих клиентов (foreign_key_check), children_count совпадает с GROUP BY,
+   иерархия — деревья заданной глубины и ширины, поиск по FTS-индексу находит клиентов.
+3. Скорость: ROWS строк — время и строк в секунду (цель CLI — 1 млн строк меньше чем за минуту).
+
+Сервер не нужен: каждая генерация — в своей временной БД.
+Запуск: python scripts/test_seed.py
+"""
+import hashlib
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+# DATABASE_URL относительный (./app.db) — временный каталог даёт чистую БД
+os.chdir(tempfile.mkdtemp(prefix="seed_"))
+
+from sqlalchemy import func, select, text  # noqa: E402
+
+from src.database import SessionLocal, engine, init_db  # noqa: E402
+from src.models.client_model import ClientModel  # noqa: E402
+from src.search import search_condition  # noqa: E402
+from src.seed import generate_clients, seed_regions  # noqa: E402
+
+ROWS = 200_000
+DEPTH = 3
+FAN_OUT = 5
+
+_DIGEST_QUERY = text(
+    "SELECT c.client_id, c.name, c.full_name, c.party_type, c.inn, c.parent_id, r.name, c.created_at "
+    "FROM clients AS c LEFT JOIN regions AS r ON r.id = c.region_id ORDER BY c.client_id"
+)
+
+
+def generate(count: int, seed: int, workers: int) -> float:
+    """Пересоздать клиентов в текущей БД; вернуть время генерации в секундах."""
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        generate_clients(conn, count, seed=seed, depth=DEPTH, fan_out=FAN_OUT, workers=workers, reset=True)
+    return time.perf_counter() - started
+
+
+def digest() -> str:
+    """Хеш всех строк clients: регион — по названию, его id случайный в каждой БД."""
+    sha = hashlib.sha256()
+    with engine.connect() as conn:
+        for row in conn.execute(_DIGEST_QUERY):
+            sha.update(repr(tuple(row)).encode())
+    return sha.hexdigest()
+
+
+def check_determinism() -> int:
+    print("1. Детерминизм")
+    generate(25_000, seed=7, workers=1)
+    single = digest()
+    generate(25_000, seed=7, workers=3)
+    pooled = digest()
+    generate(25_000, seed=8, workers=1)
+    other = digest()
+    if single != pooled or single == other:
+        print(f"   ОШИБКА: seed=7 при 1 и 3 процессах {'совпал' if single == pooled else 'РАЗНЫЙ'}, "
+              f"seed=8 {'другой' if single != other else 'ТОТ ЖЕ'}")
+        return 1
+    print("   OK: seed=7 одинаков при 1 и 3 процессах, seed=8 даёт другие данные")
+    return 0
+
+
+def check_data() -> int:
+    print(f"2. Данные {ROWS} строк (глубина {DEPTH}, по {FAN_OUT} детей)")
+    elapsed = generate(ROWS, seed=42, workers=os.cpu_count() or 1)
+    tree_size = sum(FAN_OUT**level for level in range(DEPTH + 1))
+    with engine.connect() as conn:
+        total, names, inns, with_inn, roots = conn.execute(text(
+            "SELECT count(*), count(DISTINCT name), count(DISTINCT inn), count(inn), "
+            "count(*) FILTER (WHERE parent_id IS NULL) FROM clients"
+        )).one()
+        broken_links = conn.execute(text("PRAGMA foreign_key_check(clients)")).all()
+        wrong_counts = conn.execute(text(
+            "SELECT count(*) FROM clients AS c "
+            "WHERE c.children_count != (SELECT count(*) FROM clients AS child WHERE child.parent_id = c.client_id)"
+        )).scalar()
+        max_children = conn.execute(text("SELECT max(children_count) FROM clients")).scalar()
+        found = conn.scalar(select(func.count()).select_from(ClientModel).where(search_condition("иванов")))
+    problems = []
+    if total != ROWS or names != ROWS or inns != with_inn:
+        problems.append(f"строк {total}, имён {names}, ИНН {inns} из {with_inn}")
+    if broken_links or wrong_counts:
+        problems.append(f"битых ссылок {len(broken_links)}, неверных children_count {wrong_counts}")
+    if roots != -(-ROWS // tree_size) or max_children != FAN_OUT:
+        problems.append(f"головных {roots} (ожидалось {-(-ROWS // tree_size)}), максимум детей {max_children}")
+    if not found:
+        problems.append("поиск «иванов» ничего не нашёл")
+    if problems:
+        print("   ОШИБКА:", "; ".join(problems))
+        return 1
+    print(f"   OK: имена и ИНН уникальны, головных {roots}, ссылки и children_count верны, поиск «иванов» — {found}")
+    rate = f"{ROWS / elapsed:,.0f}".replace(",", " ")
+    print(f"3. Скорость: {ROWS} строк за {elapsed:.1f} с, {rate} строк/с")
+    return 0
+
+
+def main() -> None:
+    print("=== Генератор клиентов ===\n")
+    init_db()
+    with SessionLocal() as db:
+        seed_regions(db)
+        db.commit()
+    failed = check_determinism()
+    failed += check_data()
+    if failed:
+        print(f"\n=== Провалено проверок: {failed} ===")
+        raise SystemExit(1)
+    print("\n=== Все проверки пройдены ===")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Проверка замера запросов по фазам (REQUEST_TIMING): заголовок Server-Timing и строка лога.
+
+1. Список клиентов: в Server-Timing фазы db (с числом SQL-запросов), build, encode, app, total;
+   сумма фаз не больше total; строка лога src.timing — JSON с теми же полями и статусом.
+2. Ошибка (404): заголовок и строка лога тоже есть, статус в логе — 404.
+3. Одновременные запросы: каждый считает только свои SQL-запросы (contextvar, а не общий счётчик).
+
+Сервер не нужен: приложение в процессе (httpx.ASGITransport) на временной БД.
+Запуск: python scripts/test_server_timing.py
+Нужен пакет httpx.
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+# DATABASE_URL относительный (./app.db) — временный каталог даёт чистую БД
+os.chdir(tempfile.mkdtemp(prefix="server_timing_"))
+
+import src.config  # noqa: E402
+
+# Флаг читается при импорте database и main
+src.config.REQUEST_TIMING = True
+
+import httpx  # noqa: E402
+
+from src.main import app  # noqa: E402
+
+_ENTRY_RE = re.compile(r'(\w+);dur=([\d.]+)(?:;desc="(\d+) queries")?')
+
+
+class _Captured(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.lines: list[dict] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.lines.append(json.loads(record.getMessage()))
+
+
+def parse(header: str) -> tuple[dict[str, float], int]:
+    """Server-Timing → ({фаза: мс}, число SQL-запросов)."""
+    phases, queries = {}, -1
+    for name, duration, count in _ENTRY_RE.findall(header):
+        phases[name] = float(duration)
+        if count:
+            queries = int(count)
+    return phases, queries
+
+
+async def check_list(client, captured: _Captured) -> int:
+    print("1. Список клиентов")
+    response = await client.get("/api/clients", params={"limit": 50})
+    phases, queries = parse(response.headers.get("server-timing", ""))
+    line = captured.lines[-1] if captured.lines else {}
+    if set(phases) != {"db", "build", "encode", "app", "total"} or queries < 1:
+        print(f"   ОШИБКА: Server-Timing {response.headers.get('server-timing')!r}")
+        return 1
+    parts = phases["db"] + phases["build"] + phases["encode"] + phases["app"]
+    if parts > phases["total"] + 0.05 or phases["encode"] <= 0 or phases["build"] <= 0:
+        print(f"   ОШИБКА: фазы {phases}")
+        return 1
+    if line.get("path") != "/api/clients" or line.get("status") != 200 or line.get("queries") != queries:
+        print(f"   ОШИБКА: строка лога {line}")
+        return 1
+    print(f"   OK: SQL-запросов {queries}, db {phases['db']:.2f} мс, build {phases['build']:.2f} мс, "
+          f"encode {phases['encode']:.2f} мс, total {phases['total']:.2f} мс; строка лога записана")
+    return 0
+
+
+async def check_error(client, captured: _Captured) -> int:
+    print("2. Ошибка 404")
+    response = await client.get("/api/clients/00000000-0000-0000-0000-000000000000")
+    line = captured.lines[-1] if captured.lines else {}
+    if response.status_code != 404 or "server-timing" not in response.headers or line.get("status") != 404:
+        print(f"   ОШИБКА: статус {response.status_code}, заголовки {dict(response.headers)}, лог {line}")
+        return 1
+    print(f"   OK: {response.headers['server-timing']}")
+    return 0
+
+
+async def check_concurrent(client) -> int:
+    print("3. Одновременные запросы")
+    ids = [item["clientId"] for item in (await client.get("/api/clients", params={"limit": 20})).json()["items"]]
+    single = parse((await client.get(f"/api/clients/{ids[0]}")).headers["server-timing"])[1]
+    responses = await asyncio.gather(*(client.get(f"/api/clients/{client_id}") for client_id in ids))
+    counts = {parse(response.headers["server-timing"])[1] for response in responses}
+    if counts != {single}:
+        print(f"   ОШИБКА: SQL-запросов на запрос {sorted(counts)}, ожидалось {single}")
+        return 1
+    print(f"   OK: {len(ids)} одновременных запросов, у каждого {single} SQL-запрос(ов)")
+    return 0
+
+
+async def run() -> int:
+    captured = _Captured()
+    logging.getLogger("src.timing").addHandler(captured)
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            failed = await check_list(client, captured)
+            failed += await check_error(client, captured)
+            failed += await check_concurrent(client)
+    return failed
+
+
+def main() -> None:
+    print("=== Server-Timing и строка лога на запрос ===\n")
+    failed = asyncio.run(run())
+    if failed:
+        print(f"\n=== Провалено проверок: {failed} ===")
+        raise SystemExit(1)
+    print("\n=== Все проверки пройдены ===")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Проверка журнала медленных SQL-запросов (src/slow_queries.py) и GET /debug/slow-queries.
+
+Порог SLOW_QUERY_MS = 0 — в журнал попадает каждый запрос; DEBUG_ENDPOINTS — /debug подключён.
+
+1. Сводка: запрос списка с поиском виден с роутом «GET /api/clients», планом EXPLAIN QUERY PLAN
+   и параметрами без значений (строка поиска заменена типом и длиной).
+2. План снимается один раз на форму: три запроса одной формы — одно EXPLAIN;
+   IN по разному числу id — одна форма.
+3. Строка лога src.slow_queries — JSON с временем, роутом, SQL и параметрами.
+4. Настройки по умолчанию: журнал выключен (SLOW_QUERY_MS = None) — запросы не записываются,
+   /debug не подключён — 404.
+
+Сервер не нужен: приложение в процессе (httpx.ASGITransport) на временной БД.
+Запуск: python scripts/test_slow_queries.py
+Нужен пакет httpx.
+"""
+import asyncio
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+# DATABASE_URL относительный (./app.db) — временный каталог даёт чистую БД
+os.chdir(tempfile.mkdtemp(prefix="slow_queries_"))
+
+import src.config  # noqa: E402
+
+# Порог читается при импорте database и slow_queries, флаг /debug — при импорте src.main
+src.config.SLOW_QUERY_MS = 0
+src.config.DEBUG_ENDPOINTS = True
+
+import httpx  # noqa: E402
+
+from src import slow_queries  # noqa: E402
+from src.main import app  # noqa: E402
+
+SEARCH = "иванов"
+
+
+class _Captured(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.lines: list[dict] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.lines.append(json.loads(record.getMessage()))
+
+
+def find(items: list[dict], route: str, fragment: str) -> dict | None:
+    for item in items:
+        if route in item["routes"] and fragment in item["sql"]:
+            return item
+    return None
+
+
+async def check_summary(client) -> int:
+    print("1. Сводка /debug/slow-queries")
+    await client.get("/api/clients", params={"query": SEARCH, "includeTotal": "false"})
+    response = await client.get("/debug/slow-queries", params={"limit": 200})
+    body = response.json()
+    item = find(body["items"], "GET /api/clients", "clients_fts")
+    if response.status_code != 200 or item is None:
+        print(f"   ОШИБКА: статус {response.status_code}, запроса поиска в сводке нет")
+        return 1
+    if not item["plan"] or SEARCH in response.text or not any(str(p).startswith("<str:") for p in item["lastParams"]):
+        print(f"   ОШИБКА: план {item['plan']}, параметры {item['lastParams']}")
+        return 1
+    print(f"   OK: форм {len(body['items'])}, план поиска: {' / '.join(line.strip() for line in item['plan'])}")
+    return 0
+
+
+async def check_plan_once(client) -> int:
+    print("2. План — один раз на форму")
+    explained = []
+    original = slow_queries._explain
+
+    def counting(conn, statement, parameters):
+        explained.append(slow_queries.shape_of(statement))
+        return original(conn, statement, parameters)
+
+    slow_queries._explain = counting
+    try:
+        # Разный limit — одна форма SQL (LIMIT ?), но разные ответы: кеш списка не отвечает вместо БД
+        for limit in (10, 11, 12):
+            await client.get(
+                "/api/clients", params={"partyType": "legal", "sortBy": "inn", "includeTotal": "false", "limit": limit}
+            )
+    finally:
+        slow_queries._explain = original
+    items = (await client.get("/debug/slow-queries", params={"limit": 200})).json()["items"]
+    item = find(items, "GET /api/clients", "ORDER BY clients.inn")
+    folded = slow_queries.shape_of("SELECT 1 WHERE x IN (?, ?, ?)") == slow_queries.shape_of("SELECT 1 WHERE x IN (?,?)")
+    if item is None or item["count"] < 3 or explained.count(item["sql"]) != 1 or not folded:
+        print(f"   ОШИБКА: выполнений {item and item['count']}, EXPLAIN {explained}, IN свёрнут: {folded}")
+        return 1
+    print(f"   OK: выполнений {item['count']}, EXPLAIN — 1; IN (?, ?, ?) и IN (?, ?) — одна форма")
+    return 0
+
+
+def check_log(captured: _Captured) -> int:
+    print("3. Строка лога")
+    line = next((line for line in captured.lines if line["route"] == "GET /api/clients"), None)
+    if line is None or set(line) != {"durationMs", "route", "sql", "params"}:
+        print(f"   ОШИБКА: {line}")
+        return 1
+    print(f"   OK: {json.dumps(line, ensure_ascii=False)[:120]}…")
+    return 0
+
+
+# Приложение с настройками по умолчанию: код ответа /debug/slow-queries и форм в журнале после запроса
+_DEFAULT_APP = f"""
+import os, sys, tempfile
+sys.path.insert(0, {str(ROOT)!r})
+os.chdir(tempfile.mkdtemp(prefix="slow_queries_default_"))
+from fastapi.testclient import TestClient
+from src import slow_queries
+from src.main import app
+with TestClient(app) as client:
+    client.get("/api/clients")
+    print(client.get("/debug/slow-queries").status_code, len(slow_queries.top(200)))
+"""
+
+
+def check_defaults() -> int:
+    print("4. Настройки по умолчанию")
+    out = subprocess.run([sys.executable, "-c", _DEFAULT_APP], check=True, capture_output=True, text=True)
+    status, shapes = out.stdout.split()
+    if status != "404" or shapes != "0":
+        print(f"   ОШИБКА: /debug/slow-queries — {status}, форм в журнале {shapes}")
+        return 1
+    print("   OK: журнал пуст, /debug — 404")
+    return 0
+
+
+async def run() -> int:
+    captured = _Captured()
+    log = logging.getLogger("src.slow_queries")
+    log.addHandler(captured)
+    log.propagate = False
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            failed = await check_summary(client)
+            failed += await check_plan_once(client)
+    failed += check_log(captured)
+    return failed + check_defaults()
+
+
+def main() -> None:
+    print("=== Журнал медленных SQL-запросов ===\n")
+    failed = asyncio.run(run())
+    if failed:
+        print(f"\n=== Провалено проверок: {failed} ===")
+        raise SystemExit(1)
+    print("\n=== Все проверки пройдены ===")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Проверка уникальности имени и ИНН клиента под конкурентной записью.
+
+1. Гонка по ИНН: два потока одновременно (threading.Barrier) создают клиентов с разными
+   именами и одним ИНН — ровно один создан, второй получает ClientAlreadyExistsByInn.
+2. Гонка по имени: то же с одним именем — второй получает ClientAlreadyExists.
+   Каждая гонка повторяется ROUNDS раз; у каждого потока своя сессия, как у запроса.
+3. Дубликаты в старой БД: init_db не стартует, пока они есть; python -m src.dedupe
+   (dedupe_names / dedupe_inns) их устраняет, после чего init_db создаёт индексы.
+
+Сервер не нужен: обработчик create_client вызывается напрямую на временной БД.
+Запуск: python scripts/test_unique_race.py
+"""
+import os
+import sys
+import tempfile
+import threading
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+# DATABASE_URL относительный (./app.db) — временный каталог даёт чистую БД
+os.chdir(tempfile.mkdtemp(prefix="unique_race_"))
+
+from sqlalchemy import func, insert, select, text  # noqa: E402
+
+from src.database import SessionLocal, engine, init_db  # noqa: E402
+from src.dedupe import dedupe_inns, dedupe_names  # noqa: E402
+from src.exceptions import BusinessError, ClientAlreadyExists, ClientAlreadyExistsByInn  # noqa: E402
+from src.models.client_model import ClientModel  # noqa: E402
+from src.routers import clients  # noqa: E402
+from src.schemas.client import ClientCreate  # noqa: E402
+from src.types.party_type import PartyType  # noqa: E402
+
+ROUNDS = 50
+
+
+def race(bodies: list[ClientCreate]) -> list[object]:
+    """Создать клиентов из bodies одновременно, каждый в своём потоке. Результат — Client или исключение."""
+    barrier = threading.Barrier(len(bodies))
+    results: list[object] = [None] * len(bodies)
+
+    def worker(index: int) -> None:
+        db = SessionLocal()
+        try:
+            barrier.wait()
+            results[index] = clients.create_client(bodies[index], db)
+        except BusinessError as exc:
+            results[index] = exc
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(bodies))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def check_race(title: str, make_bodies, expected_error: type[BusinessError]) -> int:
+    print(title)
+    for round_number in range(ROUNDS):
+        results = race(make_bodies(round_number))
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if len(errors) != 1 or not isinstance(errors[0], expected_error):
+            print(f"   ОШИБКА в раунде {round_number}: ожидался 1 успех и {expected_error.__name__}, получено {results}")
+            return 1
+    print(f"   OK: {ROUNDS} раундов, в каждом создан 1 клиент, второй — {expected_error.__name__}")
+    return 0
+
+
+def check_dedupe() -> int:
+    print("3. Дубликаты в старой БД и python -m src.dedupe")
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ux_clients_name"))
+        conn.execute(text("DROP INDEX ux_clients_inn"))
+        conn.execute(text("DELETE FROM clients"))
+        base = datetime(2024, 1, 1)
+        conn.execute(insert(ClientModel.__table__), [
+            {
+                "client_id": uuid.uuid4(),
+                "name": name,
+                "party_type": PartyType.LEGAL,
+                "inn": inn,
+                "created_at": base + timedelta(seconds=number),
+            }
+            for number, (name, inn) in enumerate([
+                ("Дубль", "990000000001"),
+                ("Дубль", "990000000001"),
+                ("Дубль", None),
+                ("Дубль (2)", "990000000002"),
+            ])
+        ])
+    try:
+        init_db()
+    except RuntimeError:
+        pass
+    else:
+        print("   ОШИБКА: init_db стартовал при дубликатах имён и ИНН")
+        return 1
+    with engine.begin() as conn:
+        renamed = dedupe_names(conn)
+        cleared = dedupe_inns(conn)
+    init_db()
+    with engine.connect() as conn:
+        names = conn.scalars(select(ClientModel.name).order_by(ClientModel.created_at)).all()
+        inns = conn.scalar(select(func.count()).where(ClientModel.inn == "990000000001"))
+    if renamed != 2 or len(cleared) != 1 or names != ["Дубль", "Дубль (3)", "Дубль (4)", "Дубль (2)"] or inns != 1:
+        print(f"   ОШИБКА: переименовано {renamed}, очищено ИНН {len(cleared)}, имена {names}")
+        return 1
+    print(f"   OK: init_db остановлен, переименовано {renamed}, очищено ИНН {len(cleared)}, индексы созданы")
+    return 0
+
+
+def main() -> None:
+    print("=== Уникальность имени и ИНН при одновременной записи ===\n")
+    init_db()
+    failed = 0
+    failed += check_race(
+        "1. Два запроса с одним ИНН",
+        lambda n: [
+            ClientCreate(name=f"ИНН {n} A", party_type=PartyType.LEGAL, inn=f"77{n:010d}"),
+            ClientCreate(name=f"ИНН {n} B", party_type=PartyType.INDIVIDUAL, inn=f"77{n:010d}"),
+        ],
+        ClientAlreadyExistsByInn,
+    )
+    failed += check_race(
+        "2. Два запроса с одним именем",
+        lambda n: [
+            ClientCreate(name=f"Имя {n}", party_type=PartyType.LEGAL),
+            ClientCreate(name=f"Имя {n}", party_type=PartyType.INDIVIDUAL),
+        ],
+        ClientAlreadyExists,
+    )
+    failed += check_dedupe()
+    if failed:
+        print(f"\n=== Провалено проверок: {failed} ===")
+        raise SystemExit(1)
+    print("\n=== Все проверки пройдены ===")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,11 @@
 """
 Тесты валидации и бизнес-ошибок API клиентов.
 - Валидация: ИНН не более 12 символов (422, errorName=VALIDATION_ERROR).
-- Бизнес: дубликат имени/ИНН, клиент не найден, родитель не найден (409/404, errorName).
+- Бизнес: дубликат имени/ИНН, клиент не найден, родитель/регион не найден (409/404, errorName).
+- Пакетное создание: ошибки по элементам в том же формате (errorName), валидные элементы создаются.
+- Массовые операции: пустой filter (и filter из одного пустого query) — 422, одно имя нескольким клиентам — 409.
+- Иерархия: родителем нельзя назначить потомка клиента — 409 PARENT_CLIENT_CYCLE.
+- PATCH с name или partyType = null — 422 VALIDATION_ERROR (а не 409 о дубликате или 500).
 
 Ответы API в camelCase: errorName, clientId, errors[].field, message.
 Запуск: python scripts/test_validation_errors.py
@@ -300,6 +304,127 @@ def main() -> None:
         else:
             print("   OK: 404, PARENT_CLIENT_NOT_FOUND при PATCH")
 
+    # --- Бизнес-ошибки: регион не найден ---
+    print("9. Бизнес: регион не найден при создании (RegionNotFound)")
+    status, data = request(
+        "POST",
+        "/api/clients",
+        {
+            "name": f"Без региона {uuid.uuid4().hex[:6]}",
+            "full_name": "ООО Тест",
+            "party_type": "legal",
+            "inn": "77" + str(uuid.uuid4().int % 10**8).zfill(8),
+            "region_id": str(uuid.uuid4()),
+        },
+    )
+    if status != 404:
+        print("   ОШИБКА: ожидался 404, получен", status, data)
+        failed += 1
+    elif not data or data.get("errorName") != "REGION_NOT_FOUND":
+        print("   ОШИБКА: ожидался errorName=REGION_NOT_FOUND, получено", data)
+        failed += 1
+    else:
+        print("   OK: 404, REGION_NOT_FOUND")
+
+    # --- Пакетное создание: отчёт по элементам ---
+    print("10. Пакетное создание: дубликат внутри пакета и неизвестный родитель")
+    batch_name = f"Пакет {uuid.uuid4().hex[:6]}"
+    status, data = request(
+        "POST",
+        "/api/clients/batch",
+        {
+            "items": [
+                {"name": batch_name, "party_type": "legal", "region_id": region_id},
+                {"name": batch_name, "party_type": "legal"},
+                {"name": batch_name + " 2", "party_type": "legal", "parent_id": str(uuid.uuid4())},
+            ],
+        },
+    )
+    expected = [None, "CLIENT_ALREADY_EXISTS", "PARENT_CLIENT_NOT_FOUND"]
+    got = [(item.get("error") or {}).get("errorName") for item in (data or {}).get("items", [])]
+    if status != 200 or got != expected or data.get("created") != 1:
+        print("   ОШИБКА: ожидалось 200, created=1, ошибки", expected, "получено", status, data)
+        failed += 1
+    else:
+        print("   OK: 200, создан 1, ошибки по элементам:", expected[1:])
+        request("DELETE", f"/api/clients/{data['items'][0]['client']['clientId']}")
+
+    # --- Массовые операции ---
+    print("11. Массовое удаление с пустым filter (VALIDATION_ERROR)")
+    status, data = request("POST", "/api/clients/bulk-delete", {"filter": {}})
+    if status != 422 or not data or data.get("errorName") != "VALIDATION_ERROR":
+        print("   ОШИБКА: ожидался 422 VALIDATION_ERROR, получено", status, data)
+        failed += 1
+    else:
+        print("   OK: 422, VALIDATION_ERROR")
+
+    print("12. Массовые операции с filter из пустого query (VALIDATION_ERROR)")
+    status, data = request("GET", "/api/clients?limit=1")
+    total_before = (data or {}).get("total")
+    blank_failed = []
+    for query in ("", "   "):
+        for path, body in (
+            ("/api/clients/bulk-delete", {"filter": {"query": query}}),
+            ("/api/clients/bulk-update", {"filter": {"query": query}, "changes": {"full_name": "Все строки"}}),
+        ):
+            status, data = request("POST", path, body)
+            if status != 422 or not data or data.get("errorName") != "VALIDATION_ERROR":
+                blank_failed.append((path, repr(query), status, data))
+    status, data = request("GET", "/api/clients?limit=1")
+    if blank_failed or (data or {}).get("total") != total_before:
+        print("   ОШИБКА: ожидался 422 VALIDATION_ERROR без изменений, получено", blank_failed, (data or {}).get("total"))
+        failed += 1
+    else:
+        print("   OK: 422 для query \"\" и \"   \", клиентов столько же:", total_before)
+
+    print("13. Массовое обновление: одно имя нескольким клиентам (ClientAlreadyExists)")
+    status, data = request("GET", "/api/clients?limit=2")
+    client_ids = [item["clientId"] for item in (data or {}).get("items", [])]
+    status, data = request(
+        "POST",
+        "/api/clients/bulk-update",
+        {"client_ids": client_ids, "changes": {"name": f"Общее {uuid.uuid4().hex[:6]}"}},
+    )
+    if status != 409 or not data or data.get("errorName") != "CLIENT_ALREADY_EXISTS":
+        print("   ОШИБКА: ожидался 409 CLIENT_ALREADY_EXISTS, получено", status, data)
+        failed += 1
+    else:
+        print("   OK: 409, CLIENT_ALREADY_EXISTS")
+
+    print("14. Родителем назначен потомок клиента (ParentClientCycle)")
+    suffix = uuid.uuid4().hex[:6]
+    _, root = request("POST", "/api/clients", {"name": f"Группа {suffix}", "party_type": "legal"})
+    _, child = request(
+        "POST",
+        "/api/clients",
+        {"name": f"Дочерний {suffix}", "party_type": "legal", "parent_id": (root or {}).get("clientId")},
+    )
+    status, data = request(
+        "PATCH",
+        f"/api/clients/{(root or {}).get('clientId')}",
+        {"parent_id": (child or {}).get("clientId")},
+    )
+    if status != 409 or not data or data.get("errorName") != "PARENT_CLIENT_CYCLE":
+        print("   ОШИБКА: ожидался 409 PARENT_CLIENT_CYCLE, получено", status, data)
+        failed += 1
+    else:
+        print("   OK: 409, PARENT_CLIENT_CYCLE")
+
+    print("15. PATCH с name / partyType = null (VALIDATION_ERROR)")
+    _, created = request("POST", "/api/clients", {"name": f"Без null {uuid.uuid4().hex[:6]}", "party_type": "legal"})
+    null_failed = []
+    for field in ("name", "party_type"):
+        status, data = request("PATCH", f"/api/clients/{(created or {}).get('clientId')}", {field: None})
+        fields = [e.get("field", "") for e in (data or {}).get("errors") or []]
+        if status != 422 or not data or data.get("errorName") != "VALIDATION_ERROR" or not any(field in f for f in fields):
+            null_failed.append((field, status, data))
+    request("DELETE", f"/api/clients/{(created or {}).get('clientId')}")
+    if null_failed:
+        print("   ОШИБКА: ожидался 422 VALIDATION_ERROR по полю, получено", null_failed)
+        failed += 1
+    else:
+        print("   OK: 422, VALIDATION_ERROR по name и partyType")
+
     if failed:
         print(f"\n=== Провалено проверок: {failed} ===")
         raise SystemExit(1)
@@ -1,3 +1,98 @@
 """Константы в коде (без .env, без pydantic-settings)."""
 
 DATABASE_URL = "sqlite:///./app.db"
+
+# Профиль SQLite: PRAGMA на каждое новое соединение (и пишущего, и читающего движка).
+# WAL — читатели не ждут писателя; NORMAL в WAL безопасен при падении процесса;
+# cache_size < 0 — в КиБ на соединение; busy_timeout — ждать блокировку вместо «database is locked».
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -16000,
+    "mmap_size": 256 * 1024 * 1024,
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,
+    "foreign_keys": "ON",
+}
+
+# Кеш total списка клиентов: сколько разных наборов фильтров держать и срок жизни записи (с).
+# Запись через API этого процесса меняет версию данных в ключе; срок жизни — для записей
+# другого воркера uvicorn и мимо API (seed, ручной SQL)
+CLIENT_COUNT_CACHE_SIZE = 256
+CLIENT_COUNT_CACHE_TTL = 5.0
+
+# Кеш готовых ответов GET /api/clients (тела JSON) по нормализованным параметрам запроса.
+# Сбрасывается любой записью клиентов через API этого процесса; срок жизни записи — страховка
+# для записей другого воркера uvicorn и мимо API (seed, ручной SQL)
+CLIENT_LIST_CACHE_SIZE = 512
+CLIENT_LIST_CACHE_MAX_BYTES = 32 * 1024 * 1024
+CLIENT_LIST_CACHE_TTL = 5.0
+
+# Максимум клиентов в одном POST /api/clients/batch
+CLIENT_BATCH_MAX_SIZE = 500
+
+# Максимум clientIds в одной массовой операции (bulk-update / bulk-delete)
+CLIENT_BULK_MAX_IDS = 10000
+
+# Строк в одной пачке потоковой выгрузки GET /api/clients/export
+CLIENT_EXPORT_CHUNK_SIZE = 1000
+
+# Загрузка POST /api/clients/import: записей в одной транзакции и сколько ошибок
+# по строкам вернуть в отчёте (остальные только считаются)
+CLIENT_IMPORT_CHUNK_SIZE = 1000
+CLIENT_IMPORT_MAX_ERRORS = 1000
+
+# Предел глубины обхода иерархии клиентов (потомки / предки, фильтр ancestorId).
+# При целых данных не достигается; защищает от циклов parent_id, оставшихся в старых БД
+CLIENT_HIERARCHY_MAX_DEPTH = 1000
+
+# Справочник регионов на время работы не меняется — браузер может держать его час
+REGIONS_CACHE_CONTROL = "public, max-age=3600"
+
+# Список для селекта «Родительский клиент» перезапрашивается при каждом открытии —
+# браузер обязан перепроверять его по ETag (дёшево: 304 после чтения одной строки версии данных)
+PARENTS_CACHE_CONTROL = "no-cache"
+
+# Карточка клиента перепроверяется по ETag при каждом открытии (304 — без тела и сериализации)
+CLIENT_CACHE_CONTROL = "no-cache"
+
+# Замер времени запросов по фазам (SQL, сборка схем, JSON): заголовок Server-Timing и строка
+# лога src.timing на каждый запрос. Включать для разбора медленных запросов
+REQUEST_TIMING = False
+
+# Метрики GET /metrics (формат Prometheus). Эндпоинт подключается только при METRICS_ENDPOINT:
+# CORS открыт любым источникам (allow_origins=["*"]), а метрики раскрывают роуты, ошибки и нагрузку —
+# включать, когда порт закрыт от браузеров (внутренняя сеть, прокси с авторизацией).
+# Корзины гистограмм времени — в секундах.
+# METRICS_DIR — общий каталог для сложения метрик воркеров uvicorn (--workers); None — только
+# этот процесс. Снимок процесса пишется туда не чаще раза в METRICS_FLUSH_INTERVAL секунд
+METRICS_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRICS_ENDPOINT = False
+METRICS_DIR = None
+METRICS_FLUSH_INTERVAL = 1.0
+
+# Журнал медленных SQL-запросов: дольше SLOW_QUERY_MS — строка WARNING в лог src.slow_queries и план
+# EXPLAIN QUERY PLAN (лишний запрос, один раз на форму), сводка — GET /debug/slow-queries.
+# None — выключено (по умолчанию); для разбора задать порог, например 100. Форм запросов
+# в сводке не больше SLOW_QUERY_MAX_SHAPES
+SLOW_QUERY_MS = None
+SLOW_QUERY_MAX_SHAPES = 200
+
+# Отладочные эндпоинты /debug/* (сводка медленных SQL с текстом запросов и планами, кеш списка).
+# Как и /metrics, подключаются только по флагу: CORS открыт любым источникам
+DEBUG_ENDPOINTS = False
+
+# Асинхронный доступ к БД (AsyncSession поверх aiosqlite) вместо синхронных роутов в пуле потоков.
+# Список и клиент по id — собственные async-обработчики (AsyncConnection), остальное — через
+# AsyncSession.run_sync. В замере scripts/bench_async_db.py — 1.01–1.07x синхронного при 50–500 запросах.
+# Нужны пакеты aiosqlite и greenlet: pip install aiosqlite "sqlalchemy[asyncio]"
+DB_ASYNC = False
+ASYNC_DATABASE_URL = "sqlite+aiosqlite:///./app.db"
+
+# Пул соединений каждого движка: постоянных и сверх них — в сумме по размеру пула потоков Starlette (40),
+# больше одновременно работающих синхронных эндпоинтов не бывает. Сессия возвращает соединение
+# в пул сразу после эндпоинта (SessionRoute), до валидации ответа, поэтому потоки не ждут соединений,
+# занятых запросами без потока. Предел держит и память: у каждого соединения свой кеш страниц
+# (cache_size), до 40 × 16 МБ на движок.
+DB_POOL_SIZE = 10
+DB_MAX_OVERFLOW = 30
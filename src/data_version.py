@@ -0,0 +1,53 @@
+"""Версия данных clients в самой БД — ETag, общий для всех процессов.
+
+Таблица clients_version из одной строки: token и version. Триггеры на вставку, изменение
+и удаление в clients увеличивают version в той же транзакции, что и запись, поэтому новую
+версию сразу видят все воркеры uvicorn, командная строка (seed, dedupe) и ручной SQL.
+token — случайный на файл БД: новая app.db начинает счёт заново, и без него её версии
+совпали бы с ETag, закешированными браузером для прежней. Чтение версии — одна строка
+по первичному ключу, без прохода по clients.
+
+Массовая загрузка со снятыми триггерами (src/seed.py) поднимает версию сама — bump_data_version.
+"""
+
+from sqlalchemy import Connection, text
+from sqlalchemy.orm import Session
+
+from src.http_cache import version_etag
+
+VERSION_TABLE = "clients_version"
+
+_TABLE_DDL = (
+    f"CREATE TABLE IF NOT EXISTS {VERSION_TABLE} ("
+    "id INTEGER PRIMARY KEY CHECK (id = 1), token TEXT NOT NULL, version INTEGER NOT NULL)"
+)
+
+_TRIGGERS_DDL = tuple(
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {VERSION_TABLE}_{suffix} AFTER {operation} ON clients BEGIN
+        UPDATE {VERSION_TABLE} SET version = version + 1 WHERE id = 1;
+    END
+    """
+    for suffix, operation in (("ai", "INSERT"), ("au", "UPDATE"), ("ad", "DELETE"))
+)
+
+
+def ensure_data_version(conn: Connection) -> None:
+    """Таблица версии со строкой (случайный token, version 0) и триггеры, если их нет."""
+    conn.execute(text(_TABLE_DDL))
+    conn.execute(text(
+        f"INSERT OR IGNORE INTO {VERSION_TABLE} (id, token, version) VALUES (1, lower(hex(randomblob(4))), 0)"
+    ))
+    for ddl in _TRIGGERS_DDL:
+        conn.execute(text(ddl))
+
+
+def bump_data_version(conn: Connection) -> None:
+    """Поднять версию вручную — после записи в clients при снятых триггерах."""
+    conn.execute(text(f"UPDATE {VERSION_TABLE} SET version = version + 1 WHERE id = 1"))
+
+
+def data_version_etag(db: Session, *parts: object) -> str:
+    """ETag текущей версии clients; parts — параметры ответа (фильтры, формат)."""
+    token, version = db.execute(text(f"SELECT token, version FROM {VERSION_TABLE} WHERE id = 1")).one()
+    return version_etag(token, version, *parts)
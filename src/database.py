@@ -1,26 +1,82 @@
-from collections.abc import Generator
+import functools
+import inspect
+from collections.abc import Callable, Generator
+from typing import Any
 
-from sqlalchemy import create_engine
+from fastapi.routing import APIRoute
+from sqlalchemy import Engine, create_engine, event, text
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, sessionmaker
 
-from src.config import DATABASE_URL
+from src import slow_queries
+from src.config import DATABASE_URL, DB_MAX_OVERFLOW, DB_POOL_SIZE, REQUEST_TIMING, SLOW_QUERY_MS, SQLITE_PRAGMAS
+from src.data_version import ensure_data_version
+from src.hierarchy import ensure_children_count
+from src.metrics import instrument_pool
 from src.models.base import Base
 
 # Импорт моделей, чтобы они зарегистрированы в Base.metadata перед create_all
 from src.models.client_model import ClientModel  # noqa: F401
 from src.models.region_model import RegionModel  # noqa: F401
+from src.search import ensure_search_index, register_functions
+from src.timing import instrument_engine
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    echo=False,
-)
+
+def apply_sqlite_profile(target: Engine, *, read_only: bool = False) -> None:
+    """
+    PRAGMA из SQLITE_PRAGMAS на каждое новое соединение движка; read_only — ещё и query_only.
+    Там же регистрируются SQL-функции поиска (src/search.py).
+    """
+    pragmas = {**SQLITE_PRAGMAS, "query_only": "ON"} if read_only else SQLITE_PRAGMAS
+
+    @event.listens_for(target, "connect")
+    def _set_pragmas(dbapi_connection, _connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
+        register_functions(dbapi_connection)
+
+
+def _create_engine() -> Engine:
+    return create_engine(
+        DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        echo=False,
+    )
+
+
+engine = _create_engine()
+apply_sqlite_profile(engine)
+
+# Отдельный движок для чтения (GET-роуты): в WAL читатели не блокируются писателем,
+# а query_only не даёт случайно записать через читающую сессию
+read_engine = _create_engine()
+apply_sqlite_profile(read_engine, read_only=True)
+
+instrument_pool(engine, "write")
+instrument_pool(read_engine, "read")
+if REQUEST_TIMING:
+    instrument_engine(engine)
+    instrument_engine(read_engine)
+if SLOW_QUERY_MS is not None:
+    slow_queries.instrument_engine(engine)
+    slow_queries.instrument_engine(read_engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 
 def get_db() -> Generator[Session, None, None]:
-    """Зависимость для роутеров: сессия БД на запрос, закрывается после ответа."""
+    """
+    Зависимость для роутеров: сессия БД на запрос.
+
+    В роутах SessionRoute сессия закрывается сразу после эндпоинта, в его же потоке;
+    здесь — страховка для остальных. FastAPI выполняет выход из синхронной зависимости
+    в отдельном потоке, не дожидаясь свободного места в пуле Starlette.
+    """
     db = SessionLocal()
     try:
         yield db
@@ -28,6 +84,73 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def get_read_db() -> Generator[Session, None, None]:
+    """Зависимость для GET-роутов: сессия только на чтение (read_engine)."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _closing_sessions(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """Эндпоинт, который закрывает полученные сессии БД, как только вернёт результат."""
+
+    @functools.wraps(endpoint)
+    def wrapper(**kwargs: Any) -> Any:
+        try:
+            return endpoint(**kwargs)
+        finally:
+            for value in kwargs.values():
+                if isinstance(value, Session):
+                    value.close()
+
+    return wrapper
+
+
+class SessionRoute(APIRoute):
+    """
+    Роут, чей синхронный эндпоинт возвращает соединение в пул до валидации ответа.
+
+    Валидация по response_model у синхронного эндпоинта — снова задача в пуле потоков Starlette.
+    Если бы сессия жила до выхода из зависимости, запрос ждал бы поток, держа соединение,
+    а потоки — соединения (пул ограничен DB_POOL_SIZE + DB_MAX_OVERFLOW).
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        if not inspect.iscoroutinefunction(endpoint):
+            endpoint = _closing_sessions(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+# Индексы прежних версий, заменённые другими (ix_clients_name → уникальный ux_clients_name)
+_OBSOLETE_INDEXES = ("ix_clients_name",)
+
+
 def init_db() -> None:
-    """Создание всех таблиц в SQLite по моделям. Вызывать при старте приложения."""
+    """
+    Создание всех таблиц в SQLite по моделям. Вызывать при старте приложения.
+
+    create_all не трогает уже существующие таблицы вместе с их индексами,
+    поэтому индексы досоздаются отдельно (checkfirst) — для старых app.db,
+    а заменённые удаляются. Если уникальный индекс не создаётся из-за дубликатов
+    в старых данных, старт прерывается с подсказкой про python -m src.dedupe.
+    Колонка children_count и её триггеры (src/hierarchy.py) досоздаются до индексов,
+    FTS-индекс поиска (src/search.py) и версия данных clients (src/data_version.py) — там же.
+    """
     Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        ensure_children_count(conn)
+        for name in _OBSOLETE_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                try:
+                    index.create(bind=conn, checkfirst=True)
+                except IntegrityError as exc:
+                    raise RuntimeError(
+                        f"Не удалось создать уникальный индекс {index.name}: в таблице {table.name} есть дубликаты. "
+                        "Исправьте данные командой: python -m src.dedupe"
+                    ) from exc
+        ensure_search_index(conn)
+        ensure_data_version(conn)
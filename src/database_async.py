@@ -0,0 +1,55 @@
+"""Асинхронный доступ к БД (DB_ASYNC): AsyncSession поверх aiosqlite.
+
+Импортируется только при DB_ASYNC = True — aiosqlite и greenlet нужны лишь в этом режиме.
+Таблицы, индексы и наполнение по-прежнему делает синхронный init_db() при старте.
+"""
+
+from collections.abc import AsyncGenerator
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from src import slow_queries
+from src.config import ASYNC_DATABASE_URL, DB_MAX_OVERFLOW, DB_POOL_SIZE, REQUEST_TIMING, SLOW_QUERY_MS
+from src.database import apply_sqlite_profile
+from src.metrics import instrument_pool
+from src.timing import instrument_engine
+
+
+def _create_async_engine() -> AsyncEngine:
+    return create_async_engine(
+        ASYNC_DATABASE_URL,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        echo=False,
+    )
+
+
+async_engine = _create_async_engine()
+apply_sqlite_profile(async_engine.sync_engine)
+
+async_read_engine = _create_async_engine()
+apply_sqlite_profile(async_read_engine.sync_engine, read_only=True)
+
+instrument_pool(async_engine.sync_engine, "async_write")
+instrument_pool(async_read_engine.sync_engine, "async_read")
+if REQUEST_TIMING:
+    instrument_engine(async_engine.sync_engine)
+    instrument_engine(async_read_engine.sync_engine)
+if SLOW_QUERY_MS is not None:
+    slow_queries.instrument_engine(async_engine.sync_engine)
+    slow_queries.instrument_engine(async_read_engine.sync_engine)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False)
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False)
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Зависимость для асинхронных роутов: AsyncSession на запрос, закрывается после ответа."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Зависимость для асинхронных GET-роутов: AsyncSession только на чтение."""
+    async with AsyncReadSessionLocal() as db:
+        yield db
@@ -0,0 +1,69 @@
+"""Устранение дубликатов имён и ИНН клиентов — для app.db, созданных до уникальных индексов.
+
+init_db не стартует, пока в clients есть повторы name или ИНН (ux_clients_name,
+ux_clients_inn). Команда оставляет значение самому раннему клиенту (created_at, client_id):
+- имя: остальным к имени добавляется номер — «Иванов А. (2)», «Иванов А. (3)»;
+- ИНН: у остальных ИНН очищается (null), их client_id печатаются для ручной сверки.
+
+Запуск (из корня проекта): python -m src.dedupe
+"""
+
+from sqlalchemy import Connection, func, select, update
+
+from src.models.client_model import ClientModel
+
+_clients = ClientModel.__table__
+
+
+def _duplicates(conn: Connection, column) -> list[tuple]:
+    """(client_id, значение) клиентов с повторяющимся значением колонки, первые — самые ранние."""
+    repeated = select(column).where(column.is_not(None), column != "").group_by(column).having(func.count() > 1)
+    return conn.execute(
+        select(_clients.c.client_id, column)
+        .where(column.in_(repeated))
+        .order_by(column, _clients.c.created_at, _clients.c.client_id)
+    ).all()
+
+
+def dedupe_names(conn: Connection) -> int:
+    """Переименовать повторы имён. Возвращает число переименованных клиентов."""
+    taken = set(conn.scalars(select(_clients.c.name)))
+    kept: set[str] = set()
+    renamed = 0
+    for client_id, name in _duplicates(conn, _clients.c.name):
+        if name not in kept:
+            kept.add(name)
+            continue
+        number = 2
+        while f"{name} ({number})" in taken:
+            number += 1
+        new_name = f"{name} ({number})"
+        taken.add(new_name)
+        conn.execute(update(_clients).where(_clients.c.client_id == client_id).values(name=new_name))
+        renamed += 1
+    return renamed
+
+
+def dedupe_inns(conn: Connection) -> list:
+    """Очистить повторы ИНН. Возвращает client_id клиентов, у которых ИНН очищен."""
+    kept: set[str] = set()
+    cleared = []
+    for client_id, inn in _duplicates(conn, _clients.c.inn):
+        if inn not in kept:
+            kept.add(inn)
+            continue
+        conn.execute(update(_clients).where(_clients.c.client_id == client_id).values(inn=None))
+        cleared.append(client_id)
+    return cleared
+
+
+if __name__ == "__main__":
+    from src.database import engine
+
+    with engine.begin() as connection:
+        renamed = dedupe_names(connection)
+        cleared = dedupe_inns(connection)
+    print(f"Переименовано клиентов с повторяющимся именем: {renamed}")
+    print(f"Очищен повторяющийся ИНН у клиентов: {len(cleared)}")
+    for client_id in cleared:
+        print(f"  {client_id}")
@@ -4,6 +4,8 @@
 Обработчики в main.py преобразуют их в единый формат ответа (error_name, message, details).
 """
 
+import re
+
 
 class BusinessError(Exception):
     """Базовый класс бизнес-исключений API. Подкласс обязан задать DEFAULT_MESSAGE."""
@@ -28,6 +30,11 @@ class BusinessError(Exception):
         self.status_code = status_code if status_code is not None else self.STATUS_CODE
         super().__init__(self.message)
 
+    @property
+    def error_name(self) -> str:
+        """PascalCase → UPPER_SNAKE_CASE, например ClientAlreadyExists → CLIENT_ALREADY_EXISTS."""
+        return re.sub(r"(?<!^)(?=[A-Z])", "_", self.__class__.__name__).upper()
+
 
 class ClientAlreadyExists(BusinessError):
     """Клиент уже существует в базе."""
@@ -45,7 +52,36 @@ class ClientNotFound(BusinessError):
     STATUS_CODE = 404
 
 
+class ClientPreconditionFailed(BusinessError):
+    """If-Match не совпал: клиент изменён после получения ETag."""
+    MESSAGE = "Клиент изменён после получения ETag — перечитайте его и повторите запрос"
+    STATUS_CODE = 412
+
+
 class ParentClientNotFound(BusinessError):
     """Родительский клиент не найден."""
     MESSAGE = "Родительский клиент не найден"
     STATUS_CODE = 404
+
+
+class ParentClientCycle(BusinessError):
+    """Родителем назначен сам клиент или его потомок — иерархия замкнулась бы в цикл."""
+    MESSAGE = "Родительский клиент не может быть самим клиентом или его потомком"
+
+
+class EmptyClientFilter(BusinessError):
+    """Фильтр массовой операции не дал ни одного условия — запись затронула бы всех клиентов."""
+    MESSAGE = "Пустой filter затронул бы всех клиентов — укажите хотя бы одно условие"
+    STATUS_CODE = 422
+
+
+class InvalidCursor(BusinessError):
+    """Курсор пагинации повреждён или выдан для другой сортировки."""
+    MESSAGE = "Некорректный курсор пагинации"
+    STATUS_CODE = 400
+
+
+class RegionNotFound(BusinessError):
+    """Регион не найден."""
+    MESSAGE = "Регион не найден"
+    STATUS_CODE = 404
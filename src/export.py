@@ -0,0 +1,87 @@
+"""Потоковая выгрузка клиентов (NDJSON / CSV, колоночный JSON / MessagePack) для GET /api/clients/export.
+
+Строки читаются пачками (yield_per) и сразу превращаются в байты ответа, поэтому
+в памяти одновременно одна пачка — объём выгрузки на память не влияет. Поля и их
+имена — как в ответах API (схема Client, camelCase).
+
+Выгрузка идёт своей сессией: ответ отдаётся уже после выхода из эндпоинта, когда
+сессия из зависимости может быть закрыта.
+
+Колоночные форматы (src/formats.py) пишут имена колонок один раз и строки массивами:
+JSON — один документ {"columns": [...], "rows": [[...], ...]}; MessagePack — поток значений:
+массив имён колонок, затем массив на строку (читается потоковым Unpacker).
+"""
+
+import csv
+import io
+import json
+from collections.abc import Iterator, Sequence
+
+from pydantic import TypeAdapter
+from sqlalchemy import Row, Select
+
+from src.config import CLIENT_EXPORT_CHUNK_SIZE
+from src.database import ReadSessionLocal
+from src.formats import COLUMNS_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, pack
+from src.schemas.client import CLIENT_FIELDS, Client, client_field_aliases, client_row_type
+from src.types.export_format import ExportFormat
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+ROW_EXTENSIONS = {
+    COLUMNS_MEDIA_TYPE: "json",
+    MSGPACK_MEDIA_TYPE: "msgpack",
+}
+
+_COLUMNS = list(client_field_aliases(CLIENT_FIELDS))
+# Пачка строк (кортежи колонок в порядке CLIENT_FIELDS) — значения как в ответах API
+_ROWS = TypeAdapter(list[client_row_type(CLIENT_FIELDS)])
+
+
+def _ndjson_chunk(rows: Sequence[Row]) -> bytes:
+    return b"".join(Client.model_validate(row).model_dump_json(by_alias=True).encode() + b"\n" for row in rows)
+
+
+def _csv_chunk(rows: Sequence[Row], header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(_COLUMNS)
+    for row in rows:
+        writer.writerow(Client.model_validate(row).model_dump(mode="json", by_alias=True).values())
+    return buffer.getvalue().encode("utf-8")
+
+
+def _partitions(statement: Select) -> Iterator[Sequence[Row]]:
+    """Строки statement пачками по CLIENT_EXPORT_CHUNK_SIZE — своей сессией чтения."""
+    with ReadSessionLocal() as db:
+        result = db.execute(statement.execution_options(yield_per=CLIENT_EXPORT_CHUNK_SIZE))
+        yield from result.partitions()
+
+
+def export_chunks(statement: Select, export_format: ExportFormat) -> Iterator[bytes]:
+    """Тело ответа по частям: одна часть — одна пачка из CLIENT_EXPORT_CHUNK_SIZE строк."""
+    if export_format == ExportFormat.CSV:
+        yield _csv_chunk((), header=True)
+    encode = _csv_chunk if export_format == ExportFormat.CSV else _ndjson_chunk
+    for rows in _partitions(statement):
+        yield encode(rows)
+
+
+def export_row_chunks(statement: Select, media_type: str) -> Iterator[bytes]:
+    """Колоночная выгрузка по частям; statement выбирает колонки CLIENT_FIELDS в их порядке."""
+    if media_type == MSGPACK_MEDIA_TYPE:
+        yield pack(_COLUMNS)
+        for rows in _partitions(statement):
+            yield b"".join(pack(row) for row in _ROWS.dump_python([tuple(row) for row in rows], mode="json"))
+        return
+    yield b'{"columns":' + json.dumps(_COLUMNS, separators=(",", ":")).encode() + b',"rows":['
+    separator = b""
+    for rows in _partitions(statement):
+        # [1:-1] — строки пачки без скобок массива: пачки склеиваются в один массив rows
+        yield separator + _ROWS.dump_json([tuple(row) for row in rows])[1:-1]
+        separator = b","
+    yield b"]}"
@@ -0,0 +1,112 @@
+"""Иерархия клиентов (parent_id): потомки и предки одним рекурсивным запросом (WITH RECURSIVE).
+
+Спуск к потомкам идёт по индексу ix_clients_parent_id_name (parent_id = ?), подъём к предкам —
+по первичному ключу. Стоимость — число найденных клиентов (для предков — глубина), а не размер
+таблицы. Обход ограничен CLIENT_HIERARCHY_MAX_DEPTH уровнями: так запрос конечен и на циклах
+parent_id, которые могли остаться в старых БД до проверки ParentClientCycle.
+
+CTE вложены в подзапрос, где используются (nesting): UPDATE / DELETE массовых операций
+с фильтром ancestorId начинаются с UPDATE / DELETE, а не с WITH, — иначе sqlite3 не отдаёт
+число затронутых строк (rowcount = -1).
+
+Число прямых детей — колонка clients.children_count. Её ведут триггеры SQLite на вставку,
+удаление и смену parent_id, поэтому счётчик верен при любой записи (роуты, импорт, seed,
+ручной SQL), а список клиентов читает его без GROUP BY и сортирует по индексу.
+Пересчёт счётчика по всей таблице: python -m src.hierarchy
+"""
+
+import uuid
+
+from sqlalchemy import CTE, Connection, literal, select, text
+from sqlalchemy.orm import aliased
+
+from src.config import CLIENT_HIERARCHY_MAX_DEPTH
+from src.models.client_model import ClientModel
+
+
+_CHILDREN_COUNT_TRIGGERS_DDL = (
+    """
+    CREATE TRIGGER IF NOT EXISTS clients_children_count_ai AFTER INSERT ON clients
+    WHEN new.parent_id IS NOT NULL BEGIN
+        UPDATE clients SET children_count = children_count + 1 WHERE client_id = new.parent_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS clients_children_count_ad AFTER DELETE ON clients
+    WHEN old.parent_id IS NOT NULL BEGIN
+        UPDATE clients SET children_count = children_count - 1 WHERE client_id = old.parent_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS clients_children_count_au AFTER UPDATE OF parent_id ON clients
+    WHEN old.parent_id IS NOT new.parent_id BEGIN
+        UPDATE clients SET children_count = children_count - 1 WHERE client_id = old.parent_id;
+        UPDATE clients SET children_count = children_count + 1 WHERE client_id = new.parent_id;
+    END
+    """,
+)
+
+
+def ensure_children_count(conn: Connection) -> None:
+    """
+    Колонка children_count и триггеры её пересчёта. В старой БД (таблица создана до счётчика)
+    колонка добавляется и сразу заполняется — до создания индексов по ней.
+    """
+    columns = {row[1] for row in conn.execute(text("PRAGMA table_info(clients)"))}
+    if "children_count" not in columns:
+        conn.execute(text("ALTER TABLE clients ADD COLUMN children_count INTEGER NOT NULL DEFAULT 0"))
+        rebuild_children_count(conn)
+    for ddl in _CHILDREN_COUNT_TRIGGERS_DDL:
+        conn.execute(text(ddl))
+
+
+def rebuild_children_count(conn: Connection) -> None:
+    """Пересчитать children_count всех клиентов (подсчёт детей — по индексу parent_id)."""
+    conn.execute(text(
+        "UPDATE clients SET children_count = "
+        "(SELECT count(*) FROM clients AS child WHERE child.parent_id = clients.client_id)"
+    ))
+
+
+def descendants(client_id: uuid.UUID, max_depth: int | None = None) -> CTE:
+    """
+    (client_id, depth) всех потомков client_id, без него самого: дети — depth 1, внуки — 2, …
+    max_depth — сколько уровней вниз обойти.
+    """
+    depth_limit = min(max_depth or CLIENT_HIERARCHY_MAX_DEPTH, CLIENT_HIERARCHY_MAX_DEPTH)
+    tree = (
+        select(ClientModel.client_id, literal(1).label("depth"))
+        .where(ClientModel.parent_id == client_id)
+        .cte("descendants", recursive=True, nesting=True)
+    )
+    child = aliased(ClientModel)
+    return tree.union_all(
+        select(child.client_id, tree.c.depth + 1)
+        .where(child.parent_id == tree.c.client_id, tree.c.depth < depth_limit)
+    )
+
+
+def ancestors(client_id: uuid.UUID, max_depth: int | None = None) -> CTE:
+    """
+    (client_id, depth) цепочки от client_id вверх: сам клиент — depth 0, родитель — 1, …, головной.
+    Клиента нет — цепочка пустая. max_depth — сколько уровней вверх пройти.
+    """
+    depth_limit = min(max_depth or CLIENT_HIERARCHY_MAX_DEPTH, CLIENT_HIERARCHY_MAX_DEPTH)
+    path = (
+        select(ClientModel.client_id, ClientModel.parent_id, literal(0).label("depth"))
+        .where(ClientModel.client_id == client_id)
+        .cte("ancestors", recursive=True, nesting=True)
+    )
+    parent = aliased(ClientModel)
+    return path.union_all(
+        select(parent.client_id, parent.parent_id, path.c.depth + 1)
+        .where(parent.client_id == path.c.parent_id, path.c.depth < depth_limit)
+    )
+
+
+if __name__ == "__main__":
+    from src.database import engine
+
+    with engine.begin() as connection:
+        rebuild_children_count(connection)
+    print("Счётчик children_count пересчитан")
@@ -0,0 +1,36 @@
+"""HTTP-кеширование ответов: ETag и условные запросы (If-None-Match)."""
+
+import hashlib
+
+from fastapi import Response
+
+
+def make_etag(payload: bytes) -> str:
+    """Сильный ETag по содержимому ответа."""
+    return '"' + hashlib.sha256(payload).hexdigest()[:32] + '"'
+
+
+def version_etag(token: str, version: int, *parts: object) -> str:
+    """ETag версии данных: token источника версии, её номер и хеш параметров ответа (фильтры, формат)."""
+    suffix = hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()[:12] if parts else ""
+    return f'"{token}-{version}-{suffix}"'
+
+
+def etag_matches(header: str | None, etag: str) -> bool:
+    """
+    Совпадает ли ETag с заголовком If-None-Match (список через запятую или «*»).
+    Для GET сравнение слабое (RFC 9110): префикс W/ не учитывается.
+    """
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def not_modified(etag: str, cache_control: str | None = None) -> Response:
+    """Ответ 304 без тела — с теми же валидаторами, что и полный ответ."""
+    headers = {"ETag": etag}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    return Response(status_code=304, headers=headers)
@@ -0,0 +1,130 @@
+"""Разбор загружаемого файла клиентов (NDJSON / CSV) для POST /api/clients/import.
+
+Тело запроса читается потоком и режется на записи по переводу строки (record_chunks —
+в event loop, только байты); пачка записей проверяется схемой ClientCreate (RecordParser —
+вместе с записью в БД, в пуле потоков). В памяти одна пачка, а не весь файл.
+Номер записи — номер строки файла, с которой она начинается (с 1).
+
+CSV — с заголовком; имена колонок как в выгрузке (camelCase) или snake_case, лишние
+колонки (clientId, createdAt, …) игнорируются, пустое значение — null. Файл выгрузки
+GET /api/clients/export можно загрузить обратно как есть.
+"""
+
+import csv
+from collections.abc import AsyncIterator
+
+from pydantic import ValidationError
+
+from src.schemas.client import ClientCreate
+from src.schemas.error import ErrorDetail, ErrorResponse
+from src.types.export_format import ExportFormat
+
+ParsedRecord = tuple[int, ClientCreate | ErrorResponse]
+
+
+def _validation_error(exc: ValidationError) -> ErrorResponse:
+    """Ошибка валидации записи — в том же формате, что ответ 422 API."""
+    return ErrorResponse(
+        error_name="VALIDATION_ERROR",
+        message="Ошибка валидации",
+        errors=[
+            ErrorDetail(field=".".join(str(loc) for loc in err["loc"]), message=err.get("msg", ""))
+            for err in exc.errors()
+        ],
+    )
+
+
+def _format_error(message: str) -> ErrorResponse:
+    return ErrorResponse(error_name="VALIDATION_ERROR", message=message)
+
+
+async def _records(stream: AsyncIterator[bytes], file_format: ExportFormat) -> AsyncIterator[tuple[int, bytes]]:
+    """
+    Записи тела с номером первой строки. Для CSV строки склеиваются, пока кавычки
+    не закрыты — значение в кавычках может содержать перевод строки.
+    """
+    buffer = b""
+    line_number = 0
+    pending: list[bytes] = []
+    start = 0
+
+    def feed(line: bytes) -> tuple[int, bytes] | None:
+        nonlocal pending, start
+        if not pending:
+            start = line_number
+        pending.append(line)
+        record = b"\n".join(pending)
+        if file_format == ExportFormat.CSV and record.count(b'"') % 2:
+            return None
+        pending = []
+        return start, record
+
+    async for data in stream:
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            record = feed(line)
+            if record is not None:
+                yield record
+    if buffer:
+        line_number += 1
+        record = feed(buffer)
+        if record is not None:
+            yield record
+    if pending:
+        # Незакрытая кавычка до конца файла — запись уйдёт в разбор и получит ошибку
+        yield start, b"\n".join(pending)
+
+
+class RecordParser:
+    """
+    Записи файла → ClientCreate или ErrorResponse. Для CSV помнит заголовок из первой
+    непустой записи, поэтому пачки одного файла разбираются одним парсером по порядку.
+    """
+
+    def __init__(self, file_format: ExportFormat) -> None:
+        self.file_format = file_format
+        self.header: list[str] | None = None
+
+    def __call__(self, records: list[tuple[int, bytes]]) -> list[ParsedRecord]:
+        parsed: list[ParsedRecord] = []
+        for line, raw in records:
+            try:
+                text = raw.decode("utf-8").removeprefix("\ufeff").rstrip("\r")
+                if not text.strip():
+                    continue
+                item = self._parse_csv(text) if self.file_format == ExportFormat.CSV else ClientCreate.model_validate_json(text)
+                if item is None:
+                    continue
+            except UnicodeDecodeError:
+                item = _format_error("Строка не в кодировке UTF-8")
+            except ValidationError as exc:
+                item = _validation_error(exc)
+            parsed.append((line, item))
+        return parsed
+
+    def _parse_csv(self, text: str) -> ClientCreate | ErrorResponse | None:
+        values = next(csv.reader([text]), [])
+        if self.header is None:
+            self.header = [name.strip() for name in values]
+            return None
+        if len(values) != len(self.header):
+            return _format_error(f"Полей в строке {len(values)}, в заголовке {len(self.header)}")
+        return ClientCreate.model_validate({name: value or None for name, value in zip(self.header, values)})
+
+
+async def record_chunks(
+    stream: AsyncIterator[bytes],
+    file_format: ExportFormat,
+    chunk_size: int,
+) -> AsyncIterator[list[tuple[int, bytes]]]:
+    """Записи тела пачками по chunk_size — без разбора, только нарезка байтов."""
+    chunk: list[tuple[int, bytes]] = []
+    async for record in _records(stream, file_format):
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -1,4 +1,3 @@
-import re
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
@@ -6,35 +5,34 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from src.config import DB_ASYNC, DEBUG_ENDPOINTS, METRICS_ENDPOINT, REQUEST_TIMING
 from src.database import init_db
 from src.exceptions import BusinessError
-from src.routers import clients, regions
+from src.metrics import MetricsMiddleware, count_error
+from src.routers import clients, debug, metrics, regions
 from src.schemas.error import ErrorDetail, ErrorResponse
 from src.seed import seed_db
+from src.timing import ServerTimingMiddleware
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_db()
     seed_db()
+    regions.load_regions_payload()
     yield
 
 
 app = FastAPI(lifespan=lifespan)
 
 
-def _error_name_from_class(cls: type) -> str:
-    """PascalCase → UPPER_SNAKE_CASE, например ClientAlreadyExists → CLIENT_ALREADY_EXISTS."""
-    name = cls.__name__
-    return re.sub(r"(?<!^)(?=[A-Z])", "_", name).upper()
-
-
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(
     _request: Request,
     exc: RequestValidationError,
 ) -> JSONResponse:
     """Ошибки валидации Pydantic → единый формат: error_name, message, details (где и что)."""
+    count_error("VALIDATION_ERROR")
     errors = [
         ErrorDetail(
             field=".".join(str(loc) for loc in err["loc"]),
@@ -59,9 +57,9 @@ async def business_error_handler(
     exc: BusinessError,
 ) -> JSONResponse:
     """Любая бизнес-ошибка (наследник BusinessError) → единый формат ответа."""
-    error_name = _error_name_from_class(exc.__class__)
+    count_error(exc.error_name)
     body = ErrorResponse(
-        error_name=error_name,
+        error_name=exc.error_name,
         message=exc.message,
         errors=None,
     )
@@ -78,9 +76,23 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-
-app.include_router(clients.router, prefix="/api/clients", tags=["clients"])
-app.include_router(regions.router, prefix="/api/regions", tags=["regions"])
+app.add_middleware(MetricsMiddleware)
+if REQUEST_TIMING:
+    # Добавлен последним — внешний слой: в замер входят CORS и обработчики ошибок
+    app.add_middleware(ServerTimingMiddleware)
+
+clients_router, regions_router = clients.router, regions.router
+if DB_ASYNC:
+    from src.routers.async_routes import as_async_router
+
+    clients_router, regions_router = as_async_router(clients_router), as_async_router(regions_router)
+
+app.include_router(clients_router, prefix="/api/clients", tags=["clients"])
+app.include_router(regions_router, prefix="/api/regions", tags=["regions"])
+if METRICS_ENDPOINT:
+    app.include_router(metrics.router)
+if DEBUG_ENDPOINTS:
+    app.include_router(debug.router, prefix="/debug", tags=["debug"])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,351 @@
+"""Метрики приложения в текстовом формате Prometheus для GET /metrics — без внешних библиотек.
+
+Что считается:
+- http_requests_total, http_request_duration_seconds — по методу и шаблону пути роута
+  (/api/clients/{client_id}, а не каждому id), http_requests_in_progress;
+- app_errors_total — ответы с ошибкой по error_name (обработчики ошибок в src/main.py);
+- db_pool_* — события пула соединений SQLAlchemy: выдачи, новые соединения, сколько
+  запрос ждал соединения (пул ограничен DB_POOL_SIZE + DB_MAX_OVERFLOW), сколько
+  соединение было занято (от checkout до checkin), сколько занято сейчас;
+- threadpool_threads_* — занятые и доступные потоки пула Starlette (синхронные роуты).
+
+Запись — под одной блокировкой в словари процесса: инкремент и bisect корзины гистограммы.
+
+Несколько воркеров (uvicorn --workers): METRICS_DIR в src/config.py — общий каталог.
+Каждый процесс раз в METRICS_FLUSH_INTERVAL секунд (и при выходе) пишет снимок своих
+метрик в metrics_<pid>.json; /metrics складывает снимки всех процессов. Снимок берётся
+в event loop (gauge пула потоков видны только там), а файлы пишутся и читаются в потоках —
+запросы не ждут диска. Счётчики и гистограммы завершённых процессов остаются в сумме,
+текущие значения (gauge) — только у живых. Перед запуском сервера каталог нужно очищать.
+"""
+
+import asyncio
+import atexit
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from contextvars import ContextVar
+from pathlib import Path
+
+import anyio.to_thread
+from sqlalchemy import Engine, event
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import METRICS_DIR, METRICS_FLUSH_INTERVAL, METRICS_LATENCY_BUCKETS
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# scope текущего HTTP-запроса — для current_route (журнал медленных запросов и т.п.)
+_current_scope: ContextVar[Scope | None] = ContextVar("metrics_scope", default=None)
+
+Labels = tuple[tuple[str, str], ...]
+Sample = tuple[str, Labels, float]
+
+_DESCRIPTIONS = {
+    "http_requests_total": ("counter", "HTTP-запросы по методу, шаблону пути и статусу"),
+    "http_request_duration_seconds": ("histogram", "Время HTTP-запроса до отправки тела, с"),
+    "http_requests_in_progress": ("gauge", "HTTP-запросы в обработке"),
+    "app_errors_total": ("counter", "Ответы с ошибкой по error_name"),
+    "db_pool_checkouts_total": ("counter", "Выдачи соединения из пула"),
+    "db_pool_connections_created_total": ("counter", "Новые соединения с БД"),
+    "db_pool_checkout_wait_seconds": ("histogram", "Ожидание соединения из пула (с открытием нового, если пул не полон), с"),
+    "db_pool_connection_hold_seconds": ("histogram", "Сколько соединение было выдано (checkout → checkin), с"),
+    "db_pool_checked_out": ("gauge", "Выданные сейчас соединения"),
+    "threadpool_threads_busy": ("gauge", "Занятые потоки пула синхронных роутов"),
+    "threadpool_threads_limit": ("gauge", "Размер пула синхронных роутов"),
+}
+
+
+class Registry:
+    """Счётчики, гистограммы и gauge одного процесса. Потокобезопасен."""
+
+    def __init__(self, buckets: Iterable[float]) -> None:
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters: dict[tuple[str, Labels], float] = {}
+        # Гистограмма: число наблюдений в каждой корзине (последняя — +Inf) и сумма последним элементом
+        self._histograms: dict[tuple[str, Labels], list[float]] = {}
+        self._gauges: dict[tuple[str, Labels], float] = {}
+        self._collectors: list[Callable[[], Iterable[Sample]]] = []
+
+    def inc(self, name: str, labels: Labels = (), amount: float = 1.0) -> None:
+        key = (name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + amount
+
+    def observe(self, name: str, labels: Labels, value: float) -> None:
+        key = (name, labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._histograms.get(key)
+            if counts is None:
+                counts = self._histograms[key] = [0.0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    def add_gauge(self, name: str, labels: Labels, amount: float) -> None:
+        key = (name, labels)
+        with self._lock:
+            self._gauges[key] = self._gauges.get(key, 0.0) + amount
+
+    def add_collector(self, collector: Callable[[], Iterable[Sample]]) -> None:
+        """Функция текущих значений gauge, вызывается при каждом снимке (размер пула и т.п.)."""
+        self._collectors.append(collector)
+
+    def snapshot(self, collect: bool = True) -> dict:
+        """Снимок в JSON-совместимом виде; collect=False — без collectors (вне event loop)."""
+        with self._lock:
+            counters = [[name, labels, value] for (name, labels), value in self._counters.items()]
+            histograms = [[name, labels, list(counts)] for (name, labels), counts in self._histograms.items()]
+            gauges = [[name, labels, value] for (name, labels), value in self._gauges.items()]
+        if collect:
+            for collector in self._collectors:
+                gauges += [[name, labels, value] for name, labels, value in collector()]
+        return {"pid": os.getpid(), "counters": counters, "histograms": histograms, "gauges": gauges}
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(labels: Iterable, extra: str = "") -> str:
+    parts = [f'{key}="{_escape(str(value))}"' for key, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if value == int(value) else repr(value)
+
+
+def render(snapshots: list[dict], buckets: tuple[float, ...]) -> str:
+    """Сумма снимков процессов → текст Prometheus. Gauge берутся только у живых процессов."""
+    counters: dict[tuple, float] = {}
+    histograms: dict[tuple, list[float]] = {}
+    gauges: dict[tuple, float] = {}
+    current = os.getpid()
+    for snapshot in snapshots:
+        for name, labels, value in snapshot["counters"]:
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0.0) + value
+        for name, labels, counts in snapshot["histograms"]:
+            key = (name, tuple(map(tuple, labels)))
+            total = histograms.setdefault(key, [0.0] * len(counts))
+            for index, count in enumerate(counts):
+                total[index] += count
+        if snapshot["pid"] == current or _pid_alive(snapshot["pid"]):
+            for name, labels, value in snapshot["gauges"]:
+                key = (name, tuple(map(tuple, labels)))
+                gauges[key] = gauges.get(key, 0.0) + value
+
+    by_name: dict[str, list[str]] = {}
+    for (name, labels), value in sorted(counters.items()):
+        by_name.setdefault(name, []).append(f"{name}{_label_text(labels)} {_number(value)}")
+    for (name, labels), value in sorted(gauges.items()):
+        by_name.setdefault(name, []).append(f"{name}{_label_text(labels)} {_number(value)}")
+    for (name, labels), counts in sorted(histograms.items()):
+        lines = by_name.setdefault(name, [])
+        cumulative = 0.0
+        for bound, count in zip((*buckets, float("inf")), counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(float(bound))
+            bucket_labels = _label_text(labels, f'le="{le}"')
+            lines.append(f"{name}_bucket{bucket_labels} {_number(cumulative)}")
+        lines.append(f"{name}_sum{_label_text(labels)} {repr(counts[-1])}")
+        lines.append(f"{name}_count{_label_text(labels)} {_number(cumulative)}")
+
+    out = []
+    for name in sorted(by_name):
+        kind, description = _DESCRIPTIONS.get(name, ("untyped", name))
+        out += [f"# HELP {name} {description}", f"# TYPE {name} {kind}", *by_name[name]]
+    return "\n".join(out) + "\n"
+
+
+registry = Registry(METRICS_LATENCY_BUCKETS)
+_last_flush = 0.0
+# Записи снимка из потоков исполнителя идут по одной: общий временный файл
+_write_lock = threading.Lock()
+
+
+def _snapshot_path(pid: int) -> Path:
+    return Path(METRICS_DIR) / f"metrics_{pid}.json"
+
+
+def _write_snapshot(snapshot: dict) -> None:
+    """Записать снимок процесса в METRICS_DIR (атомарно: временный файл и rename)."""
+    with _write_lock:
+        Path(METRICS_DIR).mkdir(parents=True, exist_ok=True)
+        path = _snapshot_path(snapshot["pid"])
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(snapshot), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+def flush(collect: bool = True) -> None:
+    """Записать снимок процесса в METRICS_DIR сейчас, в текущем потоке (при выходе процесса)."""
+    global _last_flush
+    if not METRICS_DIR:
+        return
+    _last_flush = time.monotonic()
+    _write_snapshot(registry.snapshot(collect))
+
+
+def _maybe_flush() -> None:
+    """
+    Из middleware (в event loop): раз в METRICS_FLUSH_INTERVAL снять снимок и отдать запись
+    файла потоку исполнителя loop — не пулу синхронных роутов и не самому запросу.
+    """
+    global _last_flush
+    if not METRICS_DIR or time.monotonic() - _last_flush < METRICS_FLUSH_INTERVAL:
+        return
+    _last_flush = time.monotonic()
+    asyncio.get_running_loop().run_in_executor(None, _write_snapshot, registry.snapshot())
+
+
+def process_snapshots(own: dict) -> list[dict]:
+    """
+    Снимок own и, при METRICS_DIR, снимки остальных процессов (own заодно записывается).
+    Читает и пишет файлы — из event loop вызывать в потоке.
+    """
+    snapshots = [own]
+    if METRICS_DIR:
+        _write_snapshot(own)
+        for path in Path(METRICS_DIR).glob("metrics_*.json"):
+            if path == _snapshot_path(own["pid"]):
+                continue
+            try:
+                snapshots.append(json.loads(path.read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                continue  # процесс как раз переписывает файл — возьмём в следующий раз
+    return snapshots
+
+
+def describe(name: str, kind: str, description: str) -> None:
+    """Тип и описание метрики другого модуля (для строк # HELP / # TYPE)."""
+    _DESCRIPTIONS[name] = (kind, description)
+
+
+def count_error(error_name: str) -> None:
+    """Ответ с ошибкой error_name (VALIDATION_ERROR, CLIENT_NOT_FOUND, …)."""
+    registry.inc("app_errors_total", (("error_name", error_name),))
+
+
+def instrument_pool(target: Engine, name: str) -> None:
+    """
+    События пула движка → db_pool_*; name — метка engine (write, read, …).
+    У пула нет события до выдачи, поэтому ожидание меряется обёрткой raw_connection движка:
+    через неё берут соединение все Connection и сессии, и она переживает engine.dispose().
+    """
+    labels = (("engine", name),)
+    raw_connection = target.raw_connection
+
+    def _timed_raw_connection():
+        started = time.perf_counter()
+        connection = raw_connection()
+        registry.observe("db_pool_checkout_wait_seconds", labels, time.perf_counter() - started)
+        return connection
+
+    target.raw_connection = _timed_raw_connection
+
+    @event.listens_for(target, "connect")
+    def _connect(_dbapi_connection, _record) -> None:
+        registry.inc("db_pool_connections_created_total", labels)
+
+    @event.listens_for(target, "checkout")
+    def _checkout(_dbapi_connection, record, _proxy) -> None:
+        record.info["metrics_checkout"] = time.perf_counter()
+        registry.inc("db_pool_checkouts_total", labels)
+
+    @event.listens_for(target, "checkin")
+    def _checkin(_dbapi_connection, record) -> None:
+        started = record.info.pop("metrics_checkout", None)
+        if started is not None:
+            registry.observe("db_pool_connection_hold_seconds", labels, time.perf_counter() - started)
+
+    registry.add_collector(lambda: [("db_pool_checked_out", labels, target.pool.checkedout())])
+
+
+def _threadpool() -> list[Sample]:
+    """Пул потоков anyio, в котором Starlette выполняет синхронные роуты; вне event loop — пусто."""
+    try:
+        limiter = anyio.to_thread.current_default_thread_limiter()
+    except RuntimeError:
+        return []
+    return [
+        ("threadpool_threads_busy", (), limiter.borrowed_tokens),
+        ("threadpool_threads_limit", (), limiter.total_tokens),
+    ]
+
+
+registry.add_collector(_threadpool)
+if METRICS_DIR:
+    atexit.register(flush, collect=False)
+
+
+def _route_template(scope: Scope) -> str:
+    """
+    Шаблон пути совпавшего роута: значения path-параметров заменяются их именами
+    (/api/clients/{client_id}). Собирается из scope, а не из route.path: у роута во
+    вложенном роутере FastAPI путь без префикса. Роут не найден — «<unmatched>».
+    """
+    if "endpoint" not in scope:
+        return "<unmatched>"
+    names = {str(value): f"{{{name}}}" for name, value in scope.get("path_params", {}).items()}
+    return "/".join(names.get(segment, segment) for segment in scope["path"].split("/"))
+
+
+def current_route() -> str | None:
+    """«МЕТОД шаблон» роута текущего HTTP-запроса (GET /api/clients/{client_id}); вне запроса — None."""
+    scope = _current_scope.get()
+    if scope is None:
+        return None
+    return f"{scope['method']} {_route_template(scope)}"
+
+
+class MetricsMiddleware:
+    """ASGI-middleware: счётчик, гистограмма времени и запросы в обработке по шаблону пути роута."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        registry.add_gauge("http_requests_in_progress", (), 1)
+        token = _current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _current_scope.reset(token)
+            registry.add_gauge("http_requests_in_progress", (), -1)
+            path = _route_template(scope)
+            method = scope["method"]
+            registry.inc("http_requests_total", (("method", method), ("route", path), ("status", str(status))))
+            registry.observe(
+                "http_request_duration_seconds", (("method", method), ("route", path)), time.perf_counter() - started
+            )
+            _maybe_flush()
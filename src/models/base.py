@@ -1,9 +1,14 @@
-from datetime import datetime
+from datetime import datetime, timezone
 
 from sqlalchemy import DateTime, func
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
+def _utcnow() -> datetime:
+    """Текущее время UTC без зоны — как CURRENT_TIMESTAMP в SQLite, но с микросекундами."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class Base(DeclarativeBase):
     """Общая база для всех моделей. Импортировать в database.py и использовать в create_all()."""
 
@@ -16,5 +21,6 @@ class Base(DeclarativeBase):
         DateTime,
         nullable=False,
         server_default=func.now(),
-        onupdate=func.now(),
+        # С микросекундами: updated_at — версия строки в ETag клиента, две правки за секунду различимы
+        onupdate=_utcnow,
     )
@@ -1,7 +1,7 @@
 import uuid
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Enum, ForeignKey, String
+from sqlalchemy import Enum, ForeignKey, Index, Integer, String, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.types import Uuid
 
@@ -16,6 +16,32 @@ class ClientModel(Base):
     """Клиент: справочник с полями по ТЗ."""
 
     __tablename__ = "clients"
+    # Индексы под запросы list_clients: сортировка всегда (sort_by, client_id), фильтры
+    # с сортировкой по умолчанию (created_at) — (filter, created_at, client_id). Сортировке
+    # по party_type / region_id / parent_id без фильтров составные индексы фильтров не годятся
+    # (второй столбец не client_id) — у каждой свой (col, client_id), иначе SQLite сортирует всю таблицу.
+    # ix_clients_parent_id_name покрывает /parents (parent_id IS NULL ORDER BY name) и фильтр parentId.
+    # children_count ведут триггеры SQLite (src/hierarchy.py), ix_clients_children_count — сортировка по нему.
+    # Уникальность имени и ИНН держит БД: ux_clients_name (он же — сортировка по имени: при
+    # уникальном name порядок (name, client_id) совпадает с порядком индекса) и частичный
+    # ux_clients_inn — пустой ИНН (null или '') не считается, как и раньше.
+    __table_args__ = (
+        Index("ix_clients_created_at", "created_at", "client_id"),
+        Index("ix_clients_updated_at", "updated_at", "client_id"),
+        Index("ux_clients_name", "name", unique=True),
+        Index("ux_clients_inn", "inn", unique=True, sqlite_where=text("inn IS NOT NULL AND inn <> ''")),
+        Index("ix_clients_full_name", "full_name", "client_id"),
+        Index("ix_clients_inn", "inn", "client_id"),
+        Index("ix_clients_party_type", "party_type", "client_id"),
+        Index("ix_clients_region_id", "region_id", "client_id"),
+        Index("ix_clients_parent_id", "parent_id", "client_id"),
+        Index("ix_clients_party_type_created_at", "party_type", "created_at", "client_id"),
+        Index("ix_clients_region_id_created_at", "region_id", "created_at", "client_id"),
+        Index("ix_clients_parent_id_name", "parent_id", "name", "client_id"),
+        Index("ix_clients_children_count", "children_count", "client_id"),
+    )
+    # INSERT/UPDATE сразу возвращают серверные created_at/updated_at (RETURNING) — без refresh после записи
+    __mapper_args__ = {"eager_defaults": True}
 
     client_id: Mapped[uuid.UUID] = mapped_column(
         Uuid(as_uuid=True),
@@ -36,6 +62,8 @@ class ClientModel(Base):
         ForeignKey("clients.client_id"),
         nullable=True,
     )
+    # Число прямых дочерних клиентов — счётчик на триггерах, приложение его не пишет
+    children_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
 
     region: Mapped["RegionModel | None"] = relationship("RegionModel", foreign_keys=[region_id])
     parent: Mapped["ClientModel | None"] = relationship(
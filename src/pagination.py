@@ -0,0 +1,91 @@
+"""Keyset-пагинация (курсор) для GET /api/clients.
+
+Курсор — непрозрачная строка (base64url от JSON): поле и направление сортировки
+плюс «сырые» значения (sort_by, client_id) последней строки страницы, как они
+лежат в SQLite. Сравнение идёт по сырым значениям, поэтому формат хранения дат
+(с микросекундами или без) и UUID (hex) на корректность не влияет.
+"""
+
+import base64
+import binascii
+import json
+
+from sqlalchemy import Column, String, and_, literal, or_, tuple_, type_coerce
+from sqlalchemy.sql.elements import ColumnElement
+
+from src.exceptions import InvalidCursor
+from src.types.client_sort_by import ClientSortBy
+from src.types.sort_order import SortOrder
+
+CursorValue = str | int | float | None
+
+
+def raw_key(column: Column) -> ColumnElement:
+    """Колонка без обработки типа: в SELECT отдаёт значение как в БД, в SQL — та же колонка (индекс работает)."""
+    return type_coerce(column, String)
+
+
+def encode_cursor(
+    sort_by: ClientSortBy,
+    sort_order: SortOrder,
+    value: CursorValue,
+    client_id: str,
+) -> str:
+    """Курсор на строку (value, client_id) — значения «сырые», из raw_key()."""
+    payload = json.dumps(
+        [sort_by.value, sort_order.value, value, client_id],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(
+    cursor: str,
+    sort_by: ClientSortBy,
+    sort_order: SortOrder,
+) -> tuple[CursorValue, str]:
+    """Разбор курсора. Курсор должен быть выдан для той же сортировки — иначе InvalidCursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        s, o, value, client_id = json.loads(raw.decode("utf-8"))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as e:
+        raise InvalidCursor() from e
+    if not isinstance(client_id, str) or not isinstance(value, CursorValue):
+        raise InvalidCursor()
+    if s != sort_by.value or o != sort_order.value:
+        raise InvalidCursor("Курсор выдан для другой сортировки")
+    return value, client_id
+
+
+def keyset_condition(
+    column: Column,
+    id_column: Column,
+    sort_order: SortOrder,
+    value: CursorValue,
+    client_id: str,
+) -> ColumnElement[bool]:
+    """
+    Условие «строго после (value, client_id)» для ORDER BY column, id_column в направлении sort_order.
+
+    SQLite ставит NULL первыми при ASC и последними при DESC — ветки с IS NULL
+    повторяют этот порядок. Для NOT NULL колонок остаётся одно сравнение row value,
+    которое SQLite отрабатывает диапазоном по индексу (column, id_column).
+    """
+    key = raw_key(column)
+    id_key = raw_key(id_column)
+    asc = sort_order == SortOrder.ASC
+
+    if value is None:
+        if asc:
+            return or_(and_(column.is_(None), id_key > literal(client_id)), column.is_not(None))
+        return and_(column.is_(None), id_key < literal(client_id))
+
+    after = (
+        tuple_(key, id_key) > tuple_(literal(value), literal(client_id))
+        if asc
+        else tuple_(key, id_key) < tuple_(literal(value), literal(client_id))
+    )
+    if column.nullable and not asc:
+        return or_(after, column.is_(None))
+    return after
@@ -0,0 +1,145 @@
+"""Асинхронные версии роутеров для DB_ASYNC: те же пути, схемы и логика, сессия — AsyncSession.
+
+Горячие чтения — список и клиент по id — настоящие async-обработчики (_NATIVE_ENDPOINTS):
+запросы строит общий с синхронными роутами код (list_clients_steps, client_statement),
+выполняются они через AsyncConnection без ORM-сессии, ответ из кеша списка — без соединения.
+Запрос не занимает поток из пула Starlette: ожидание SQLite идёт в потоке aiosqlite,
+event loop в это время свободен.
+
+Остальные эндпоинты с зависимостью get_db / get_read_db не дублируются: они оборачиваются
+в async-функцию, которая получает AsyncSession и выполняет исходный код через run_sync —
+это дороже синхронного роута (переключения greenlet и обмен с потоком aiosqlite на каждый
+запрос к БД), но эти эндпоинты не горячие.
+"""
+
+import inspect
+import uuid
+from collections.abc import Callable, Generator, Sequence
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends, Header, Query, Response
+from fastapi.routing import APIRoute
+from sqlalchemy import Row, Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import get_db, get_read_db
+from src.database_async import async_read_engine, get_async_db, get_async_read_db
+from src.formats import negotiate
+from src.routers import clients
+from src.schemas.client import CLIENT_FIELDS, ClientGetQuery, ClientListQuery
+
+# Зависимость синхронного роута → зависимость асинхронного
+_ASYNC_DEPENDENCIES = {get_db: get_async_db, get_read_db: get_async_read_db}
+
+
+async def _run_steps(steps: Generator[Select, Sequence[Row], Response]) -> Response:
+    """
+    Выполнить шаги list_clients_steps через AsyncConnection. Соединение берётся из пула
+    только под первый запрос: ответ из кеша списка готов без него.
+    """
+    try:
+        statement = next(steps)
+    except StopIteration as stop:
+        return stop.value
+    async with async_read_engine.connect() as connection:
+        try:
+            while True:
+                statement = steps.send((await connection.execute(statement)).all())
+        except StopIteration as stop:
+            return stop.value
+
+
+async def list_clients(
+    params: Annotated[ClientListQuery, Query()],
+    accept: Annotated[str | None, Header()] = None,
+) -> Response:
+    """Асинхронный GET /api/clients: логика — clients.list_clients_steps."""
+    return await _run_steps(clients.list_clients_steps(params, negotiate(accept)))
+
+
+async def get_client(
+    client_id: uuid.UUID,
+    params: Annotated[ClientGetQuery, Query()],
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    """Асинхронный GET /api/clients/{client_id}: запрос — clients.client_statement, ответ — clients.client_response."""
+    fields = params.fields or CLIENT_FIELDS
+    async with async_read_engine.connect() as connection:
+        row = (await connection.execute(clients.client_statement(client_id, fields))).first()
+    return clients.client_response(client_id, fields, row, if_none_match)
+
+
+# Синхронный эндпоинт → его настоящая async-версия (вместо обёртки с run_sync)
+_NATIVE_ENDPOINTS = {clients.list_clients: list_clients, clients.get_client: get_client}
+
+
+def _db_param(endpoint: Callable[..., Any]) -> inspect.Parameter | None:
+    """Параметр эндпоинта с сессией БД (Depends(get_db) / Depends(get_read_db)), если он есть."""
+    for param in inspect.signature(endpoint).parameters.values():
+        if getattr(param.default, "dependency", None) in _ASYNC_DEPENDENCIES:
+            return param
+    return None
+
+
+def _as_async_endpoint(endpoint: Callable[..., Any], db_param: inspect.Parameter) -> Callable[..., Any]:
+    """async-обёртка: та же сигнатура, но сессия — AsyncSession, код эндпоинта — в run_sync."""
+    sync_dependency = db_param.default.dependency
+
+    async def wrapper(**kwargs: Any) -> Any:
+        db: AsyncSession = kwargs.pop(db_param.name)
+        return await db.run_sync(lambda session: endpoint(**kwargs, **{db_param.name: session}))
+
+    signature = inspect.signature(endpoint)
+    wrapper.__signature__ = signature.replace(
+        parameters=[
+            p.replace(annotation=AsyncSession, default=Depends(_ASYNC_DEPENDENCIES[sync_dependency]))
+            if p.name == db_param.name
+            else p
+            for p in signature.parameters.values()
+        ]
+    )
+    wrapper.__name__ = endpoint.__name__
+    wrapper.__qualname__ = endpoint.__qualname__
+    wrapper.__doc__ = endpoint.__doc__
+    wrapper.__module__ = endpoint.__module__
+    return wrapper
+
+
+def as_async_router(router: APIRouter) -> APIRouter:
+    """
+    Копия router, где эндпоинты с сессией БД работают асинхронно: горячие чтения — своими
+    обработчиками, прочие — через AsyncSession.run_sync. Роуты без БД — как есть.
+    """
+    async_router = APIRouter()
+    for route in router.routes:
+        if not isinstance(route, APIRoute):
+            async_router.routes.append(route)
+            continue
+        db_param = _db_param(route.endpoint)
+        # SessionRoute оборачивает синхронные эндпоинты (functools.wraps) — сверяемся с исходным
+        native = _NATIVE_ENDPOINTS.get(inspect.unwrap(route.endpoint))
+        if native is not None:
+            endpoint = native
+        elif db_param is not None:
+            endpoint = _as_async_endpoint(route.endpoint, db_param)
+        else:
+            endpoint = route.endpoint
+        async_router.add_api_route(
+            route.path,
+            endpoint,
+            methods=route.methods,
+            response_model=route.response_model,
+            status_code=route.status_code,
+            tags=route.tags,
+            dependencies=route.dependencies,
+            summary=route.summary,
+            description=route.description,
+            response_description=route.response_description,
+            responses=route.responses,
+            deprecated=route.deprecated,
+            operation_id=route.operation_id,
+            include_in_schema=route.include_in_schema,
+            response_class=route.response_class,
+            name=route.name,
+        )
+    return async_router
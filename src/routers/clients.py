@@ -1,23 +1,226 @@
 import uuid
+from collections.abc import Generator, Iterator, Sequence
+from contextlib import contextmanager
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import or_
+from fastapi import APIRouter, Depends, Header, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Column, Row, Select, and_, func, insert, select, true, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
 
-from src.database import get_db
+from src.cache import DataVersion, LruCache, ResponseCache
+from src.config import (
+    CLIENT_CACHE_CONTROL,
+    CLIENT_COUNT_CACHE_SIZE,
+    CLIENT_COUNT_CACHE_TTL,
+    CLIENT_IMPORT_CHUNK_SIZE,
+    CLIENT_IMPORT_MAX_ERRORS,
+    CLIENT_LIST_CACHE_MAX_BYTES,
+    CLIENT_LIST_CACHE_SIZE,
+    CLIENT_LIST_CACHE_TTL,
+    PARENTS_CACHE_CONTROL,
+)
+from src.data_version import data_version_etag
+from src.database import SessionLocal, SessionRoute, get_db, get_read_db
 from src.exceptions import (
+    BusinessError,
     ClientAlreadyExists,
     ClientAlreadyExistsByInn,
     ClientNotFound,
+    ClientPreconditionFailed,
+    EmptyClientFilter,
+    ParentClientCycle,
     ParentClientNotFound,
+    RegionNotFound,
 )
+from src import hierarchy
+from src.export import MEDIA_TYPES, ROW_EXTENSIONS, export_chunks, export_row_chunks
+from src.formats import JSON_MEDIA_TYPE, encode, negotiate
+from src.http_cache import etag_matches, not_modified
+from src.importer import RecordParser, record_chunks
+from src.metrics import describe, registry
 from src.models.client_model import ClientModel
-from src.schemas.client import Client, ClientCreate, ClientListQuery, ClientParentsResponse, ClientsResponse, ClientUpdate
+from src.models.region_model import RegionModel
+from src.pagination import decode_cursor, encode_cursor, keyset_condition, raw_key
+from src.schemas.client import (
+    CLIENT_FIELDS,
+    Client,
+    ClientBatchCreate,
+    ClientBatchItemResult,
+    ClientBatchResponse,
+    ClientBulkDelete,
+    ClientBulkResult,
+    ClientBulkUpdate,
+    ClientCreate,
+    ClientExportQuery,
+    ClientFilter,
+    ClientGetQuery,
+    ClientImportLineError,
+    ClientImportQuery,
+    ClientImportReport,
+    ClientListQuery,
+    ClientOption,
+    ClientOptionsResponse,
+    ClientParentsQuery,
+    ClientParentsResponse,
+    ClientSelection,
+    ClientsResponse,
+    ClientTreeQuery,
+    ClientTreeResponse,
+    ClientUpdate,
+    client_field_aliases,
+    client_fields_model,
+    client_list_adapter,
+    client_rows_model,
+)
+from src.schemas.error import ErrorResponse
+from src.search import search_condition
+from src.timing import timed
 from src.types.client_sort_by import ClientSortBy
+from src.types.export_format import ExportFormat
 from src.types.sort_order import SortOrder
 
-router = APIRouter()
+router = APIRouter(route_class=SessionRoute)
+
+# total по набору фильтров: листание страниц одного фильтра не пересчитывает его.
+# Ключ — (версия данных на начало запроса, фильтры), как у _list_cache
+_count_cache: LruCache[tuple, int] = LruCache(maxsize=CLIENT_COUNT_CACHE_SIZE, ttl=CLIENT_COUNT_CACHE_TTL)
+# Версия данных клиентов этого процесса — поколение кешей списка и total
+_clients_version = DataVersion()
+# Готовые тела GET /api/clients: ключ — (версия данных на начало запроса, формат и параметры)
+_list_cache: ResponseCache[tuple] = ResponseCache(
+    maxsize=CLIENT_LIST_CACHE_SIZE, max_bytes=CLIENT_LIST_CACHE_MAX_BYTES, ttl=CLIENT_LIST_CACHE_TTL
+)
+
+describe("client_list_cache_entries", "gauge", "Записей в кеше ответов GET /api/clients")
+describe("client_list_cache_bytes", "gauge", "Байт тел в кеше ответов GET /api/clients")
+describe("client_list_cache_hits_total", "counter", "Попадания в кеш ответов GET /api/clients")
+describe("client_list_cache_misses_total", "counter", "Промахи кеша ответов GET /api/clients")
+
+
+def _list_cache_samples() -> list[tuple]:
+    stats = _list_cache.stats()
+    return [
+        (f"client_list_cache_{name}", (), stats[key])
+        for name, key in (("entries", "entries"), ("bytes", "bytes"), ("hits_total", "hits"), ("misses_total", "misses"))
+    ]
+
+
+registry.add_collector(_list_cache_samples)
+
+
+def list_cache_stats() -> dict[str, float]:
+    """Состояние кеша ответов списка — для /debug/list-cache."""
+    return _list_cache.stats()
+
+
+def _client_columns(fields: tuple[str, ...]) -> list[Column]:
+    """Колонки clients под поля схемы Client (все или из fields=) — чтение без ORM-объектов и identity map."""
+    return [ClientModel.__table__.c[name] for name in fields]
+
+
+def _clients_from_rows(rows: list[tuple], fields: tuple[str, ...] = CLIENT_FIELDS) -> list[BaseModel]:
+    """Client (или его подмножество fields) из кортежей _client_columns без валидации: значения уже нужных типов."""
+    model = client_fields_model(fields)
+    with timed("build"):
+        return [model.model_construct(**dict(zip(fields, row))) for row in rows]
+
+
+def _json_response(body: BaseModel, headers: dict[str, str] | None = None) -> Response:
+    """
+    Готовая схема ответа сразу в JSON. Вернуть Response — значит пропустить повторную
+    валидацию по response_model в FastAPI; байты те же: FastAPI сериализует той же схемой.
+    """
+    with timed("encode"):
+        content = body.model_dump_json(by_alias=True)
+    return Response(content, media_type="application/json", headers=headers)
+
+
+def _json_list_response(
+    envelope: type[BaseModel],
+    fields: tuple[str, ...],
+    rows: list[tuple],
+    headers: dict[str, str] | None = None,
+    **values: object,
+) -> Response:
+    """
+    Ответ-список envelope в JSON: items — словари из кортежей _client_columns (лишние колонки
+    в конце строки отбрасываются), сериализует client_list_adapter без схемы на строку.
+    values — остальные поля envelope (total, nextCursor, …), передаются все.
+    """
+    with timed("build"):
+        items = [dict(zip(fields, row)) for row in rows]
+    with timed("encode"):
+        content = client_list_adapter(envelope, fields).dump_json({"items": items, **values}, by_alias=True)
+    return Response(content, media_type="application/json", headers=headers)
+
+
+def _list_response(
+    envelope: type[BaseModel],
+    fields: tuple[str, ...],
+    rows: list[tuple],
+    media_type: str,
+    headers: dict[str, str] | None = None,
+    **values: object,
+) -> Response:
+    """
+    Ответ-список в формате media_type (negotiate): JSON — items объектами, как прежде;
+    колоночный JSON и MessagePack — columns + rows прямо из кортежей, без объекта на строку.
+    values — остальные поля envelope (total, nextCursor, …).
+    """
+    headers = {"Vary": "Accept", **(headers or {})}
+    if media_type == JSON_MEDIA_TYPE:
+        return _json_list_response(envelope, fields, rows, headers, **values)
+    width = len(fields)
+    with timed("build"):
+        body = client_rows_model(envelope, fields).model_construct(
+            columns=client_field_aliases(fields),
+            rows=[tuple(row[:width]) for row in rows],
+            **values,
+        )
+    with timed("encode"):
+        content = encode(body, media_type)
+    return Response(content, media_type=media_type, headers=headers)
+
+
+def _client_etag(client_id: uuid.UUID, updated_at: str, children_count: int) -> str:
+    """
+    ETag клиента: client_id, updated_at в виде из БД (raw_key) и children_count — его ведут
+    триггеры при изменении детей, updated_at при этом не меняется, а childrenCount в ответе — да.
+    """
+    return f'"{client_id.hex}.{children_count}.{updated_at.replace(" ", "T")}"'
+
+
+def _if_match_condition(header: str | None, client_id: uuid.UUID) -> ColumnElement[bool]:
+    """
+    If-Match → условие WHERE для UPDATE/DELETE: updated_at равен версии из одного из ETag.
+    Проверка — в самом запросе записи, без чтения перед ним и без гонки. children_count
+    не сравнивается: он не редактируется, и появление ребёнка не мешает правке клиента.
+    Чужой или неразборчивый ETag не совпадает ни с чем; «*» и отсутствие заголовка — любая версия.
+    Сравнение строгое (RFC 9110, 13.1.1): слабый ETag (W/"…") не совпадает ни с чем.
+    """
+    if header is None or header.strip() == "*":
+        return true()
+    stamps = []
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            continue
+        parts = tag.strip('"').split(".", 2)
+        if len(parts) == 3 and parts[0] == client_id.hex:
+            stamps.append(parts[2].replace("T", " "))
+    return raw_key(ClientModel.updated_at).in_(stamps)
+
+
+def _missing_or_changed(client_id: uuid.UUID, db: Session) -> BusinessError:
+    """Условная запись не затронула строк: клиента нет (404) или If-Match устарел (412)."""
+    if db.query(ClientModel.client_id).filter(ClientModel.client_id == client_id).first() is None:
+        return ClientNotFound()
+    return ClientPreconditionFailed()
 
 
 def _ensure_parent_exists(parent_id: uuid.UUID | None, db: Session) -> None:
@@ -28,104 +231,581 @@ def _ensure_parent_exists(parent_id: uuid.UUID | None, db: Session) -> None:
         raise ParentClientNotFound()
 
 
-def _ensure_client_unique_on_create(body: ClientCreate, db: Session) -> None:
-    """Проверка уникальности имени и ИНН при создании. При дубликате — ClientAlreadyExists / ClientAlreadyExistsByInn."""
-    if body.inn and db.query(ClientModel).filter(ClientModel.inn == body.inn).first():
-        raise ClientAlreadyExistsByInn()
-    if db.query(ClientModel).filter(ClientModel.name == body.name).first():
-        raise ClientAlreadyExists()
+def _ensure_no_cycle(parent_id: uuid.UUID | None, selection: ColumnElement[bool], db: Session) -> None:
+    """
+    Назначить parent_id родителем клиентов selection можно, только если среди parent_id и его
+    предков нет ни одного из них — иначе цикл (ParentClientCycle). Один запрос по цепочке
+    предков parent_id: O(глубины), независимо от размера выборки.
+    """
+    if parent_id is None:
+        return
+    path = hierarchy.ancestors(parent_id)
+    cycle = select(ClientModel.client_id).where(ClientModel.client_id.in_(select(path.c.client_id)), selection)
+    if db.query(cycle.exists()).scalar():
+        raise ParentClientCycle()
 
 
-def _ensure_client_unique_on_update(
-    client_id: uuid.UUID,
-    data: dict,
-    db: Session,
-) -> None:
-    """Проверка уникальности имени и ИНН при обновлении. При дубликате — ClientAlreadyExists / ClientAlreadyExistsByInn."""
-    if data.get("inn"):
-        other = db.query(ClientModel).filter(ClientModel.client_id != client_id, ClientModel.inn == data["inn"]).first()
-        if other:
-            raise ClientAlreadyExistsByInn()
-    if "name" in data:
-        other = db.query(ClientModel).filter(ClientModel.client_id != client_id, ClientModel.name == data["name"]).first()
-        if other:
-            raise ClientAlreadyExists()
+def _ensure_region_exists(region_id: uuid.UUID | None, db: Session) -> None:
+    """Проверка, что регион существует (FK проверяется SQLite, но без понятной ошибки). При отсутствии — RegionNotFound."""
+    if region_id is None:
+        return
+    if db.get(RegionModel, region_id) is None:
+        raise RegionNotFound()
 
 
-@router.get("", response_model=ClientsResponse)
-def list_clients(
-    params: Annotated[ClientListQuery, Query()],
-    db: Session = Depends(get_db),
-) -> ClientsResponse:
-    """Список клиентов с фильтрами, пагинацией и сортировкой."""
-    q = db.query(ClientModel)
+# Тексты ошибок SQLite о нарушении уникальных индексов ux_clients_inn / ux_clients_name
+_UNIQUE_INN_FAILED = "UNIQUE constraint failed: clients.inn"
+_UNIQUE_NAME_FAILED = "UNIQUE constraint failed: clients.name"
+
+
+@contextmanager
+def _unique_violations(db: Session) -> Iterator[None]:
+    """
+    Нарушение уникальных индексов ux_clients_name / ux_clients_inn → ClientAlreadyExists /
+    ClientAlreadyExistsByInn. Уникальность проверяет сама БД при записи — без SELECT перед ней
+    и без гонки двух одновременных запросов с одним именем или ИНН. Остальные IntegrityError
+    (NOT NULL, внешний ключ) — не дубликат: пробрасываются как есть.
+    """
+    try:
+        yield
+    except IntegrityError as exc:
+        db.rollback()
+        message = str(exc.orig)
+        if message == _UNIQUE_INN_FAILED:
+            raise ClientAlreadyExistsByInn() from exc
+        if message == _UNIQUE_NAME_FAILED:
+            raise ClientAlreadyExists() from exc
+        raise
+
+
+def _existing_values(db: Session, column: Column, values: set) -> set:
+    """Какие из values уже есть в колонке — одним запросом IN."""
+    if not values:
+        return set()
+    return {value for (value,) in db.query(column).filter(column.in_(values))}
+
+
+def _batch_errors(items: list[ClientCreate], db: Session) -> list[BusinessError | None]:
+    """
+    Ошибка по каждому элементу пакета (None — можно создавать) — те же проверки и в том же
+    порядке, что в create_client, но четырьмя запросами IN на весь пакет.
+    Дубликаты внутри пакета: имя/ИНН занимает первый элемент, следующие получают ту же ошибку,
+    что и при конфликте с БД.
+    """
+    taken_inns = _existing_values(db, ClientModel.inn, {i.inn for i in items if i.inn})
+    taken_names = _existing_values(db, ClientModel.name, {i.name for i in items})
+    parent_ids = _existing_values(db, ClientModel.client_id, {i.parent_id for i in items if i.parent_id})
+    region_ids = _existing_values(db, RegionModel.id, {i.region_id for i in items if i.region_id})
+
+    errors: list[BusinessError | None] = []
+    for item in items:
+        error = None
+        if item.inn and item.inn in taken_inns:
+            error = ClientAlreadyExistsByInn()
+        elif item.name in taken_names:
+            error = ClientAlreadyExists()
+        elif item.parent_id is not None and item.parent_id not in parent_ids:
+            error = ParentClientNotFound()
+        elif item.region_id is not None and item.region_id not in region_ids:
+            error = RegionNotFound()
+        else:
+            taken_names.add(item.name)
+            if item.inn:
+                taken_inns.add(item.inn)
+        errors.append(error)
+    return errors
+
+
+def _client_values(item: ClientCreate) -> dict:
+    """Колонки новой строки clients из тела создания."""
+    return {
+        "client_id": uuid.uuid4(),
+        "name": item.name,
+        "full_name": item.full_name,
+        "party_type": item.party_type,
+        "inn": item.inn,
+        "region_id": item.region_id,
+        "parent_id": item.parent_id,
+    }
+
+
+def _filter_conditions(params: ClientFilter) -> list[ColumnElement[bool]]:
+    """Условия фильтров клиентов (query, parent_id, ancestor_id, region_id, party_type)."""
+    conditions = []
     if params.query:
-        search = f"%{params.query}%"
-        q = q.filter(
-            or_(
-                ClientModel.name.ilike(search),
-                ClientModel.full_name.ilike(search),
-                ClientModel.inn.ilike(search),
-            )
-        )
+        conditions.append(search_condition(params.query))
     if params.parent_id is not None:
-        q = q.filter(ClientModel.parent_id == params.parent_id)
+        conditions.append(ClientModel.parent_id == params.parent_id)
+    if params.ancestor_id is not None:
+        group = hierarchy.descendants(params.ancestor_id)
+        conditions.append(ClientModel.client_id.in_(select(group.c.client_id)))
     if params.region_id is not None:
-        q = q.filter(ClientModel.region_id == params.region_id)
+        conditions.append(ClientModel.region_id == params.region_id)
     if params.party_type is not None:
-        q = q.filter(ClientModel.party_type == params.party_type)
-    total = q.count()
-    order_col = getattr(ClientModel, params.sort_by.value, ClientModel.created_at)
-    if params.sort_order == SortOrder.DESC:
-        order_col = order_col.desc()
+        conditions.append(ClientModel.party_type == params.party_type)
+    return conditions
+
+
+def _selection_condition(body: ClientSelection) -> ColumnElement[bool]:
+    """
+    Условие WHERE массовой операции: по списку clientIds или по фильтру.
+    Фильтр без условий — ошибка, а не UPDATE / DELETE всей таблицы: пустой filter отсекает
+    и схема (ClientSelection), здесь — на случай значения, которое _filter_conditions пропустит.
+    """
+    if body.client_ids is not None:
+        return ClientModel.client_id.in_(body.client_ids)
+    conditions = _filter_conditions(body.filter)
+    if not conditions:
+        raise EmptyClientFilter()
+    return and_(*conditions)
+
+
+def _outside_selection(condition: ColumnElement[bool]) -> ColumnElement[bool]:
+    """
+    Клиент не входит в выборку. Через client_id NOT IN, а не NOT (condition): при NULL
+    в колонке фильтра (region_id, parent_id) отрицание тоже дало бы NULL и потеряло строку.
+    correlate(None): подзапрос читает clients заново, а не строку внешнего запроса.
+    """
+    return ClientModel.client_id.not_in(select(ClientModel.client_id).where(condition).correlate(None))
+
+
+def _update_values(body: ClientUpdate) -> dict:
+    """Переданные поля ClientUpdate значениями Python (model_dump отдал бы enum строкой API)."""
+    return {name: getattr(body, name) for name in body.model_fields_set}
+
+
+def _order_column(sort_by: ClientSortBy) -> Column:
+    """Колонка таблицы clients для сортировки по sort_by."""
+    return ClientModel.__table__.c.get(sort_by.value, ClientModel.__table__.c.created_at)
+
+
+def _order_by(sort_by: ClientSortBy, sort_order: SortOrder) -> tuple[ColumnElement, ColumnElement]:
+    """ORDER BY списка клиентов: (sort_by, client_id) — порядок однозначен и при равных значениях."""
+    order_col = _order_column(sort_by)
+    id_col = ClientModel.__table__.c.client_id
+    if sort_order == SortOrder.DESC:
+        return order_col.desc(), id_col.desc()
+    return order_col.asc(), id_col.asc()
+
+
+def _filter_key(params: ClientListQuery) -> tuple:
+    """Нормализованный набор фильтров — ключ кеша total (вместе с версией данных)."""
+    return (params.query or None, params.parent_id, params.ancestor_id, params.region_id, params.party_type)
+
+
+def _list_key(params: ClientListQuery, media_type: str = JSON_MEDIA_TYPE) -> tuple:
+    """Формат и нормализованные параметры списка — ключ кеша ответов (пустой query — как без него)."""
+    return media_type, *{**params.model_dump(), "query": params.query or None}.values()
+
+
+def _clients_changed() -> None:
+    """Сброс производных данных по клиентам после записи (create/update/delete)."""
+    _count_cache.clear()
+    _clients_version.bump()
+    _list_cache.clear()
+
+
+def list_clients_steps(params: ClientListQuery, media_type: str) -> Generator[Select, Sequence[Row], Response]:
+    """
+    Логика GET /api/clients без ввода-вывода: запросы к БД отдаются через yield, их строки
+    приходят обратно (send), ответ — значение генератора. Одну и ту же логику выполняют
+    синхронный роут (_run_steps, Session) и асинхронный (src/routers/async_routes.py).
+    Ответ из кеша готов без единого запроса — соединение из пула тогда не берётся.
+    """
+    version = _clients_version.value
+    cache_key = (version, _list_key(params, media_type))
+    cached = _list_cache.get(cache_key)
+    if cached is not None:
+        return Response(cached, media_type=media_type, headers={"Vary": "Accept"})
+
+    fields = params.fields or CLIENT_FIELDS
+    columns = _client_columns(fields)
+    conditions = _filter_conditions(params)
+    count = select(func.count()).select_from(ClientModel.__table__).where(*conditions)
+
+    filters = _filter_key(params)
+    key = (version, filters)
+    total = _count_cache.get(key) if params.include_total else None
+    if params.include_total and total is None and (params.cursor or all(value is None for value in filters)):
+        total = (yield count)[0][0]
+        _count_cache.set(key, total)
+    count_in_page = params.include_total and total is None
+
+    order_col = _order_column(params.sort_by)
+    id_col = ClientModel.__table__.c.client_id
+    page = select(*columns).where(*conditions).order_by(*_order_by(params.sort_by, params.sort_order))
+
+    if params.cursor:
+        value, last_id = decode_cursor(params.cursor, params.sort_by, params.sort_order)
+        page = page.where(keyset_condition(order_col, id_col, params.sort_order, value, last_id))
     else:
-        order_col = order_col.asc()
-    items = q.order_by(order_col).offset(params.offset).limit(params.limit).all()
-    return ClientsResponse(
-        items=[Client.model_validate(c) for c in items],
+        page = page.offset(params.offset)
+
+    page = page.add_columns(raw_key(order_col).label("sort_key"), raw_key(id_col).label("client_key"))
+    if count_in_page:
+        page = page.add_columns(func.count().over().label("total"))
+    # limit + 1: лишняя строка только сообщает, есть ли следующая страница
+    rows = yield page.limit(params.limit + 1)
+    if count_in_page:
+        if rows:
+            total = rows[0][-1]
+        else:
+            # Страница за концом выборки: окну не на чем посчитать
+            total = 0 if params.offset == 0 else (yield count)[0][0]
+        _count_cache.set(key, total)
+
+    has_more = len(rows) > params.limit
+    rows = rows[: params.limit]
+    next_cursor = None
+    if has_more:
+        key_start = len(columns)
+        sort_value, client_key = rows[-1][key_start : key_start + 2]
+        next_cursor = encode_cursor(params.sort_by, params.sort_order, sort_value, client_key)
+    response = _list_response(
+        ClientsResponse,
+        fields,
+        rows,
+        media_type,
         total=total,
+        next_cursor=next_cursor,
+        has_more=has_more,
     )
+    _list_cache.set(cache_key, response.body)
+    return response
+
 
+def _run_steps(steps: Generator[Select, Sequence[Row], Response], db: Session) -> Response:
+    """Выполнить шаги list_clients_steps синхронной сессией."""
+    try:
+        statement = next(steps)
+        while True:
+            statement = steps.send(db.execute(statement).all())
+    except StopIteration as stop:
+        return stop.value
 
-@router.get("/parents", response_model=ClientParentsResponse)
-def list_parent_clients(db: Session = Depends(get_db)) -> ClientParentsResponse:
+
+@router.get("", response_model=ClientsResponse)
+def list_clients(
+    params: Annotated[ClientListQuery, Query()],
+    db: Session = Depends(get_read_db),
+    accept: Annotated[str | None, Header()] = None,
+) -> Response:
+    """
+    Список клиентов с фильтрами, пагинацией и сортировкой.
+
+    Два режима пагинации: offset (limit/offset) и keyset (cursor из nextCursor).
+    Порядок всегда (sort_by, client_id), поэтому курсор однозначен и при равных значениях.
+
+    total берётся из кеша по набору фильтров; при промахе в режиме offset он считается
+    в том же запросе, что и страница (COUNT(*) OVER ()). Отдельный count остаётся для
+    режима cursor (окно после условия курсора посчитало бы только оставшиеся строки)
+    и для списка без фильтров: count(*) по таблице идёт по узкому покрывающему индексу,
+    а окно заставило бы прочитать и отсортировать все строки целиком.
+
+    Строки читаются кортежами колонок и сериализуются напрямую (_list_response): по Accept —
+    JSON объектами, колоночный JSON или MessagePack. fields= сужает и SELECT, и ответ.
+
+    Готовое тело кешируется (_list_cache) по версии данных и параметрам, total (_count_cache) —
+    по версии и фильтрам. Версия берётся до чтения: если запись прошла, пока страница читалась,
+    тело и total лягут под старой версией и больше не будут найдены.
+    """
+    return _run_steps(list_clients_steps(params, negotiate(accept)), db)
+
+
+def _prefix_condition(column: Column, prefix: str) -> ColumnElement[bool]:
+    """
+    Название начинается с prefix без учёта регистра, в том числе для кириллицы: сравнение
+    с unicode_lower(название) (src/search.py), а не перебор вариантов заглавных букв.
+    Головные клиенты читаются по ix_clients_parent_id_name уже в порядке имени, так что
+    с limit проход останавливается на limit-м совпадении.
+    """
+    return func.unicode_lower(column).startswith(prefix.lower(), autoescape=True)
+
+
+@router.get("/parents", response_model=ClientParentsResponse | ClientOptionsResponse)
+def list_parent_clients(
+    params: Annotated[ClientParentsQuery, Query()],
+    if_none_match: Annotated[str | None, Header()] = None,
+    db: Session = Depends(get_read_db),
+    accept: Annotated[str | None, Header()] = None,
+) -> Response:
     """
     Список головных (root) клиентов для селекта «Родительский клиент».
 
     Возвращаются клиенты без parent_id, отсортированные по имени.
+    compact=true — только clientId и name; fields= — любой набор полей Client (важнее compact);
+    query — поиск по началу названия; limit — для typeahead.
+    ETag — версия данных клиентов из БД (src/data_version.py), общая для всех процессов:
+    пока записей не было, If-None-Match даёт 304 после чтения одной строки, без запроса к clients.
+    Формат — по Accept, как у списка (compact в колоночном виде — columns clientId и name).
     Важно: роут объявлен ДО /{client_id}, иначе /parents будет матчиться как path-параметр.
     """
-    q = db.query(ClientModel).filter(ClientModel.parent_id.is_(None))
-    items = q.order_by(ClientModel.name.asc()).all()
-    return ClientParentsResponse(items=[Client.model_validate(c) for c in items], total=len(items))
+    media_type = negotiate(accept)
+    etag = data_version_etag(db, "parents", media_type, params.query, params.limit, params.compact, params.fields)
+    headers = {"ETag": etag, "Cache-Control": PARENTS_CACHE_CONTROL}
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, PARENTS_CACHE_CONTROL)
+
+    compact = params.compact and not params.fields
+    fields = ("client_id", "name") if compact else params.fields or CLIENT_FIELDS
+    q = db.query(*_client_columns(fields)).filter(ClientModel.parent_id.is_(None))
+    if params.query:
+        q = q.filter(_prefix_condition(ClientModel.name, params.query))
+    q = q.order_by(ClientModel.name.asc(), ClientModel.client_id.asc())
+    if params.limit is not None:
+        q = q.limit(params.limit)
+    rows = q.all()
+    if compact and media_type == JSON_MEDIA_TYPE:
+        body = ClientOptionsResponse.model_construct(
+            items=[ClientOption.model_construct(client_id=client_id, name=name) for client_id, name in rows],
+            total=len(rows),
+        )
+        return _json_response(body, headers={"Vary": "Accept", **headers})
+    return _list_response(ClientParentsResponse, fields, rows, media_type, headers, total=len(rows))
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_clients(
+    params: Annotated[ClientExportQuery, Query()],
+    accept: Annotated[str | None, Header()] = None,
+) -> StreamingResponse:
+    """
+    Выгрузка всех клиентов по фильтрам и сортировке списка — потоком NDJSON или CSV.
+    Без format= колоночный JSON или MessagePack можно запросить заголовком Accept
+    (export_row_chunks); format= важнее Accept.
+
+    Без пагинации и total: строки читаются пачками и отдаются по мере чтения,
+    память не растёт с размером выборки. Поля — как в Client (camelCase).
+    Роут объявлен ДО /{client_id}, иначе /export будет матчиться как path-параметр.
+    """
+    statement = (
+        select(*_client_columns(CLIENT_FIELDS))
+        .where(*_filter_conditions(params))
+        .order_by(*_order_by(params.sort_by, params.sort_order))
+    )
+    media_type = negotiate(accept)
+    if params.format is None and media_type != JSON_MEDIA_TYPE:
+        return StreamingResponse(
+            export_row_chunks(statement, media_type),
+            media_type=media_type,
+            headers={
+                "Content-Disposition": f'attachment; filename="clients.{ROW_EXTENSIONS[media_type]}"',
+                "Vary": "Accept",
+            },
+        )
+    export_format = params.format or ExportFormat.NDJSON
+    return StreamingResponse(
+        export_chunks(statement, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="clients.{export_format.value}"'},
+    )
+
+
+def client_statement(client_id: uuid.UUID, fields: tuple[str, ...]) -> Select:
+    """
+    SELECT для GET /api/clients/{client_id}: колонки fields, затем версия для ETag —
+    updated_at в виде из БД и children_count (_clients_from_rows берёт только колонки fields).
+    """
+    return select(
+        *_client_columns(fields),
+        raw_key(ClientModel.updated_at).label("version"),
+        ClientModel.children_count.label("version_children"),
+    ).where(ClientModel.client_id == client_id)
+
+
+def client_response(
+    client_id: uuid.UUID,
+    fields: tuple[str, ...],
+    row: Row | None,
+    if_none_match: str | None,
+) -> Response:
+    """Ответ GET /api/clients/{client_id} по строке client_statement (общий у sync и async роутов)."""
+    if not row:
+        raise ClientNotFound()
+    etag = _client_etag(client_id, row[-2], row[-1])
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, CLIENT_CACHE_CONTROL)
+    return _json_response(
+        _clients_from_rows([row], fields)[0],
+        headers={"ETag": etag, "Cache-Control": CLIENT_CACHE_CONTROL},
+    )
 
 
 @router.get("/{client_id}", response_model=Client)
-def get_client(client_id: uuid.UUID, db: Session = Depends(get_db)) -> Client:
-    """Один клиент по client_id."""
-    client = db.query(ClientModel).filter(ClientModel.client_id == client_id).first()
-    if not client:
+def get_client(
+    client_id: uuid.UUID,
+    params: Annotated[ClientGetQuery, Query()],
+    db: Session = Depends(get_read_db),
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    """
+    Один клиент по client_id; fields= — только перечисленные поля.
+    ETag — версия клиента (_client_etag): при совпадении с If-None-Match — 304 без сборки
+    и сериализации ответа; тот же ETag принимают PATCH и DELETE в If-Match.
+    """
+    fields = params.fields or CLIENT_FIELDS
+    row = db.execute(client_statement(client_id, fields)).first()
+    return client_response(client_id, fields, row, if_none_match)
+
+
+@router.get("/{client_id}/descendants", response_model=ClientTreeResponse)
+def list_client_descendants(
+    client_id: uuid.UUID,
+    params: Annotated[ClientTreeQuery, Query()],
+    db: Session = Depends(get_read_db),
+) -> Response:
+    """
+    Все потомки клиента (его группа) одним рекурсивным запросом: по уровням, внутри уровня по имени.
+    max_depth — сколько уровней вниз; fields= — только перечисленные поля.
+    """
+    fields = params.fields or CLIENT_FIELDS
+    tree = hierarchy.descendants(client_id, params.max_depth)
+    rows = (
+        db.query(*_client_columns(fields))
+        .select_from(ClientModel.__table__)
+        .join(tree, tree.c.client_id == ClientModel.client_id)
+        .order_by(tree.c.depth, ClientModel.name, ClientModel.client_id)
+        .all()
+    )
+    if not rows and db.query(ClientModel.client_id).filter(ClientModel.client_id == client_id).first() is None:
+        raise ClientNotFound()
+    return _json_list_response(ClientTreeResponse, fields, rows, total=len(rows))
+
+
+@router.get("/{client_id}/ancestors", response_model=ClientTreeResponse)
+def list_client_ancestors(
+    client_id: uuid.UUID,
+    params: Annotated[ClientTreeQuery, Query()],
+    db: Session = Depends(get_read_db),
+) -> Response:
+    """
+    Цепочка предков клиента от родителя до головного — один запрос по первичному ключу на уровень.
+    max_depth — сколько уровней вверх; fields= — только перечисленные поля.
+    """
+    fields = params.fields or CLIENT_FIELDS
+    path = hierarchy.ancestors(client_id, params.max_depth)
+    # depth последней колонкой: _json_list_response берёт только колонки fields
+    rows = (
+        db.query(*_client_columns(fields), path.c.depth)
+        .select_from(ClientModel.__table__)
+        .join(path, path.c.client_id == ClientModel.client_id)
+        .order_by(path.c.depth)
+        .all()
+    )
+    # Первая строка (depth 0) — сам клиент; её нет — нет клиента
+    if not rows:
         raise ClientNotFound()
-    return Client.model_validate(client)
+    return _json_list_response(ClientTreeResponse, fields, rows[1:], total=len(rows) - 1)
 
 
 @router.post("", response_model=Client, status_code=201)
 def create_client(body: ClientCreate, db: Session = Depends(get_db)) -> Client:
-    """Создание клиента."""
-    _ensure_client_unique_on_create(body, db)
+    """
+    Создание клиента. Уникальность имени и ИНН — на уникальных индексах (_unique_violations):
+    запись — один INSERT, created_at/updated_at возвращаются им же (eager_defaults, RETURNING).
+    """
     _ensure_parent_exists(body.parent_id, db)
-    client = ClientModel(
-        name=body.name,
-        full_name=body.full_name,
-        party_type=body.party_type,
-        inn=body.inn,
-        region_id=body.region_id,
-        parent_id=body.parent_id,
-    )
+    _ensure_region_exists(body.region_id, db)
+    client = ClientModel(**_client_values(body))
     db.add(client)
+    with _unique_violations(db):
+        db.flush()
+    result = Client.model_validate(client)
     db.commit()
-    db.refresh(client)
-    return Client.model_validate(client)
+    _clients_changed()
+    return result
+
+
+@router.post("/batch", response_model=ClientBatchResponse)
+def create_clients_batch(body: ClientBatchCreate, db: Session = Depends(get_db)) -> ClientBatchResponse:
+    """
+    Пакетное создание клиентов (интеграции).
+
+    Уникальность имени и ИНН, существование родителей и регионов проверяются несколькими
+    запросами IN на весь пакет (_batch_errors), а не по запросу на элемент.
+    Прошедшие проверку элементы вставляются в одной транзакции; ответ — результат
+    или ErrorResponse по каждому элементу в порядке запроса.
+    """
+    results: list[ClientBatchItemResult] = []
+    created: list[tuple[ClientBatchItemResult, ClientModel]] = []
+    for index, (item, error) in enumerate(zip(body.items, _batch_errors(body.items, db))):
+        result = ClientBatchItemResult(index=index)
+        results.append(result)
+        if error is not None:
+            result.error = ErrorResponse(error_name=error.error_name, message=error.message)
+        else:
+            created.append((result, ClientModel(**_client_values(item))))
+
+    if created:
+        created_ids = [client.client_id for _, client in created]
+        db.add_all(client for _, client in created)
+        with _unique_violations(db):
+            db.commit()
+        _clients_changed()
+        # Один SELECT IN вместо refresh каждого объекта после commit
+        db.query(ClientModel).filter(ClientModel.client_id.in_(created_ids)).all()
+        for result, client in created:
+            result.client = Client.model_validate(client)
+    return ClientBatchResponse(items=results, created=len(created), failed=len(results) - len(created))
+
+
+def _import_chunk(records: list[tuple[int, bytes]], parser: RecordParser, report: ClientImportReport) -> None:
+    """
+    Одна пачка загрузки: разбор, проверки _batch_errors на всю пачку и вставка
+    одним executemany (Core insert, без ORM-объектов) в своей транзакции.
+    """
+    parsed = parser(records)
+    valid = [(line, item) for line, item in parsed if isinstance(item, ClientCreate)]
+    failed = [(line, item) for line, item in parsed if isinstance(item, ErrorResponse)]
+    rows = []
+    with SessionLocal() as db:
+        for (line, item), error in zip(valid, _batch_errors([item for _, item in valid], db)):
+            if error is None:
+                rows.append(_client_values(item))
+            else:
+                failed.append((line, ErrorResponse(error_name=error.error_name, message=error.message)))
+        if rows:
+            with _unique_violations(db):
+                db.execute(insert(ClientModel.__table__), rows)
+                db.commit()
+            _clients_changed()
+
+    report.processed += len(parsed)
+    report.created += len(rows)
+    report.failed += len(failed)
+    report.chunks += 1
+    for line, error in sorted(failed, key=lambda f: f[0]):
+        if len(report.errors) >= CLIENT_IMPORT_MAX_ERRORS:
+            report.errors_truncated = True
+            break
+        report.errors.append(ClientImportLineError(line=line, error=error))
+
+
+@router.post(
+    "/import",
+    response_model=ClientImportReport,
+    # Тело читается потоком, без параметра эндпоинта — описываем его для Swagger вручную
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {media_type: {"schema": {"type": "string", "format": "binary"}} for media_type in MEDIA_TYPES.values()},
+        },
+    },
+)
+async def import_clients(request: Request, params: Annotated[ClientImportQuery, Query()]) -> ClientImportReport:
+    """
+    Загрузка клиентов из файла в теле запроса: NDJSON (объект ClientCreate на строку)
+    или CSV с заголовком (format=csv). Тело — сам файл, не multipart.
+
+    Файл читается потоком и обрабатывается пачками по CLIENT_IMPORT_CHUNK_SIZE записей:
+    проверки как у POST /batch, каждая пачка — своя транзакция, поэтому уже записанные
+    пачки остаются при ошибке в следующих. Ответ — итог и ошибки по номерам строк.
+    """
+    report = ClientImportReport(processed=0, created=0, failed=0, chunks=0)
+    parser = RecordParser(params.format)
+    async for records in record_chunks(request.stream(), params.format, CLIENT_IMPORT_CHUNK_SIZE):
+        await run_in_threadpool(_import_chunk, records, parser, report)
+    return report
 
 
 @router.patch("/{client_id}", response_model=Client)
@@ -133,26 +813,95 @@ def update_client(
     client_id: uuid.UUID,
     body: ClientUpdate,
     db: Session = Depends(get_db),
-) -> Client:
-    """Частичное обновление клиента."""
-    client = db.query(ClientModel).filter(ClientModel.client_id == client_id).first()
-    if not client:
-        raise ClientNotFound()
-    data = body.model_dump(exclude_unset=True)
-    _ensure_client_unique_on_update(client_id, data, db)
+    if_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    """
+    Частичное обновление клиента. Родителем нельзя назначить самого клиента или его потомка.
+
+    Запись — один UPDATE … RETURNING; If-Match (ETag из GET) — условие в его WHERE:
+    клиент изменён с тех пор — строк не затронуто, 412. Ответ несёт ETag новой версии.
+    """
+    data = _update_values(body)
     _ensure_parent_exists(data.get("parent_id"), db)
-    for key, value in data.items():
-        setattr(client, key, value)
+    _ensure_no_cycle(data.get("parent_id"), ClientModel.client_id == client_id, db)
+    _ensure_region_exists(data.get("region_id"), db)
+    condition = and_(ClientModel.client_id == client_id, _if_match_condition(if_match, client_id))
+    columns = [*_client_columns(CLIENT_FIELDS), raw_key(ClientModel.updated_at)]
+    if data:
+        statement = update(ClientModel.__table__).where(condition).values(data).returning(*columns)
+    else:
+        statement = select(*columns).where(condition)
+    with _unique_violations(db):
+        row = db.execute(statement).first()
+    if row is None:
+        db.rollback()
+        raise _missing_or_changed(client_id, db)
     db.commit()
-    db.refresh(client)
-    return Client.model_validate(client)
+    if data:
+        _clients_changed()
+    result = _clients_from_rows([row])[0]
+    return _json_response(result, headers={"ETag": _client_etag(client_id, row[-1], result.children_count)})
 
 
 @router.delete("/{client_id}", status_code=204)
-def delete_client(client_id: uuid.UUID, db: Session = Depends(get_db)) -> None:
-    """Удаление клиента."""
-    client = db.query(ClientModel).filter(ClientModel.client_id == client_id).first()
-    if not client:
-        raise ClientNotFound()
-    db.delete(client)
+def delete_client(
+    client_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    if_match: Annotated[str | None, Header()] = None,
+) -> None:
+    """
+    Удаление клиента. Дочерние клиенты становятся головными (parent_id = null).
+    If-Match — условие в WHERE самого DELETE: клиент изменён с тех пор — откат, 412.
+    """
+    # foreign_keys=ON: ссылку детей на удаляемого клиента нужно снять в той же транзакции
+    db.query(ClientModel).filter(ClientModel.parent_id == client_id).update(
+        {ClientModel.parent_id: None},
+        synchronize_session=False,
+    )
+    condition = and_(ClientModel.client_id == client_id, _if_match_condition(if_match, client_id))
+    if not db.query(ClientModel).filter(condition).delete(synchronize_session=False):
+        db.rollback()
+        raise _missing_or_changed(client_id, db)
+    db.commit()
+    _clients_changed()
+
+
+@router.post("/bulk-update", response_model=ClientBulkResult)
+def bulk_update_clients(body: ClientBulkUpdate, db: Session = Depends(get_db)) -> ClientBulkResult:
+    """
+    Массовое обновление: изменения changes для clientIds или для filter — одним UPDATE в одной транзакции.
+
+    Проверки те же, что у PATCH (родитель, цикл, регион; уникальность — индексами): имя или ИНН,
+    присвоенные сразу нескольким клиентам или занятые другим, откатывают весь UPDATE.
+    affected — число обновлённых строк.
+    """
+    data = _update_values(body.changes)
+    if not data:
+        return ClientBulkResult(affected=0)
+    condition = _selection_condition(body)
+    _ensure_parent_exists(data.get("parent_id"), db)
+    _ensure_no_cycle(data.get("parent_id"), condition, db)
+    _ensure_region_exists(data.get("region_id"), db)
+    with _unique_violations(db):
+        affected = db.query(ClientModel).filter(condition).update(data, synchronize_session=False)
+        db.commit()
+    _clients_changed()
+    return ClientBulkResult(affected=affected)
+
+
+@router.post("/bulk-delete", response_model=ClientBulkResult)
+def bulk_delete_clients(body: ClientBulkDelete, db: Session = Depends(get_db)) -> ClientBulkResult:
+    """
+    Массовое удаление clientIds или клиентов по filter — одним DELETE в одной транзакции.
+    Как и в DELETE /{client_id}, дочерние клиенты, которые сами не удаляются, становятся головными.
+    """
+    condition = _selection_condition(body)
+    targets = select(ClientModel.client_id).where(condition).correlate(None)
+    db.query(ClientModel).filter(ClientModel.parent_id.in_(targets), _outside_selection(condition)).update(
+        {ClientModel.parent_id: None},
+        synchronize_session=False,
+    )
+    affected = db.query(ClientModel).filter(condition).delete(synchronize_session=False)
     db.commit()
+    _clients_changed()
+    return ClientBulkResult(affected=affected)
@@ -0,0 +1,40 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Query
+
+from src import slow_queries
+from src.config import SLOW_QUERY_MS
+from src.routers import clients
+from src.schemas.debug import ResponseCacheStats, SlowQueriesQuery, SlowQueriesResponse, SlowQuery
+
+router = APIRouter()
+
+
+@router.get("/slow-queries", response_model=SlowQueriesResponse)
+def list_slow_queries(params: Annotated[SlowQueriesQuery, Query()]) -> SlowQueriesResponse:
+    """
+    Самые дорогие формы SQL-запросов этого процесса (журнал src/slow_queries.py, порог SLOW_QUERY_MS):
+    число выполнений дольше порога, суммарное и наибольшее время, роуты, план EXPLAIN QUERY PLAN.
+    """
+    return SlowQueriesResponse(
+        threshold_ms=SLOW_QUERY_MS,
+        items=[
+            SlowQuery(
+                sql=entry.sql,
+                count=entry.count,
+                total_ms=round(entry.total_ms, 2),
+                max_ms=round(entry.max_ms, 2),
+                avg_ms=round(entry.total_ms / entry.count, 2),
+                routes=entry.routes,
+                last_params=entry.last_params,
+                plan=entry.plan,
+            )
+            for entry in slow_queries.top(params.limit)
+        ],
+    )
+
+
+@router.get("/list-cache", response_model=ResponseCacheStats)
+def list_cache_stats() -> ResponseCacheStats:
+    """Кеш ответов GET /api/clients: записей, байт, попаданий и промахов (то же — в /metrics)."""
+    return ResponseCacheStats(**clients.list_cache_stats())
@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Response
+from fastapi.concurrency import run_in_threadpool
+
+from src.metrics import CONTENT_TYPE, process_snapshots, registry, render
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """
+    Метрики в текстовом формате Prometheus (src/metrics.py); при METRICS_DIR — сумма по всем воркерам.
+    Свой снимок берётся в event loop, файлы воркеров читаются в потоке.
+    """
+    snapshots = await run_in_threadpool(process_snapshots, registry.snapshot())
+    return Response(render(snapshots, registry.buckets), media_type=CONTENT_TYPE)
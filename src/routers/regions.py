@@ -1,15 +1,81 @@
-from fastapi import APIRouter, Depends
+import threading
+
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
-from src.database import get_db
+from src.config import REGIONS_CACHE_CONTROL
+from src.database import SessionLocal, SessionRoute, get_read_db
+from src.http_cache import etag_matches, make_etag, not_modified
 from src.models.region_model import RegionModel
 from src.schemas.region import Region, RegionsResponse
 
-router = APIRouter()
+router = APIRouter(route_class=SessionRoute)
+
+
+class _RegionsPayload:
+    """
+    Готовый JSON ответа GET /api/regions и его ETag в памяти процесса.
+
+    Справочник на время работы не меняется: тело собирается один раз при старте
+    (или при первом запросе после сброса) и отдаётся как есть, без БД и pydantic.
+    """
+
+    def __init__(self) -> None:
+        self._body: bytes | None = None
+        self._etag = ""
+        self._lock = threading.Lock()
+
+    def get(self, db: Session) -> tuple[bytes, str]:
+        body, etag = self._body, self._etag
+        if body is not None:
+            return body, etag
+        with self._lock:
+            if self._body is None:
+                regions = db.query(RegionModel).order_by(RegionModel.name).all()
+                response = RegionsResponse(items=[Region.model_validate(r) for r in regions])
+                self._body = response.model_dump_json(by_alias=True).encode("utf-8")
+                self._etag = make_etag(self._body)
+            return self._body, self._etag
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._body = None
+
+
+_payload = _RegionsPayload()
+
+
+def load_regions_payload() -> None:
+    """Прогрев кеша регионов при старте приложения."""
+    db = SessionLocal()
+    try:
+        _payload.get(db)
+    finally:
+        db.close()
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_regions_written(session: Session, _flush_context) -> None:
+    """Запись регионов в сессии — отметка; сам сброс после commit, чтобы не закешировать старые данные."""
+    if any(isinstance(obj, RegionModel) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info["regions_written"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_regions(session: Session) -> None:
+    if session.info.pop("regions_written", False):
+        _payload.invalidate()
 
 
 @router.get("", response_model=RegionsResponse)
-def list_regions(db: Session = Depends(get_db)) -> RegionsResponse:
-    """Список регионов для селекта Регион."""
-    regions = db.query(RegionModel).order_by(RegionModel.name).all()
-    return RegionsResponse(items=[Region.model_validate(r) for r in regions])
+def list_regions(request: Request, db: Session = Depends(get_read_db)) -> Response:
+    """Список регионов для селекта Регион. Поддерживает If-None-Match → 304."""
+    body, etag = _payload.get(db)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag, REGIONS_CACHE_CONTROL)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": REGIONS_CACHE_CONTROL},
+    )
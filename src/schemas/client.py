@@ -1,25 +1,128 @@
+import functools
 import uuid
 from datetime import datetime
+from typing import Annotated
 
-from pydantic import Field
+from pydantic import BeforeValidator, ConfigDict, Field, TypeAdapter, create_model, field_validator, model_validator
+from typing_extensions import TypedDict
 
-from src.schemas.base import ResponseSchemaBase, SchemaBase
+from src.config import CLIENT_BATCH_MAX_SIZE, CLIENT_BULK_MAX_IDS, CLIENT_HIERARCHY_MAX_DEPTH
+from src.schemas.base import ResponseSchemaBase, SchemaBase, to_camel
+from src.schemas.error import ErrorResponse
 from src.types.client_sort_by import ClientSortBy
+from src.types.export_format import ExportFormat
 from src.types.party_type import PartyType
 from src.types.sort_order import SortOrder
 
 
-class ClientListQuery(SchemaBase):
-    """Query-параметры GET /api/clients — фильтры, пагинация, сортировка."""
+def _parse_client_fields(value: object) -> tuple[str, ...] | None:
+    """
+    fields=clientId,name (или fields=clientId&fields=name) → имена полей Client в порядке схемы.
+    Принимаются только имена из API (camelCase); пусто — все поля.
+    """
+    if value is None:
+        return None
+    parts = value if isinstance(value, (list, tuple)) else [value]
+    names = {name.strip() for part in parts for name in str(part).split(",") if name.strip()}
+    if not names:
+        return None
+    by_alias = {field.alias: name for name, field in Client.model_fields.items()}
+    unknown = names - by_alias.keys()
+    if unknown:
+        raise ValueError(f"Неизвестные поля: {', '.join(sorted(unknown))}. Допустимые: {', '.join(by_alias)}")
+    return tuple(name for alias, name in by_alias.items() if alias in names)
+
+
+def _blank_to_none(value: object) -> object:
+    """Пустая строка или одни пробелы — условия нет (None), а не фильтр «всё подходит»."""
+    if isinstance(value, str) and not value.strip():
+        return None
+    return value
+
+
+ClientFields = Annotated[
+    tuple[str, ...] | None,
+    BeforeValidator(_parse_client_fields),
+    Field(default=None, description="Поля Client в ответе через запятую (camelCase), например clientId,name. По умолчанию — все"),
+]
+
 
-    query: str | None = Field(default=None, description="Поиск по имени, ИНН, full_name")
+class ClientFilter(SchemaBase):
+    """Фильтры клиентов — общие для GET /api/clients и массовых операций."""
+
+    query: Annotated[str | None, BeforeValidator(_blank_to_none)] = Field(
+        default=None,
+        description="Поиск подстроки в имени, ИНН, full_name без учёта регистра (от 3 символов — по FTS-индексу)",
+    )
     parent_id: uuid.UUID | None = Field(default=None)
+    ancestor_id: uuid.UUID | None = Field(
+        default=None,
+        description="Группа клиента: все его потомки на любой глубине (без него самого)",
+    )
     region_id: uuid.UUID | None = Field(default=None)
     party_type: PartyType | None = Field(default=None)
+
+
+class ClientListQuery(ClientFilter):
+    """Query-параметры GET /api/clients — фильтры, пагинация, сортировка."""
+
     limit: int = Field(default=20, ge=1, le=100)
     offset: int = Field(default=0, ge=0)
+    cursor: str | None = Field(
+        default=None,
+        description="Курсор из nextCursor предыдущей страницы (keyset). Если задан, offset игнорируется",
+    )
     sort_by: ClientSortBy = Field(default=ClientSortBy.CREATED_AT)
     sort_order: SortOrder = Field(default=SortOrder.DESC)
+    include_total: bool = Field(
+        default=True,
+        description="Считать total. Для бесконечной прокрутки достаточно hasMore — false экономит подсчёт",
+    )
+    fields: ClientFields
+
+
+class ClientExportQuery(ClientFilter):
+    """Query-параметры GET /api/clients/export — те же фильтры и сортировка, что у списка, без пагинации."""
+
+    sort_by: ClientSortBy = Field(default=ClientSortBy.CREATED_AT)
+    sort_order: SortOrder = Field(default=SortOrder.DESC)
+    format: ExportFormat | None = Field(
+        default=None,
+        description="ndjson — объект на строку, csv — с заголовком; по умолчанию — по Accept, иначе ndjson",
+    )
+
+
+class ClientImportQuery(SchemaBase):
+    """Query-параметры POST /api/clients/import."""
+
+    format: ExportFormat = Field(default=ExportFormat.NDJSON, description="Формат тела: ndjson или csv с заголовком")
+
+
+class ClientParentsQuery(SchemaBase):
+    """Query-параметры GET /api/clients/parents — селект «Родительский клиент»."""
+
+    query: str | None = Field(default=None, max_length=255, description="Начало названия без учёта регистра (typeahead)")
+    limit: int | None = Field(default=None, ge=1, le=1000, description="Сколько вариантов вернуть; по умолчанию все")
+    compact: bool = Field(default=False, description="Только clientId и name — для выпадающего списка")
+    fields: ClientFields
+
+
+class ClientTreeQuery(SchemaBase):
+    """Query-параметры GET /api/clients/{client_id}/descendants и /ancestors."""
+
+    max_depth: int | None = Field(
+        default=None,
+        ge=1,
+        le=CLIENT_HIERARCHY_MAX_DEPTH,
+        description="Сколько уровней обойти (1 — только дети / только родитель); по умолчанию все",
+    )
+    fields: ClientFields
+
+
+class ClientGetQuery(SchemaBase):
+    """Query-параметры GET /api/clients/{client_id}."""
+
+    fields: ClientFields
 
 
 class ClientCreate(SchemaBase):
@@ -33,6 +136,12 @@ class ClientCreate(SchemaBase):
     parent_id: uuid.UUID | None = None
 
 
+class ClientBatchCreate(SchemaBase):
+    """Body POST /api/clients/batch — пакетное создание клиентов."""
+
+    items: list[ClientCreate] = Field(..., min_length=1, max_length=CLIENT_BATCH_MAX_SIZE)
+
+
 class ClientUpdate(SchemaBase):
     """Body PATCH /api/clients/{client_id} — частичное обновление."""
 
@@ -43,6 +152,45 @@ class ClientUpdate(SchemaBase):
     region_id: uuid.UUID | None = None
     parent_id: uuid.UUID | None = None
 
+    @field_validator("name", "party_type")
+    @classmethod
+    def _not_null(cls, value):
+        # Поле можно не передавать, но не стереть: в БД name и party_type — NOT NULL
+        if value is None:
+            raise ValueError("Поле обязательно — null недопустим")
+        return value
+
+
+class ClientSelection(SchemaBase):
+    """Какие клиенты затрагивает массовая операция: явный список clientIds или фильтр."""
+
+    client_ids: list[uuid.UUID] | None = Field(default=None, min_length=1, max_length=CLIENT_BULK_MAX_IDS)
+    filter: ClientFilter | None = Field(default=None, description="Те же фильтры, что у GET /api/clients")
+
+    @model_validator(mode="after")
+    def _one_selector(self):
+        if (self.client_ids is None) == (self.filter is None):
+            raise ValueError("Нужно указать ровно одно из clientIds и filter")
+        if self.filter is not None and not self.filter.model_dump(exclude_none=True):
+            raise ValueError("Пустой filter затронул бы всех клиентов — укажите хотя бы одно условие")
+        return self
+
+
+class ClientBulkUpdate(ClientSelection):
+    """Body POST /api/clients/bulk-update — одинаковые изменения для набора клиентов."""
+
+    changes: ClientUpdate
+
+
+class ClientBulkDelete(ClientSelection):
+    """Body POST /api/clients/bulk-delete."""
+
+
+class ClientBulkResult(SchemaBase):
+    """Ответ массовой операции — сколько клиентов затронуто."""
+
+    affected: int
+
 
 class Client(ResponseSchemaBase):
     """Ответ GET по client_id и элемент списка GET /api/clients."""
@@ -56,13 +204,75 @@ class Client(ResponseSchemaBase):
     updated_at: datetime
     region_id: uuid.UUID | None
     parent_id: uuid.UUID | None
+    children_count: int = Field(description="Число прямых дочерних клиентов")
+
+
+CLIENT_FIELDS = tuple(Client.model_fields)
+
+
+@functools.cache
+def client_fields_model(fields: tuple[str, ...]) -> type[ResponseSchemaBase]:
+    """Схема Client только с полями fields (параметр fields=). Создаётся один раз на набор полей."""
+    if fields == CLIENT_FIELDS:
+        return Client
+    return create_model(
+        "Client_" + "_".join(fields),
+        __base__=ResponseSchemaBase,
+        **{name: (Client.model_fields[name].annotation, ...) for name in fields},
+    )
+
+
+@functools.cache
+def client_field_aliases(fields: tuple[str, ...]) -> tuple[str, ...]:
+    """Имена полей fields в API (camelCase) — columns колоночного ответа и заголовок CSV."""
+    return tuple(Client.model_fields[name].alias or name for name in fields)
+
+
+@functools.cache
+def client_row_type(fields: tuple[str, ...]) -> type[tuple]:
+    """Строка колоночного ответа: кортеж значений полей fields (типы — как в Client)."""
+    return tuple[tuple(Client.model_fields[name].annotation for name in fields)]
+
+
+@functools.cache
+def client_rows_model(envelope: type[SchemaBase], fields: tuple[str, ...]) -> type[SchemaBase]:
+    """
+    Колоночный вид ответа-списка envelope: вместо items — columns (имена полей) и rows
+    (строка — кортеж значений в порядке columns). Остальные поля envelope — как есть.
+    """
+    others = {name: (field.annotation, field) for name, field in envelope.model_fields.items() if name != "items"}
+    return create_model(
+        envelope.__name__ + "Rows_" + "_".join(fields),
+        __base__=SchemaBase,
+        columns=(tuple[str, ...], ...),
+        rows=(list[client_row_type(fields)], ...),
+        **others,
+    )
+
+
+@functools.cache
+def client_list_adapter(envelope: type[SchemaBase], fields: tuple[str, ...]) -> TypeAdapter:
+    """
+    Сериализатор ответа-списка envelope из словарей: items — dict поле → значение (полей fields),
+    остальные ключи — поля envelope. Байты те же, что у схемы envelope, но без объекта схемы
+    на строку (model_construct) — на страницах в сотню строк это основная часть времени ответа.
+    """
+    config = ConfigDict(alias_generator=to_camel)
+    item = TypedDict("Item_" + "_".join(fields), {name: Client.model_fields[name].annotation for name in fields})
+    item.__pydantic_config__ = config
+    others = {name: field.annotation for name, field in envelope.model_fields.items() if name != "items"}
+    body = TypedDict(envelope.__name__ + "Dict_" + "_".join(fields), {"items": list[item], **others})
+    body.__pydantic_config__ = config
+    return TypeAdapter(body)
 
 
 class ClientsResponse(SchemaBase):
-    """Ответ GET /api/clients — список с total."""
+    """Ответ GET /api/clients — список с total и курсором следующей страницы."""
 
     items: list[Client]
-    total: int
+    total: int | None = Field(description="Всего записей по фильтрам; null при includeTotal=false")
+    next_cursor: str | None = Field(default=None, description="Курсор следующей страницы, null — страниц больше нет")
+    has_more: bool = Field(default=False, description="Есть ли записи после текущей страницы")
 
 
 class ClientParentsResponse(SchemaBase):
@@ -70,3 +280,61 @@ class ClientParentsResponse(SchemaBase):
 
     items: list[Client]
     total: int
+
+
+class ClientTreeResponse(SchemaBase):
+    """
+    Ответ GET /api/clients/{client_id}/descendants и /ancestors. Потомки — по уровням
+    (дети, внуки, …), внутри уровня по имени; предки — от родителя к головному клиенту.
+    """
+
+    items: list[Client]
+    total: int
+
+
+class ClientOption(ResponseSchemaBase):
+    """Вариант селекта «Родительский клиент» (compact=true)."""
+
+    client_id: uuid.UUID
+    name: str
+
+
+class ClientOptionsResponse(SchemaBase):
+    """Ответ GET /api/clients/parents?compact=true — облегчённый список для селекта."""
+
+    items: list[ClientOption]
+    total: int
+
+
+class ClientBatchItemResult(SchemaBase):
+    """Результат по одному элементу пакета: созданный клиент или ошибка в едином формате."""
+
+    index: int = Field(..., description="Позиция элемента в items запроса")
+    client: Client | None = None
+    error: ErrorResponse | None = None
+
+
+class ClientBatchResponse(SchemaBase):
+    """Ответ POST /api/clients/batch — отчёт по каждому элементу в порядке запроса."""
+
+    items: list[ClientBatchItemResult]
+    created: int
+    failed: int
+
+
+class ClientImportLineError(SchemaBase):
+    """Ошибка одной записи загружаемого файла."""
+
+    line: int = Field(..., description="Номер строки файла, с которой начинается запись")
+    error: ErrorResponse
+
+
+class ClientImportReport(SchemaBase):
+    """Ответ POST /api/clients/import — итог загрузки."""
+
+    processed: int = Field(..., description="Сколько записей прочитано")
+    created: int
+    failed: int
+    chunks: int = Field(..., description="Сколько пачек (транзакций) записано")
+    errors: list[ClientImportLineError] = Field(default_factory=list)
+    errors_truncated: bool = Field(default=False, description="В errors не все ошибки — см. failed")
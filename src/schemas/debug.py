@@ -0,0 +1,39 @@
+from pydantic import Field
+
+from src.schemas.base import SchemaBase
+
+
+class SlowQueriesQuery(SchemaBase):
+    """Параметры GET /debug/slow-queries."""
+
+    limit: int = Field(default=20, ge=1, le=200, description="Сколько форм запросов вернуть")
+
+
+class SlowQuery(SchemaBase):
+    """Форма медленного SQL-запроса и накопленная по ней статистика."""
+
+    sql: str = Field(description="Текст SQL, списки плейсхолдеров свёрнуты")
+    count: int = Field(description="Сколько раз запрос был дольше порога")
+    total_ms: float
+    max_ms: float
+    avg_ms: float
+    routes: dict[str, int] = Field(description="Роуты, из которых выполнялся запрос, и сколько раз")
+    last_params: list = Field(description="Параметры последнего выполнения: строки заменены типом и длиной")
+    plan: list[str] = Field(description="EXPLAIN QUERY PLAN первого медленного выполнения")
+
+
+class SlowQueriesResponse(SchemaBase):
+    """Ответ GET /debug/slow-queries — формы запросов по убыванию суммарного времени."""
+
+    threshold_ms: float | None
+    items: list[SlowQuery]
+
+
+class ResponseCacheStats(SchemaBase):
+    """Ответ GET /debug/list-cache — состояние кеша ответов GET /api/clients этого процесса."""
+
+    entries: int
+    bytes: int = Field(description="Суммарный размер закешированных тел")
+    hits: int
+    misses: int
+    hit_rate: float = Field(description="Доля попаданий с начала работы процесса")
@@ -0,0 +1,118 @@
+"""Полнотекстовый поиск клиентов: FTS5-индекс clients_fts (tokenize=trigram) по name, full_name, inn.
+
+Индекс — external content поверх clients (данные не дублируются), синхронизация
+триггерами в SQLite, поэтому любая запись в clients (роуты, seed, ручной SQL)
+сразу попадает в поиск. trigram ищет подстроку без учёта регистра, в том числе
+для кириллицы («иванов» находит «Иванов»), но только от трёх символов — более
+короткие запросы идут перебором через LIKE по unicode_lower(...): встроенные
+lower() и LIKE в SQLite меняют регистр только у ASCII, и «ив» не нашёл бы «Иванов».
+Функцию unicode_lower регистрирует на каждом соединении register_functions.
+
+Пересборка индекса для существующей БД (например, после VACUUM, который может
+перенумеровать rowid): python -m src.search
+"""
+
+from sqlalchemy import Connection, bindparam, func, literal_column, or_, select, table, text
+from sqlalchemy.sql.elements import ColumnElement
+
+from src.models.client_model import ClientModel
+
+FTS_TABLE = "clients_fts"
+MIN_QUERY_LENGTH = 3
+
+_FTS_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "name, full_name, inn, content='clients', tokenize='trigram')"
+)
+
+_TRIGGERS_DDL = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON clients BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, full_name, inn)
+        VALUES (new.rowid, new.name, new.full_name, new.inn);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON clients BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, full_name, inn)
+        VALUES ('delete', old.rowid, old.name, old.full_name, old.inn);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF name, full_name, inn ON clients BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, full_name, inn)
+        VALUES ('delete', old.rowid, old.name, old.full_name, old.inn);
+        INSERT INTO {FTS_TABLE}(rowid, name, full_name, inn)
+        VALUES (new.rowid, new.name, new.full_name, new.inn);
+    END
+    """,
+)
+
+_fts = table(FTS_TABLE, literal_column("rowid"))
+
+
+def _unicode_lower(value: str | None) -> str | None:
+    return value.lower() if value is not None else None
+
+
+def register_functions(dbapi_connection) -> None:
+    """SQL-функции поиска на соединении DB-API (sqlite3 / aiosqlite): unicode_lower — lower() для любых букв."""
+    dbapi_connection.create_function("unicode_lower", 1, _unicode_lower, deterministic=True)
+
+
+def ensure_search_index(conn: Connection) -> None:
+    """Создаёт FTS-таблицу и триггеры, если их нет. Новый индекс сразу наполняется из clients."""
+    exists = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": FTS_TABLE},
+    ).first()
+    conn.execute(text(_FTS_DDL))
+    for ddl in _TRIGGERS_DDL:
+        conn.execute(text(ddl))
+    if not exists:
+        rebuild_search_index(conn)
+
+
+# automerge по умолчанию в FTS5: сливать сегменты, когда на уровне их набирается столько
+_AUTOMERGE = 4
+
+
+def rebuild_search_index(conn: Connection) -> None:
+    """
+    Полная пересборка FTS-индекса по текущему содержимому clients.
+    На время пересборки automerge выключен: промежуточные слияния сегментов, которые FTS5 делает
+    при построчной записи, для индекса, собираемого одним проходом, — лишняя работа (около трети времени).
+    """
+    conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES ('automerge', 0)"))
+    conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+    conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES ('automerge', {_AUTOMERGE})"))
+
+
+def _match_phrase(query: str) -> str:
+    """Запрос целиком как одна фраза FTS5 — та же семантика «подстрока», что была у ILIKE."""
+    return '"' + query.replace('"', '""') + '"'
+
+
+def search_condition(query: str) -> ColumnElement[bool]:
+    """Условие поиска по name, full_name, inn для запроса к clients."""
+    if len(query) < MIN_QUERY_LENGTH:
+        needle = query.lower()
+        return or_(
+            func.unicode_lower(ClientModel.name).contains(needle, autoescape=True),
+            func.unicode_lower(ClientModel.full_name).contains(needle, autoescape=True),
+            ClientModel.inn.contains(query, autoescape=True),
+        )
+    matched = select(_fts.c.rowid).where(
+        literal_column(FTS_TABLE).op("MATCH")(bindparam("fts_query", _match_phrase(query)))
+    )
+    return literal_column("clients.rowid").in_(matched)
+
+
+if __name__ == "__main__":
+    from src.database import engine, init_db
+
+    init_db()
+    with engine.begin() as connection:
+        rebuild_search_index(connection)
+        count = connection.execute(text(f"SELECT count(*) FROM {FTS_TABLE}")).scalar()
+    print(f"Индекс {FTS_TABLE} пересобран: {count} записей")
@@ -1,15 +1,64 @@
-"""Первичное наполнение БД: регионы и клиенты (~1000), если таблицы пустые."""
+"""Наполнение БД: справочник регионов и клиенты.
 
+При старте приложения (seed_db) — регионы и DEFAULT_CLIENT_COUNT клиентов, если таблицы пустые.
+Для нагрузочных тестов — генератор из командной строки (из корня проекта):
+
+    python -m src.seed --count 1000000 --seed 42 --depth 3 --fan-out 5 --reset
+
+Строка с номером i зависит только от --seed и i, поэтому набор данных воспроизводим и не
+зависит от числа процессов (--workers):
+- иерархия — лес полных деревьев глубины depth, у каждого узла fan_out детей; клиенты
+  пронумерованы обходом в ширину, родитель вычисляется по номеру и всегда вставлен раньше;
+- ИНН — биекция номера строки в 10-значные (юрлица) и 12-значные (физлица) номера:
+  уникален без проверки уже выданных; имя уникально за счёт номера строки.
+
+Пачки строк (кортежи) готовит пул процессов, основной процесс вставляет их executemany
+драйвера SQLite в одной транзакции. На время загрузки триггеры и вторичные индексы clients снимаются,
+в конце индексы строятся заново, а FTS-индекс пересобирается одним проходом — это в разы
+быстрее построчного обновления. children_count генератор считает сам по форме дерева.
+"""
+
+import argparse
+import math
+import os
 import random
-import uuid
+import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from typing import NamedTuple
 
+from sqlalchemy import Connection, exists, select, text
 from sqlalchemy.orm import Session
 
-from src.database import SessionLocal
+from src.data_version import bump_data_version, ensure_data_version
+from src.database import SessionLocal, engine, init_db
+from src.hierarchy import ensure_children_count
 from src.models.client_model import ClientModel
 from src.models.region_model import RegionModel
+from src.search import ensure_search_index, rebuild_search_index
 from src.types.party_type import PartyType
 
+# Клиентов при первом старте приложения и параметры их генерации
+DEFAULT_CLIENT_COUNT = 1000
+DEFAULT_SEED = 0
+DEFAULT_DEPTH = 2
+DEFAULT_FAN_OUT = 4
+
+# Строк в одной пачке генерации и вставки. Пачка — единица детерминизма (свой генератор
+# случайных чисел), поэтому при смене размера меняется и набор данных
+SEED_BATCH_SIZE = 10_000
+
+# created_at клиентов — случайный момент за три года с этой даты. Строка собирается из готовых
+# «YYYY-MM-DD » и «HH:MM:SS» (формат CURRENT_TIMESTAMP) — без datetime на каждую строку
+_CREATED_FROM = date(2022, 1, 1)
+_CREATED_DAYS = tuple(f"{_CREATED_FROM + timedelta(days=day)} " for day in range(3 * 365))
+_CREATED_TIMES = tuple(f"{h:02d}:{m:02d}:{sec:02d}" for h in range(24) for m in range(60) for sec in range(60))
+
+_INN_LEGAL_DIGITS = 10
+_INN_INDIVIDUAL_DIGITS = 12
+
 # Регионы РФ (сокращённый список для справочника)
 REGIONS = [
     "Республика Адыгея",
@@ -99,7 +148,7 @@ REGIONS = [
     "Ямало-Ненецкий автономный округ",
 ]
 
-# Имена и фамилии для физлиц (транслит для простоты, можно заменить на кириллицу)
+# Имена и фамилии для физлиц
 FIRST_NAMES = [
     "Александр", "Дмитрий", "Максим", "Сергей", "Андрей", "Алексей", "Артём",
     "Илья", "Кирилл", "Михаил", "Никита", "Егор", "Даниил", "Иван", "Евгений",
@@ -126,15 +175,198 @@ LEGAL_NAME_TAILS = [
     "Сибирь", "Урал", "Волга", "Дон", "Нева", "Россия", "Стандарт", "Про",
 ]
 
+# clients без типов SQLAlchemy: генератор отдаёт кортежи уже в том виде, в каком их хранит
+# SQLite (UUID — hex, enum — имя члена), и executemany драйвера идёт без преобразования строк
+_CLIENT_COLUMNS = (
+    "client_id", "name", "full_name", "party_type", "inn",
+    "region_id", "parent_id", "children_count", "created_at", "updated_at",
+)
+_INSERT_CLIENTS = (
+    f"INSERT INTO clients ({', '.join(_CLIENT_COLUMNS)}) VALUES ({', '.join('?' * len(_CLIENT_COLUMNS))})"
+)
+# Индекс, по которому SQLite проверяет внешний ключ детей при удалении клиента
+_PARENT_INDEX = "ix_clients_parent_id"
+
+
+class _Plan(NamedTuple):
+    """Всё, от чего зависят строки клиентов, — передаётся в процессы пула."""
+
+    seed: int
+    count: int
+    depth: int
+    fan_out: int
+    region_ids: tuple[str, ...]
+    id_prefix: int
+    inn_legal: tuple[int, int]
+    inn_individual: tuple[int, int]
+
 
-def _random_inn_individual() -> str:
-    """Генерирует условный ИНН физлица (12 цифр)."""
-    return "".join(str(random.randint(0, 9)) for _ in range(12))
+def _affine_bijection(rng: random.Random, digits: int) -> tuple[int, int]:
+    """(a, b) для i → (a·i + b) mod 10^digits: при a, взаимно простом с 10, отображение — биекция."""
+    modulus = 10**digits
+    a = rng.randrange(1, modulus)
+    while math.gcd(a, 10) != 1:
+        a += 1
+    return a, rng.randrange(modulus)
 
 
-def _random_inn_legal() -> str:
-    """Генерирует условный ИНН юрлица (10 цифр)."""
-    return "".join(str(random.randint(0, 9)) for _ in range(10))
+def _make_plan(count: int, seed: int, depth: int, fan_out: int, region_ids: list[str]) -> _Plan:
+    rng = random.Random(seed)
+    # Старшие 64 бита client_id с версией 4 (биты 12–15) — общие для набора
+    id_prefix = (rng.getrandbits(64) & ~(0xF << 12)) | (4 << 12)
+    return _Plan(
+        seed=seed,
+        count=count,
+        depth=depth,
+        fan_out=fan_out,
+        region_ids=tuple(region_ids),
+        id_prefix=id_prefix,
+        inn_legal=_affine_bijection(rng, _INN_LEGAL_DIGITS),
+        inn_individual=_affine_bijection(rng, _INN_INDIVIDUAL_DIGITS),
+    )
+
+
+_UUID_VARIANT = 1 << 63
+
+
+def _client_key(plan: _Plan, index: int) -> str:
+    """client_id строки index (hex UUID v4): общий префикс и номер строки с битами варианта RFC 4122."""
+    return f"{plan.id_prefix:016x}{index | _UUID_VARIANT:016x}"
+
+
+def _parent_index(plan: _Plan, index: int, tree_size: int) -> int | None:
+    """Номер родителя в лесу полных деревьев, пронумерованных обходом в ширину; None — головной клиент."""
+    position = index % tree_size
+    if position == 0:
+        return None
+    return index - position + (position - 1) // plan.fan_out
+
+
+def _children_count(plan: _Plan, index: int, tree_size: int) -> int:
+    """
+    Сколько детей у строки index: fan_out у внутреннего узла дерева, меньше — у узла
+    последнего, недостроенного дерева (строки кончились), 0 — у листа.
+    """
+    position = index % tree_size
+    first_child = position * plan.fan_out + 1
+    if first_child >= tree_size:
+        return 0
+    return max(0, min(plan.fan_out, plan.count - (index - position + first_child)))
+
+
+def _generate_block(plan: _Plan, start: int) -> list[tuple]:
+    """
+    Строки clients с номерами [start, start + SEED_BATCH_SIZE) — кортежи по _CLIENT_COLUMNS
+    в формате хранения SQLite.
+    Случайные величины выбираются сразу на всю пачку (Random.choices по столбцу), а не по строке.
+    """
+    rng = random.Random(f"{plan.seed}:{start // SEED_BATCH_SIZE}")
+    indexes = range(start, min(start + SEED_BATCH_SIZE, plan.count))
+    size = len(indexes)
+    tree_size = sum(plan.fan_out**level for level in range(plan.depth + 1))
+    legal_a, legal_b = plan.inn_legal
+    individual_a, individual_b = plan.inn_individual
+    legal_modulus = 10**_INN_LEGAL_DIGITS
+    individual_modulus = 10**_INN_INDIVIDUAL_DIGITS
+
+    kinds = [rng.random() for _ in indexes]  # < 0.4 — юрлицо (40%), иначе физлицо; < 0.7 у физлица — есть ИНН
+    prefixes = rng.choices(LEGAL_NAME_PREFIXES, k=size)
+    stems = rng.choices(LEGAL_NAME_STEMS, k=size)
+    tails = rng.choices(LEGAL_NAME_TAILS, k=size)
+    last_names = rng.choices(LAST_NAMES, k=size)
+    first_names = rng.choices(FIRST_NAMES, k=size)
+    # Регион у 85% клиентов, равновероятно
+    regions = rng.choices(plan.region_ids or (None,), k=size)
+    has_region = [rng.random() < 0.85 for _ in indexes]
+    created_days = rng.choices(_CREATED_DAYS, k=size)
+    created_times = rng.choices(_CREATED_TIMES, k=size)
+    key_prefix = f"{plan.id_prefix:016x}"
+    legal, individual = PartyType.LEGAL.name, PartyType.INDIVIDUAL.name
+
+    rows = []
+    for n, index in enumerate(indexes):
+        number = index + 1
+        if kinds[n] < 0.4:
+            name = f"{prefixes[n]} «{stems[n]}{tails[n]}{number}»"
+            full_name = f"{name} (юр. лицо)"
+            party_type = legal
+            inn = f"{(legal_a * index + legal_b) % legal_modulus:010d}"
+        else:
+            name = f"{last_names[n]} {first_names[n][0]}. {number}"
+            full_name = f"{last_names[n]} {first_names[n]}"
+            party_type = individual
+            inn = f"{(individual_a * index + individual_b) % individual_modulus:012d}" if kinds[n] < 0.82 else None
+        parent = _parent_index(plan, index, tree_size)
+        created_at = created_days[n] + created_times[n]
+        rows.append((
+            f"{key_prefix}{index | _UUID_VARIANT:016x}",  # _client_key, развёрнутый для скорости
+            name,
+            full_name,
+            party_type,
+            inn,
+            regions[n] if has_region[n] else None,
+            None if parent is None else _client_key(plan, parent),
+            _children_count(plan, index, tree_size),
+            created_at,
+            created_at,
+        ))
+    return rows
+
+
+def _blocks(plan: _Plan, workers: int) -> Iterator[list[tuple]]:
+    """
+    Пачки строк по порядку номеров. При workers > 1 — из пула процессов: пачки готовятся,
+    пока основной процесс вставляет предыдущие; впереди не больше 2·workers пачек (память).
+    """
+    starts = range(0, plan.count, SEED_BATCH_SIZE)
+    if workers <= 1:
+        for start in starts:
+            yield _generate_block(plan, start)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for start in starts:
+            pending.append(pool.submit(_generate_block, plan, start))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _drop_write_path(conn: Connection, reset: bool) -> None:
+    """
+    Снять триггеры и вторичные индексы clients — вставка идёт без их построчного обновления.
+    reset — удалить клиентов, когда из индексов остался только _PARENT_INDEX: по нему SQLite
+    проверяет внешний ключ детей каждой удаляемой строки (без него — проход по таблице на строку),
+    а остальные индексы удаление обновляло бы построчно.
+    """
+    triggers = conn.execute(
+        text("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'clients'")
+    ).scalars().all()
+    for name in triggers:
+        conn.execute(text(f"DROP TRIGGER {name}"))
+    for index in ClientModel.__table__.indexes:
+        if not (reset and index.name == _PARENT_INDEX):
+            conn.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+    if reset:
+        conn.execute(text("DELETE FROM clients"))
+        conn.execute(text(f"DROP INDEX IF EXISTS {_PARENT_INDEX}"))
+
+
+def _restore_write_path(conn: Connection, workers: int) -> None:
+    """
+    Построить индексы заново (сортировка — в workers потоках SQLite), пересобрать FTS-индекс
+    и вернуть триггеры. children_count генератор посчитал сам — пересчёт не нужен. Версию
+    данных (src/data_version.py) загрузка без триггеров не подняла — она поднимается здесь.
+    """
+    conn.execute(text(f"PRAGMA threads = {workers}"))
+    for index in ClientModel.__table__.indexes:
+        index.create(bind=conn)
+    ensure_children_count(conn)
+    ensure_search_index(conn)
+    rebuild_search_index(conn)
+    ensure_data_version(conn)
+    bump_data_version(conn)
 
 
 def seed_regions(db: Session) -> int:
@@ -146,59 +378,73 @@ def seed_regions(db: Session) -> int:
     return len(REGIONS)
 
 
-def seed_clients(db: Session, region_ids: list[uuid.UUID], target_count: int = 1000) -> int:
-    """Добавляет клиентов до target_count, если таблица пуста. Возвращает количество добавленных."""
-    total = db.query(ClientModel).count()
-    if total > 0:
-        return 0
-    if not region_ids:
-        return 0
-
-    added = 0
-    for _ in range(target_count):
-        is_legal = random.random() < 0.4  # 40% юрлица, 60% физлица
-        region_id = random.choice(region_ids) if random.random() < 0.85 else None
-
-        if is_legal:
-            prefix = random.choice(LEGAL_NAME_PREFIXES)
-            stem = random.choice(LEGAL_NAME_STEMS)
-            tail = random.choice(LEGAL_NAME_TAILS)
-            name = f"{prefix} «{stem}{tail}{random.randint(1, 99)}»"
-            full_name = f"{name} (юр. лицо)"
-            party_type = PartyType.LEGAL
-            inn = _random_inn_legal()
-        else:
-            last = random.choice(LAST_NAMES)
-            first = random.choice(FIRST_NAMES)
-            name = f"{last} {first[0]}."
-            full_name = f"{last} {first}"
-            party_type = PartyType.INDIVIDUAL
-            inn = _random_inn_individual() if random.random() < 0.7 else None
-
-        db.add(
-            ClientModel(
-                name=name,
-                full_name=full_name,
-                party_type=party_type,
-                inn=inn,
-                region_id=region_id,
-                parent_id=None,
-            )
-        )
-        added += 1
-
-    return added
+def generate_clients(
+    conn: Connection,
+    count: int,
+    seed: int = DEFAULT_SEED,
+    depth: int = DEFAULT_DEPTH,
+    fan_out: int = DEFAULT_FAN_OUT,
+    workers: int = 1,
+    reset: bool = False,
+) -> int:
+    """
+    Вставляет count клиентов (см. описание модуля) в транзакции conn. reset — сначала удалить
+    всех клиентов; иначе номера строк (а с ними имена и ИНН) рассчитаны на пустую таблицу.
+    Возвращает количество добавленных.
+    """
+    # Регионы по названию: их id случайны, а выбор региона для строки — нет
+    region_ids = [region_id.hex for region_id in conn.scalars(select(RegionModel.id).order_by(RegionModel.name))]
+    plan = _make_plan(count, seed, depth, fan_out, region_ids)
+    _drop_write_path(conn, reset)
+    for rows in _blocks(plan, workers):
+        conn.exec_driver_sql(_INSERT_CLIENTS, rows)
+    _restore_write_path(conn, workers)
+    return count
 
 
 def seed_db() -> None:
-    """Первичное наполнение: регионы и клиенты, если таблицы пустые."""
+    """Первичное наполнение при старте: регионы и DEFAULT_CLIENT_COUNT клиентов, если таблицы пустые."""
     db = SessionLocal()
     try:
         seed_regions(db)
         db.commit()
+    finally:
+        db.close()
+    with engine.begin() as conn:
+        if not conn.scalar(select(exists().select_from(ClientModel))):
+            generate_clients(conn, DEFAULT_CLIENT_COUNT)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Генератор клиентов для нагрузочных тестов")
+    parser.add_argument("--count", type=int, default=DEFAULT_CLIENT_COUNT, help="Сколько клиентов создать")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Зерно: тот же seed — те же данные")
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH, help="Глубина иерархии (0 — все головные)")
+    parser.add_argument("--fan-out", type=int, default=DEFAULT_FAN_OUT, help="Дочерних клиентов у каждого узла")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Процессов генерации")
+    parser.add_argument("--reset", action="store_true", help="Удалить существующих клиентов")
+    args = parser.parse_args()
+    if not 1 <= args.count <= 10**_INN_LEGAL_DIGITS:
+        parser.error(f"--count: от 1 до {10**_INN_LEGAL_DIGITS} (столько уникальных ИНН юрлиц)")
+    if args.depth < 0 or args.fan_out < 1:
+        parser.error("--depth не меньше 0, --fan-out не меньше 1")
 
-        region_ids = [r.id for r in db.query(RegionModel).all()]
-        seed_clients(db, region_ids, target_count=1000)
+    init_db()
+    db = SessionLocal()
+    try:
+        seed_regions(db)
         db.commit()
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        if not args.reset and conn.scalar(select(exists().select_from(ClientModel))):
+            parser.error("в таблице clients уже есть клиенты — добавьте --reset, чтобы заменить их")
+        created = generate_clients(conn, args.count, args.seed, args.depth, args.fan_out, args.workers, args.reset)
+    elapsed = time.perf_counter() - started
+    rate = f"{created / elapsed:,.0f}".replace(",", " ")
+    print(f"Создано клиентов: {created} за {elapsed:.1f} с ({rate} строк/с)")
+
+
+if __name__ == "__main__":
+    main()
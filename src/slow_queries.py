@@ -0,0 +1,148 @@
+"""Журнал медленных SQL-запросов (SLOW_QUERY_MS) с планом EXPLAIN QUERY PLAN.
+
+Учитываются запросы внутри HTTP-запросов (роут известен); загрузка seed, init_db и CLI —
+нет: массовые вставки и построение индексов там медленные по природе.
+Запрос дольше порога пишется строкой JSON в лог src.slow_queries (уровень WARNING):
+время, роут («GET /api/clients»), текст SQL и параметры без значений — строки
+заменяются типом и длиной (в них имена и ИНН клиентов), числа и null остаются.
+
+Запросы группируются по форме — тексту SQL, где списки «?, ?, …» свёрнуты (IN по
+разному числу id — одна форма). На форму считаются число, суммарное и наибольшее время,
+роуты; план EXPLAIN QUERY PLAN снимается один раз, при первом медленном выполнении.
+Форм хранится не больше SLOW_QUERY_MAX_SHAPES: новая вытесняет самую дешёвую по
+суммарному времени. Сводка — GET /debug/slow-queries (top).
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+
+from sqlalchemy import Engine, event
+
+from src.config import SLOW_QUERY_MAX_SHAPES, SLOW_QUERY_MS
+from src.metrics import current_route
+
+_log = logging.getLogger(__name__)
+
+_PLACEHOLDER_LIST_RE = re.compile(r"\?(?:\s*,\s*\?)+")
+# План снимается только для чтения и изменения строк; DDL и PRAGMA не объясняются
+_EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")
+
+
+@dataclass
+class SlowQuery:
+    """Накопленная статистика одной формы запроса."""
+
+    sql: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    routes: dict[str, int] = field(default_factory=dict)
+    last_params: list = field(default_factory=list)
+    plan: list[str] | None = None
+
+
+_shapes: dict[str, SlowQuery] = {}
+_lock = threading.Lock()
+
+
+def shape_of(statement: str) -> str:
+    """Форма запроса: пробелы схлопнуты, списки плейсхолдеров свёрнуты в «?, …»."""
+    return _PLACEHOLDER_LIST_RE.sub("?, …", " ".join(statement.split()))
+
+
+def redact(parameters) -> list:
+    """Параметры без значений: строки и байты — тип и длина, числа, bool и null — как есть."""
+    if isinstance(parameters, dict):
+        parameters = list(parameters.values())
+    redacted = []
+    for value in parameters or ():
+        if value is None or isinstance(value, (bool, int, float)):
+            redacted.append(value)
+        elif isinstance(value, (str, bytes)):
+            redacted.append(f"<{type(value).__name__}:{len(value)}>")
+        else:
+            redacted.append(f"<{type(value).__name__}>")
+    return redacted
+
+
+def _explain(conn, statement: str, parameters) -> list[str]:
+    """
+    EXPLAIN QUERY PLAN на том же соединении — курсором DBAPI, мимо событий движка.
+    Строки плана с отступом по вложенности.
+    """
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ())
+        rows = cursor.fetchall()
+    except conn.dialect.loaded_dbapi.Error as exc:
+        return [f"EXPLAIN не выполнен: {exc}"]
+    finally:
+        cursor.close()
+    depth: dict[int, int] = {}
+    lines = []
+    for node_id, parent_id, _unused, detail in rows:
+        depth[node_id] = depth.get(parent_id, -1) + 1
+        lines.append("  " * depth[node_id] + detail)
+    return lines
+
+
+def record(statement: str, parameters, elapsed_ms: float, route: str, conn=None, executemany: bool = False) -> None:
+    """Учесть медленный запрос: строка лога и статистика формы; план — при первом попадании формы."""
+    shape = shape_of(statement)
+    params = redact(parameters[0] if executemany and parameters else parameters)
+    with _lock:
+        entry = _shapes.get(shape)
+        if entry is None:
+            if len(_shapes) >= SLOW_QUERY_MAX_SHAPES:
+                cheapest = min(_shapes, key=lambda key: _shapes[key].total_ms)
+                del _shapes[cheapest]
+            entry = _shapes[shape] = SlowQuery(sql=shape)
+        entry.count += 1
+        entry.total_ms += elapsed_ms
+        entry.max_ms = max(entry.max_ms, elapsed_ms)
+        entry.routes[route] = entry.routes.get(route, 0) + 1
+        entry.last_params = params
+        need_plan = entry.plan is None
+        if need_plan:
+            entry.plan = []  # другой поток с той же формой план уже не снимает
+    if need_plan and conn is not None and not executemany and shape.upper().startswith(_EXPLAINABLE):
+        entry.plan = _explain(conn, statement, parameters)
+    _log.warning(json.dumps({
+        "durationMs": round(elapsed_ms, 2),
+        "route": route,
+        "sql": shape,
+        "params": params,
+    }, ensure_ascii=False))
+
+
+def top(limit: int) -> list[SlowQuery]:
+    """Формы с наибольшим суммарным временем."""
+    with _lock:
+        entries = sorted(_shapes.values(), key=lambda entry: entry.total_ms, reverse=True)[:limit]
+        return [
+            SlowQuery(e.sql, e.count, e.total_ms, e.max_ms, dict(e.routes), list(e.last_params), list(e.plan or []))
+            for e in entries
+        ]
+
+
+def reset() -> None:
+    with _lock:
+        _shapes.clear()
+
+
+def instrument_engine(target: Engine) -> None:
+    """Замер каждого запроса движка; дольше SLOW_QUERY_MS внутри HTTP-запроса — в журнал."""
+
+    @event.listens_for(target, "before_cursor_execute")
+    def _before(conn, _cursor, _statement, _parameters, _context, _executemany) -> None:
+        conn.info["slow_query_started"] = time.perf_counter()
+
+    @event.listens_for(target, "after_cursor_execute")
+    def _after(conn, _cursor, statement, parameters, _context, executemany) -> None:
+        elapsed_ms = (time.perf_counter() - conn.info["slow_query_started"]) * 1000
+        if elapsed_ms >= SLOW_QUERY_MS and (route := current_route()) is not None:
+            record(statement, parameters, elapsed_ms, route, conn, executemany)
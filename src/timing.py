@@ -0,0 +1,126 @@
+"""Замер времени запроса по фазам (REQUEST_TIMING): заголовок Server-Timing и строка лога на запрос.
+
+Фазы:
+- db — выполнение SQL (before/after_cursor_execute движков), с числом запросов;
+- build — сборка ответа из строк (схемы _clients_from_rows, словари _json_list_response);
+- encode — JSON ответа (model_dump_json, client_list_adapter);
+- app — остальное: маршрутизация, валидация параметров, чтение строк из курсора
+  (SQLite отдаёт строки при fetch, а не при execute), сериализация FastAPI по response_model;
+- total — от начала запроса до заголовков ответа.
+
+Замер привязан к запросу через contextvar: Starlette копирует контекст в пул потоков,
+поэтому синхронные роуты и события движка видят тот же объект RequestTiming.
+Строка лога (логгер src.timing, JSON) пишется после отправки тела — в ней полное время.
+"""
+
+import json
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import Engine, event
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+_log = logging.getLogger(__name__)
+_current: ContextVar["RequestTiming | None"] = ContextVar("request_timing", default=None)
+
+PHASES = ("db", "build", "encode")
+
+
+class RequestTiming:
+    """Накопленное время фаз одного запроса (секунды) и число SQL-запросов."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.queries = 0
+
+    def summary(self) -> dict[str, float]:
+        """Фазы в мс, app — остаток, total — с начала запроса до текущего момента."""
+        total = time.perf_counter() - self.started
+        durations = {name: seconds * 1000 for name, seconds in self.phases.items()}
+        durations["app"] = max(0.0, total * 1000 - sum(durations.values()))
+        durations["total"] = total * 1000
+        return durations
+
+    def header(self) -> str:
+        parts = []
+        for name, ms in self.summary().items():
+            desc = f';desc="{self.queries} queries"' if name == "db" else ""
+            parts.append(f"{name};dur={ms:.2f}{desc}")
+        return ", ".join(parts)
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """Добавить время блока к фазе текущего запроса; вне замеряемого запроса — ничего не делает."""
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.phases[phase] += time.perf_counter() - started
+
+
+def instrument_engine(target: Engine) -> None:
+    """Время и число SQL-запросов движка — в фазу db текущего запроса."""
+
+    @event.listens_for(target, "before_cursor_execute")
+    def _before(conn, _cursor, _statement, _parameters, _context, _executemany) -> None:
+        conn.info["timing_started"] = time.perf_counter()
+
+    @event.listens_for(target, "after_cursor_execute")
+    def _after(conn, _cursor, _statement, _parameters, _context, _executemany) -> None:
+        timing = _current.get()
+        if timing is not None:
+            timing.phases["db"] += time.perf_counter() - conn.info["timing_started"]
+            timing.queries += 1
+
+
+class ServerTimingMiddleware:
+    """ASGI-middleware: RequestTiming на каждый HTTP-запрос, Server-Timing в ответе и строка лога."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        _log.setLevel(logging.INFO)
+        if not _log.handlers:
+            # Логирование в проекте не настраивается — без своего обработчика INFO не видно
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+            _log.addHandler(handler)
+            _log.propagate = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        timing = RequestTiming()
+        status = 0
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message).append("Server-Timing", timing.header())
+            await send(message)
+
+        token = _current.set(timing)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            durations = timing.summary()
+            _log.info(json.dumps({
+                "method": scope["method"],
+                "path": scope["path"],
+                "query": scope["query_string"].decode("latin-1"),
+                "status": status,
+                "queries": timing.queries,
+                **{f"{name}Ms": round(ms, 2) for name, ms in durations.items()},
+            }, ensure_ascii=False))
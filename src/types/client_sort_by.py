@@ -15,3 +15,4 @@ class ClientSortBy(ApiCamelEnum, Enum):
     INN = "inn"
     REGION_ID = "region_id"
     PARENT_ID = "parent_id"
+    CHILDREN_COUNT = "children_count"
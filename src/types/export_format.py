@@ -0,0 +1,10 @@
+from enum import Enum
+
+from src.types.api_camel_enum import ApiCamelEnum
+
+
+class ExportFormat(ApiCamelEnum, Enum):
+    """Формат выгрузки клиентов. В Python — snake_case, в API — camelCase."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"